@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for sparkstart's own hot paths.
+
+    python benchmarks/run.py                    # run everything, compare to the baseline
+    python benchmarks/run.py --only 'create/*'  # a subset (fnmatch pattern, repeatable)
+    python benchmarks/run.py --save-baseline    # accept the current numbers
+
+Cases:
+    cli/help               `sparkstart --help` in a fresh interpreter
+    create/<lang>          create_project with warm caches (seed venv, plugin and tool indexes)
+    create/python-novenv   the same, minus the virtual environment
+    cold/<lang>            create_project in a fresh interpreter with an empty cache
+    phase/scaffold/<lang>  plan + write the files only
+    phase/templates/build  pack templates/src into a bundle (scripts/build_templates.py)
+    phase/templates/read   map the packaged bundle and read every C++ template
+    phase/venv[-nocache]   one virtual environment, from the cached seed or from scratch
+    phase/git              init_and_commit on an already-written project
+    phase/delete[-background]  delete_project on a Python project with its .venv
+
+Results go to benchmarks/results.json (median, min and every run, in
+seconds). With a baseline at benchmarks/baseline.json, every case whose
+median is more than --threshold slower (and at least --min-delta seconds
+slower, to ignore jitter) is reported and the exit status is 1.
+
+Baselines only compare like with like: record one per machine.
+"""
+import argparse
+import contextlib
+import fnmatch
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+BENCH_DIR = PROJECT_ROOT / "benchmarks"
+RESULTS = BENCH_DIR / "results.json"
+BASELINE = BENCH_DIR / "baseline.json"
+LANGUAGES = ["python", "python@pygame", "rust", "javascript", "cpp"]
+
+
+def split_lang(case: str):
+    lang, _, template = case.partition("@")
+    return lang, template or None
+
+
+def subprocess_env(**extra):
+    env = {**os.environ, **extra}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+@contextlib.contextmanager
+def no_venv():
+    """Skip the venv step of create_project (it is looked up at call time)."""
+    from sparkstart.utils import venv_seed
+
+    real = venv_seed.create_venv
+    venv_seed.create_venv = lambda dest, prefix=None: None
+    try:
+        yield
+    finally:
+        venv_seed.create_venv = real
+
+
+class Runner:
+    def __init__(self, repeat: int, patterns, workdir: pathlib.Path):
+        self.repeat = repeat
+        self.patterns = patterns
+        self.workdir = workdir
+        self.results = {}
+        self._n = 0
+
+    def fresh_dir(self) -> pathlib.Path:
+        self._n += 1
+        path = self.workdir / f"run{self._n}"
+        path.mkdir()
+        return path
+
+    def wanted(self, name: str) -> bool:
+        return not self.patterns or any(fnmatch.fnmatch(name, p) for p in self.patterns)
+
+    def measure(self, name, fn, setup=lambda: None):
+        """Time fn(setup()) *repeat* times; setup is not timed."""
+        if not self.wanted(name):
+            return
+        runs = []
+        for _ in range(self.repeat):
+            arg = setup()
+            start = time.perf_counter()
+            fn(arg)
+            runs.append(time.perf_counter() - start)
+        self.results[name] = {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+        print(f"  {name:<32} {statistics.median(runs) * 1000:9.1f} ms  (min {min(runs) * 1000:.1f})")
+
+    def skip(self, name, reason):
+        if self.wanted(name):
+            self.results[name] = {"skipped": reason}
+            print(f"  {name:<32}   skipped: {reason}")
+
+
+def bench_cli(r: Runner):
+    cmd = [sys.executable, "-c", "from sparkstart.cli import app; app()", "--help"]
+    env = subprocess_env()
+    r.measure("cli/help", lambda _: subprocess.run(cmd, env=env, check=True, capture_output=True))
+
+
+def bench_create(r: Runner, skipped):
+    from sparkstart.core import create_project
+
+    def create(case):
+        lang, template = split_lang(case)
+        return lambda path: create_project(path / "proj", lang=lang, template=template)
+
+    for case in LANGUAGES:
+        if case in skipped:
+            r.skip(f"create/{case}", skipped[case])
+            continue
+        if r.wanted(f"create/{case}"):
+            create(case)(r.fresh_dir())  # warm caches and imports
+        r.measure(f"create/{case}", create(case), r.fresh_dir)
+
+    with no_venv():
+        r.measure("create/python-novenv", create("python"), r.fresh_dir)
+
+
+def bench_cold(r: Runner, skipped):
+    for case in LANGUAGES:
+        name = f"cold/{case}"
+        if case in skipped:
+            r.skip(name, skipped[case])
+            continue
+        lang, template = split_lang(case)
+        code = (
+            "import pathlib, sys; from sparkstart.core import create_project; "
+            f"create_project(pathlib.Path(sys.argv[1]), lang={lang!r}, template={template!r})"
+        )
+
+        def run(cwd, code=code):
+            env = subprocess_env(SPARKSTART_CACHE_DIR=str(cwd / "cache"))
+            subprocess.run([sys.executable, "-c", code, str(cwd / "proj")], env=env, check=True, capture_output=True)
+
+        r.measure(name, run, r.fresh_dir)
+
+
+def bench_phases(r: Runner, skipped):
+    from sparkstart.core import create_project, plan_project
+    from sparkstart.plan import write_plan
+    from sparkstart.utils.git import GitFile, MODE_EXEC, MODE_FILE, init_and_commit
+    from sparkstart.utils.venv_seed import create_venv
+
+    for case in LANGUAGES:
+        if case in skipped:
+            r.skip(f"phase/scaffold/{case}", skipped[case])
+            continue
+        lang, template = split_lang(case)
+        r.measure(
+            f"phase/scaffold/{case}",
+            lambda path, lang=lang, template=template: write_plan(plan_project("proj", lang, False, template), path),
+            r.fresh_dir,
+        )
+
+    from sparkstart.templates import BUNDLE, SOURCES, Bundle, build_bundle
+
+    r.measure("phase/templates/build", lambda path: build_bundle(SOURCES, path / "templates.bundle"), r.fresh_dir)
+
+    def read_cpp(_):
+        bundle = Bundle(BUNDLE)
+        for entry in bundle.names("cpp/"):
+            bundle.read(entry)
+
+    r.measure("phase/templates/read", read_cpp)
+
+    if r.wanted("phase/venv"):
+        create_venv(r.fresh_dir() / ".venv")  # make sure the seed exists
+    r.measure("phase/venv", lambda path: create_venv(path / ".venv"), r.fresh_dir)
+
+    def nocache(path):
+        os.environ["SPARKSTART_NO_VENV_CACHE"] = "1"
+        try:
+            create_venv(path / ".venv")
+        finally:
+            del os.environ["SPARKSTART_NO_VENV_CACHE"]
+
+    r.measure("phase/venv-nocache", nocache, r.fresh_dir)
+
+    def written_project():
+        path = r.fresh_dir()
+        plan = plan_project("proj", "python")
+        write_plan(plan, path)
+        return path, [GitFile(f.path, f.data, MODE_EXEC if f.mode & 0o111 else MODE_FILE) for f in plan]
+
+    r.measure("phase/git", lambda arg: init_and_commit(arg[0], "Initial commit", arg[1]), written_project)
+
+    from sparkstart.core import delete_project
+
+    def python_project():
+        path = r.fresh_dir() / "proj"
+        create_project(path)
+        return path
+
+    r.measure("phase/delete", lambda path: delete_project(path), python_project)
+    r.measure("phase/delete-background", lambda path: delete_project(path, background=True), python_project)
+
+
+def unavailable():
+    """{case: reason} for the cases this machine cannot run."""
+    from sparkstart.toolchain import discover
+
+    tools = discover(["git", "g++", "cmake"])
+    if not tools["git"].found:
+        sys.exit("❌ git is required to run the benchmarks")
+    missing = [t for t in ("g++", "cmake") if not tools[t].found]
+    return {"cpp": f"{', '.join(missing)} not found"} if missing else {}
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Return [(name, old median, new median)] for every case that regressed."""
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old or "median" not in old or "median" not in new:
+            continue
+        if new["median"] > old["median"] * (1 + threshold) and new["median"] - old["median"] >= min_delta:
+            regressions.append((name, old["median"], new["median"]))
+    return regressions
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.node(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (default: 5)")
+    parser.add_argument("--only", action="append", default=[], help="fnmatch pattern of cases to run")
+    parser.add_argument("--output", type=pathlib.Path, default=RESULTS)
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignore slowdowns below this many seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="sparkstart-bench-") as tmp:
+        tmp = pathlib.Path(tmp)
+        # warm runs share one cache, kept out of the user's
+        os.environ["SPARKSTART_CACHE_DIR"] = str(tmp / "cache")
+        workdir = tmp / "work"
+        workdir.mkdir()
+
+        skipped = unavailable()
+        runner = Runner(args.repeat, args.only, workdir)
+        print(f"⏱  Benchmarking ({args.repeat} runs per case)...")
+        bench_cli(runner)
+        bench_create(runner, skipped)
+        bench_cold(runner, skipped)
+        bench_phases(runner, skipped)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {"meta": metadata(), "results": runner.results}
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"📄 Wrote {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"📌 Saved baseline {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"   No baseline at {args.baseline}; record one with --save-baseline")
+        return
+
+    regressions = compare(runner.results, json.loads(args.baseline.read_text()), args.threshold, args.min_delta)
+    if regressions:
+        print(f"❌ {len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline:")
+        for name, old, new in regressions:
+            print(f"   {name:<32} {old * 1000:9.1f} ms -> {new * 1000:9.1f} ms  (+{new / old - 1:.0%})")
+        sys.exit(1)
+    print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
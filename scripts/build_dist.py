@@ -1,15 +1,63 @@
 #!/usr/bin/env python3
+"""
+Build standalone sparkstart executables into dist/:
+
+    dist/sparkstart                   PyInstaller --onefile: one file, no Python needed,
+                                      but it unpacks itself to a temp dir on every launch
+    dist/onedir/sparkstart/sparkstart PyInstaller --onedir: no Python needed, starts fast
+    dist/sparkstart.pyz               zipapp of precompiled bytecode + pure-Python deps:
+                                      smallest and fastest, needs the same Python X.Y
+
+    python scripts/build_dist.py                 # all three
+    python scripts/build_dist.py --only zipapp   # no PyInstaller required
+
+dist/ and build/ are output directories: they are git-ignored and rebuilt
+from scratch on every run, never committed (stale binaries would not match
+the sources next to them).
+
+verify() runs `--help` on each artifact and fails the build if its cold
+(first) or warm (median) latency exceeds the budgets below; scale them on
+slow machines with SPARKSTART_STARTUP_BUDGET_SCALE=2.
+"""
+import argparse
+import compileall
+import statistics
 import subprocess
 import sys
 import shutil
+import os
 import pathlib
 import textwrap
+import time
+import zipapp
 
 # Ensure we are running from project root
 PROJECT_ROOT = pathlib.Path(__file__).parent.parent.resolve()
 DIST_DIR = PROJECT_ROOT / "dist"
 BUILD_DIR = PROJECT_ROOT / "build"
 BINARY_NAME = "sparkstart"
+ONEDIR_DIST = DIST_DIR / "onedir"
+ZIPAPP = DIST_DIR / f"{BINARY_NAME}.pyz"
+ARTIFACTS = ("onefile", "onedir", "zipapp")
+# guarded entry point with multiprocessing.freeze_support(), so that spawned
+# `batch` workers run their task instead of the CLI
+MAIN = PROJECT_ROOT / "sparkstart" / "__main__.py"
+
+# Never imported by sparkstart; dropping them shrinks what has to be read at launch.
+# (typer only uses rich for its optional pretty help, which cli.py turns off.)
+EXCLUDES = [
+    "tkinter", "unittest", "pydoc", "doctest", "lib2to3", "xmlrpc", "pdb", "sqlite3",
+    "rich", "pygments", "markdown_it", "mdurl",
+]
+
+# --help latency budgets in ms: (cold, warm)
+SCALE = float(os.getenv("SPARKSTART_STARTUP_BUDGET_SCALE", "1"))
+BUDGETS_MS = {
+    "onefile": (3000, 1500),  # reported for comparison; it is the slow format
+    "onedir": (1500, 300),
+    "zipapp": (1000, 250),
+}
+WARM_RUNS = 5
 
 def check_pyinstaller():
     """Check if pyinstaller is available."""
@@ -33,16 +81,34 @@ def clean():
     if spec_file.exists():
         spec_file.unlink()
 
-def build():
+def mark_output_dirs():
+    """Make dist/ and build/ ignore themselves, even in a checkout without our .gitignore."""
+    for d in (DIST_DIR, BUILD_DIR):
+        d.mkdir(exist_ok=True)
+        (d / ".gitignore").write_text("# build output, never committed (see scripts/build_dist.py)\n*\n")
+
+def build_templates():
+    """Templates are read from the precompiled bundle at runtime."""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from sparkstart.templates import BUNDLE, SOURCES, build_bundle
+    build_bundle(SOURCES, BUNDLE)
+    return BUNDLE
+
+def build(onedir=False):
     """Run PyInstaller."""
-    print("🔨 Building standalone binary...")
-    
+    print(f"🔨 Building standalone binary ({'onedir' if onedir else 'onefile'})...")
+    bundle = build_templates()
+
     # PyInstaller command
     cmd = [
         sys.executable, "-m", "PyInstaller",
-        "--onefile",
+        "--onedir" if onedir else "--onefile",
         "--name", BINARY_NAME,
         "--clean",
+        "--noconfirm",
+        "--distpath", str(ONEDIR_DIST if onedir else DIST_DIR),
+        "--workpath", str(BUILD_DIR / ("onedir" if onedir else "onefile")),
+        "--add-data", f"{bundle}{os.pathsep}sparkstart/templates",
         # Point to the entry point. 
         # Since we use typer, pointing to cli.py is usually best, 
         # or we can treat the package as a module. 
@@ -57,8 +123,11 @@ def build():
     # Let's use a temporary entrypoint script to ensure relative imports work correctly
     # when pyinstaller analyzes it.
     entry_script = PROJECT_ROOT / "entry_point.py"
-    entry_script.write_text("from sparkstart.cli import app; app()")
+    entry_script.write_text(MAIN.read_text())
     
+    for module in EXCLUDES:
+        cmd += ["--exclude-module", module]
+
     try:
         cmd.append(str(entry_script))
         subprocess.run(cmd, check=True, cwd=PROJECT_ROOT)
@@ -66,30 +135,129 @@ def build():
         if entry_script.exists():
             entry_script.unlink()
 
-def verify():
-    """Verify the binary works."""
-    binary_path = DIST_DIR / BINARY_NAME
-    if not binary_path.exists():
-        print(f"❌ Binary not found at {binary_path}")
-        sys.exit(1)
-        
-    print(f"✅ Binary created at {binary_path}")
-    print("   Running smoke test (help command)...")
-    
+def runtime_requirements():
+    """sparkstart's dependencies from pyproject.toml (markers are left to pip)."""
     try:
-        result = subprocess.run([str(binary_path), "--help"], capture_output=True, text=True, check=True)
-        print("   Smoke test passed! stdout snippet:")
-        print(textwrap.indent(result.stdout[:200] + "...", "      "))
-    except subprocess.CalledProcessError as e:
-        print("❌ Smoke test failed!")
-        print(e.stderr)
+        import tomllib
+    except ImportError:  # Python < 3.11
+        import tomli as tomllib
+    with open(PROJECT_ROOT / "pyproject.toml", "rb") as f:
+        return tomllib.load(f)["project"]["dependencies"]
+
+def build_zipapp():
+    """Zip sparkstart and its pure-Python dependencies as precompiled, sourceless bytecode."""
+    print("🔨 Building zipapp...")
+    bundle = build_templates()
+    staging = BUILD_DIR / "zipapp"
+    if staging.exists():
+        shutil.rmtree(staging)
+
+    # pure-Python wheels only: extension modules cannot be imported from a zip
+    version = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    subprocess.run([
+        sys.executable, "-m", "pip", "install", "--quiet", "--target", str(staging), "--no-compile",
+        "--only-binary=:all:", "--implementation", "py", "--abi", "none", "--platform", "any",
+        "--python-version", version, *runtime_requirements(),
+    ], check=True)
+
+    shutil.copytree(
+        PROJECT_ROOT / "sparkstart", staging / "sparkstart",
+        ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "src"),
+    )
+    (staging / "sparkstart" / "templates" / bundle.name).write_bytes(bundle.read_bytes())
+
+    for name in EXCLUDES:
+        for path in [staging / name, staging / f"{name}.py", *staging.glob(f"{name}-*.dist-info")]:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+    for junk in ["bin", *(p.name for p in staging.glob("*/tests"))]:
+        shutil.rmtree(staging / junk, ignore_errors=True)
+
+    # bytecode next to where the source was (legacy layout), then drop the source:
+    # zipimport then loads .pyc directly instead of compiling on every launch
+    if not compileall.compile_dir(str(staging), quiet=1, legacy=True):
+        print("❌ Byte-compiling the zipapp failed")
+        sys.exit(1)
+    for source in staging.rglob("*.py"):
+        source.unlink()
+
+    (staging / "__main__.py").write_text(MAIN.read_text())
+
+    DIST_DIR.mkdir(exist_ok=True)
+    zipapp.create_archive(
+        staging, ZIPAPP, interpreter=f"/usr/bin/env python{version}",
+        compressed=False,  # reading stored members is faster than inflating them
+    )
+    print(f"   {ZIPAPP.relative_to(PROJECT_ROOT)} ({ZIPAPP.stat().st_size // 1024} KiB, needs Python {version})")
+
+def artifact_command(kind):
+    if kind == "onefile":
+        return [str(DIST_DIR / BINARY_NAME)]
+    if kind == "onedir":
+        return [str(ONEDIR_DIST / BINARY_NAME / BINARY_NAME)]
+    return [sys.executable, str(ZIPAPP)]
+
+def help_latency(cmd):
+    """(first run, median of the next WARM_RUNS) wall time of `--help`, in ms."""
+    runs = []
+    for _ in range(WARM_RUNS + 1):
+        start = time.perf_counter()
+        result = subprocess.run(cmd + ["--help"], capture_output=True, text=True)
+        runs.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+    return runs[0], statistics.median(runs[1:])
+
+def verify(kinds=ARTIFACTS):
+    """Verify the binaries work and start within their --help latency budgets."""
+    failed = False
+    for kind in kinds:
+        cmd = artifact_command(kind)
+        binary_path = pathlib.Path(cmd[-1])
+        if not binary_path.exists():
+            print(f"❌ Binary not found at {binary_path}")
+            sys.exit(1)
+
+        print(f"✅ {kind} created at {binary_path}")
+        print("   Running smoke test (help command)...")
+        try:
+            cold, warm = help_latency(cmd)
+        except subprocess.CalledProcessError as e:
+            print("❌ Smoke test failed!")
+            print(e.stderr)
+            sys.exit(1)
+
+        cold_budget, warm_budget = (ms * SCALE for ms in BUDGETS_MS[kind])
+        ok = cold <= cold_budget and warm <= warm_budget
+        failed |= not ok
+        print(f"   {'⏱ ' if ok else '❌'} --help: cold {cold:.0f} ms (budget {cold_budget:.0f}), "
+              f"warm {warm:.0f} ms (budget {warm_budget:.0f})")
+
+    result = subprocess.run(artifact_command(kinds[-1]) + ["--help"], capture_output=True, text=True)
+    print("   Smoke test passed! stdout snippet:")
+    print(textwrap.indent(result.stdout[:200] + "...", "      "))
+    if failed:
+        print("❌ Startup latency over budget")
         sys.exit(1)
 
 def main():
-    check_pyinstaller()
+    parser = argparse.ArgumentParser(description="Build standalone sparkstart executables.")
+    parser.add_argument("--only", action="append", choices=ARTIFACTS, help="artifact(s) to build (default: all)")
+    kinds = tuple(parser.parse_args().only or ARTIFACTS)
+
+    if "onefile" in kinds or "onedir" in kinds:
+        check_pyinstaller()
     clean()
-    build()
-    verify()
+    mark_output_dirs()
+    if "onefile" in kinds:
+        build()
+    if "onedir" in kinds:
+        build(onedir=True)
+    if "zipapp" in kinds:
+        build_zipapp()
+    verify(kinds)
     print("\n🎉 Build successful!")
 
 if __name__ == "__main__":
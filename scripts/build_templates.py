@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Rebuild sparkstart/templates/templates.bundle from sparkstart/templates/src/."""
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sparkstart.templates import BUNDLE, SOURCES, build_bundle
+
+
+def main():
+    build_bundle(SOURCES, BUNDLE)
+    print(f"📦 Wrote {BUNDLE.relative_to(PROJECT_ROOT)} ({BUNDLE.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
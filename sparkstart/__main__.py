@@ -0,0 +1,16 @@
+"""
+`python -m sparkstart`, and the entry point of the standalone builds
+(scripts/build_dist.py).
+
+Keep the guard: `batch` workers may be spawned rather than forked (macOS,
+Windows, frozen builds), and a spawned worker imports the main module again.
+Unguarded, it would run the CLI instead of its project.
+"""
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()  # PyInstaller: a worker runs its task and exits here
+    from sparkstart.cli import app
+
+    app()
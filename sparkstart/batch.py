@@ -0,0 +1,201 @@
+"""
+batch.py – create many projects at once from a TOML manifest
+
+    [defaults]
+    lang = "python"
+
+    [[project]]
+    name = "team-a"
+
+    [[project]]
+    name = "team-b"
+    lang = "rust"
+    github = true
+
+Every project is handed to a worker process, so a batch takes roughly as
+long as its slowest project instead of the sum of all of them.
+
+`delete_projects` is the reverse for a list of folders (names or globs, see
+`expand_names`): the deletions, GitHub API calls included, run on a bounded
+thread pool.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+SPEC_KEYS = {"name", "lang", "template", "devcontainer", "github", "install", "fast_build", "bench"}
+GLOB_CHARS = set("*?[")
+
+
+@dataclass
+class ProjectSpec:
+    """One entry of a batch manifest (same options as `sparkstart new`)."""
+
+    name: str
+    lang: str = "python"
+    template: Optional[str] = None
+    devcontainer: bool = False
+    github: bool = False
+    install: bool = False
+    fast_build: bool = False
+    bench: bool = False
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a single project in a batch."""
+
+    name: str
+    ok: bool
+    error: str = ""
+    seconds: float = 0.0
+
+
+def load_manifest(manifest: pathlib.Path) -> List[ProjectSpec]:
+    """Parse *manifest* into a list of ProjectSpec (raise ValueError if invalid)."""
+    with open(manifest, "rb") as f:
+        data = tomllib.load(f)
+
+    defaults = data.get("defaults", {})
+    entries = data.get("project", [])
+    if not entries:
+        raise ValueError(f"{manifest}: no [[project]] entries found")
+
+    specs: List[ProjectSpec] = []
+    seen: set[str] = set()
+    for entry in entries:
+        fields = {**defaults, **entry}
+        unknown = set(fields) - SPEC_KEYS
+        if unknown:
+            raise ValueError(f"{manifest}: unknown keys {sorted(unknown)}")
+        if "name" not in fields:
+            raise ValueError(f"{manifest}: every [[project]] needs a name")
+        if fields["name"] in seen:
+            raise ValueError(f"{manifest}: duplicate project name {fields['name']!r}")
+        seen.add(fields["name"])
+        specs.append(ProjectSpec(**fields))
+    return specs
+
+
+def _create_one(spec: ProjectSpec, root: pathlib.Path) -> float:
+    """Worker entry point: build one project, return elapsed seconds."""
+    from sparkstart.core import create_project
+
+    start = time.perf_counter()
+    create_project(
+        root / spec.name, spec.github, spec.lang, spec.devcontainer, spec.template,
+        spec.install, spec.fast_build, spec.bench,
+    )
+    return time.perf_counter() - start
+
+
+def create_projects(
+    specs: Iterable[ProjectSpec],
+    root: pathlib.Path,
+    jobs: int | None = None,
+) -> List[BatchResult]:
+    """
+    Create every project in *specs* under *root* using up to *jobs* worker
+    processes (default: CPU count). Failures are reported per project and
+    never abort the rest of the batch. Results keep the order of *specs*.
+    """
+    specs = list(specs)
+    results: dict[str, BatchResult] = {}
+
+    # workers cannot prompt for a token, so it has to come from the environment
+    runnable: List[ProjectSpec] = []
+    for spec in specs:
+        if spec.github and not os.getenv("GITHUB_TOKEN"):
+            results[spec.name] = BatchResult(
+                spec.name, False, "$GITHUB_TOKEN must be set to use github in a batch"
+            )
+        else:
+            runnable.append(spec)
+
+    if runnable:
+        workers = max(1, min(jobs or os.cpu_count() or 1, len(runnable)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_create_one, spec, root): spec for spec in runnable}
+            for future in as_completed(futures):
+                spec = futures[future]
+                try:
+                    results[spec.name] = BatchResult(spec.name, True, seconds=future.result())
+                except Exception as e:
+                    results[spec.name] = BatchResult(spec.name, False, str(e))
+
+    return [results[spec.name] for spec in specs]
+
+
+def expand_names(patterns: Iterable[str], root: pathlib.Path) -> List[pathlib.Path]:
+    """
+    Resolve project names and glob patterns (e.g. "workshop-*") to folders
+    under *root*, without duplicates. Hidden folders only match a pattern
+    that starts with a dot; symlinks never match one (a bulk delete must not
+    reach outside *root*). Raise ValueError for a pattern matching nothing.
+    """
+    paths: dict[pathlib.Path, None] = {}
+    for pattern in patterns:
+        if GLOB_CHARS.isdisjoint(pattern):
+            paths[root / pattern] = None
+            continue
+        matches = sorted(
+            p for p in root.glob(pattern)
+            if p.is_dir() and not p.is_symlink() and (pattern.startswith(".") or not p.name.startswith("."))
+        )
+        if not matches:
+            raise ValueError(f"no project matches {pattern!r}")
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def _delete_one(path: pathlib.Path, github: bool, background: bool) -> float:
+    from sparkstart.core import delete_project
+
+    start = time.perf_counter()
+    delete_project(path, github, background, reap=False)
+    return time.perf_counter() - start
+
+
+def delete_projects(
+    paths: Iterable[pathlib.Path],
+    github: bool = False,
+    background: bool = False,
+    jobs: int = 8,
+) -> List[BatchResult]:
+    """
+    Delete every folder in *paths* (and its GitHub repo if *github*) with at
+    most *jobs* deletions in flight. The work waits on the network and on
+    unlink(), so threads are enough; the token's login is looked up once
+    (see get_github_user). With *background*, one reaper per parent folder
+    empties the trash afterwards. Results keep the order of *paths*.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    results: dict[pathlib.Path, BatchResult] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(paths)))) as pool:
+        futures = {pool.submit(_delete_one, path, github, background): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = BatchResult(path.name, True, seconds=future.result())
+            except Exception as e:
+                results[path] = BatchResult(path.name, False, str(e))
+
+    if background:
+        from sparkstart.utils.trash import TRASH_DIR, spawn_reaper
+
+        for parent in dict.fromkeys(path.parent for path in paths if results[path].ok):
+            spawn_reaper(parent / TRASH_DIR)
+    return [results[path] for path in paths]
@@ -1,11 +1,12 @@
 
-import shutil
 import typer
-import webbrowser
-import sys
+
+from sparkstart.toolchain import which
 
 def open_url(url: str):
     """Open a URL in the default browser, handling errors gracefully."""
+    import webbrowser
+
     print(f"   Opening {url} ...")
     try:
         webbrowser.open(url)
@@ -14,7 +15,7 @@ def open_url(url: str):
 
 def check_docker():
     """Check if Docker is installed. If not, prompt user and open download page."""
-    if shutil.which("docker") is None:
+    if which("docker") is None:
         typer.secho("⚠️  Docker is missing!", fg=typer.colors.YELLOW, bold=True)
         typer.secho("   Docker is required to run the Dev Containers environment.", fg=typer.colors.YELLOW)
         open_url("https://www.docker.com/get-started")
@@ -25,7 +26,7 @@ def check_docker():
 
 def check_vscode():
     """Check if VS Code is installed. If not, prompt user and open download page."""
-    if shutil.which("code") is None:
+    if which("code") is None:
         typer.secho("⚠️  VS Code is missing!", fg=typer.colors.YELLOW, bold=True)
         typer.secho("   We recommend VS Code for the best experience with this project.", fg=typer.colors.YELLOW)
         open_url("https://code.visualstudio.com/")
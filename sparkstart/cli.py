@@ -1,14 +1,24 @@
+"""
+cli.py – the `sparkstart` command line
+
+Keep module-level imports to typer + stdlib: `sparkstart --help` and shell
+completion must not pay for requests, scaffolders or templates. Each command
+imports what it needs inside its body (tests/test_startup.py enforces this).
+"""
+
+from __future__ import annotations
+
 import pathlib
+from typing import List
+
 import typer
-import shutil
-from sparkstart.core import create_project, delete_project
-from sparkstart.checks import check_docker, check_vscode
 
 
 app = typer.Typer(
     help="sparkstart – create a new project repository quickly",
     invoke_without_command=True,  # allows root alias
     no_args_is_help=True,
+    rich_markup_mode=None,  # plain help: rendering it with rich costs more than the rest of startup
 )
 
 
@@ -23,7 +33,13 @@ def main(
     
     Usage:
         sparkstart new <name>
-        sparkstart delete <name>
+        sparkstart batch <manifest.toml>
+        sparkstart delete <name>... | '<glob>'
+        sparkstart gc
+        sparkstart cache prefill | prune | conan
+        sparkstart serve
+        sparkstart check-devcontainer [<path>]
+        sparkstart sync [<path>] [--dry-run]
     """
     if ctx.invoked_subcommand is None:
         # If no subcommand is provided, show the help message
@@ -36,33 +52,278 @@ def main(
 def new(
     name: str,
     github: bool = typer.Option(False, "--github", help="Push to GitHub"),
-    lang: str = typer.Option("python", "--lang", "-l", help="Language: python, rust, javascript, cpp"),
-    template: str = typer.Option(None, "--template", "-t", help="Template: pygame (only for python)"),
+    lang: str = typer.Option("python", "--lang", "-l", help="Language: python, rust, javascript, cpp, or one added by a plugin"),
+    template: str = typer.Option(None, "--template", "-t", help="Template: pygame (python), or one added by a plugin"),
     devcontainer: bool = typer.Option(False, "--devcontainer", "-d", help="Generate .devcontainer config (Docker required)"),
+    install: bool = typer.Option(False, "--install", "-i", help="Install the Python dependencies into .venv from the local wheel cache"),
+    fast_build: bool = typer.Option(False, "--fast-build", help="C++: Ninja, ccache/sccache, mold/lld, precompiled headers; Rust: tuned profiles, sccache, shared target dir"),
+    bench: bool = typer.Option(False, "--bench", help="Add a benchmark harness: pytest-benchmark, criterion, Google Benchmark or a Node script"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="List the files that would be created and exit"),
+    timings: bool = typer.Option(False, "--timings", help="Print how long each step and subprocess took"),
+    trace: pathlib.Path = typer.Option(None, "--trace", dir_okay=False, help="Write a Chrome/Perfetto trace JSON to this file"),
 ):
     """Create a new project folder NAME (optionally push to GitHub)."""
+    if dry_run:
+        _print_plan(pathlib.Path.cwd() / name, github, lang, devcontainer, template, install, fast_build, bench)
+        return
+
+    if not (timings or trace):
+        _new(name, github, lang, template, devcontainer, install, fast_build, bench)
+        return
+
+    from sparkstart.timings import tracing
+
+    with tracing() as tracer:
+        try:
+            _new(name, github, lang, template, devcontainer, install, fast_build, bench)
+        finally:
+            if timings:
+                typer.echo(tracer.table())
+            if trace:
+                tracer.write_chrome_trace(trace)
+                typer.echo(f"Trace written to {trace} (open it in ui.perfetto.dev or chrome://tracing)")
+
+
+def _new(
+    name: str, github: bool, lang: str, template: str | None, devcontainer: bool,
+    install: bool = False, fast_build: bool = False, bench: bool = False,
+) -> None:
+    from sparkstart.core import create_project
+
     if devcontainer:
+        from sparkstart.checks import check_docker, check_vscode
+        from sparkstart.toolchain import discover
+
+        discover(["git", "docker", "code"])  # one parallel lookup for every check below
         check_docker()
         check_vscode()
 
-    create_project(pathlib.Path.cwd() / name, github, lang, devcontainer, template)
+    create_project(pathlib.Path.cwd() / name, github, lang, devcontainer, template, install, fast_build, bench)
+
+
+
+def _print_plan(
+    path: pathlib.Path, github: bool, lang: str, devcontainer: bool, template: str | None,
+    install: bool = False, fast_build: bool = False, bench: bool = False,
+) -> None:
+    import stat
+    from sparkstart.core import plan_project
 
+    plan = plan_project(path.name, lang, devcontainer, template, fast_build, bench)
+    typer.echo(f"Would create {path} ({len(plan)} files):")
+    for spec in sorted(plan, key=lambda f: f.path):
+        typer.echo(f"  {stat.filemode(stat.S_IFREG | spec.mode)} {len(spec.data):>7}  {spec.path}")
+    for d in sorted(plan.dirs):
+        typer.echo(f"  {stat.filemode(stat.S_IFDIR | 0o755)} {'':>7}  {d}/")
+    if lang == "python":
+        typer.echo("  + .venv (Python virtual environment)")
+        if install and "pyproject.toml" in plan:
+            from sparkstart.wheelhouse import project_requirements
+
+            typer.echo(f"  + installed from the wheel cache: {', '.join(project_requirements(plan['pyproject.toml'].data))}")
+    typer.echo("  + git repository with an initial commit on main")
+    if github:
+        typer.echo(f"  + GitHub repository {path.name}, pushed")
+
+
+@app.command()
+def batch(
+    manifest: pathlib.Path = typer.Argument(..., exists=True, dir_okay=False, help="TOML file listing [[project]] entries"),
+    jobs: int = typer.Option(None, "--jobs", "-j", min=1, help="Max projects created in parallel (default: CPU count)"),
+):
+    """Create every project listed in MANIFEST in parallel."""
+    from sparkstart.batch import load_manifest, create_projects
+
+    try:
+        specs = load_manifest(manifest)
+    except ValueError as e:
+        typer.secho(f"Invalid manifest : {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    results = create_projects(specs, pathlib.Path.cwd(), jobs)
+    for r in results:
+        if r.ok:
+            typer.secho(f"  ✓ {r.name} ({r.seconds:.1f}s)", fg=typer.colors.GREEN)
+        else:
+            typer.secho(f"  ✗ {r.name}: {r.error}", fg=typer.colors.RED)
+
+    failed = sum(not r.ok for r in results)
+    typer.echo(f"{len(results) - failed}/{len(results)} projects created")
+    if failed:
+        raise typer.Exit(1)
 
 
 @app.command()
 def delete(
-    name: str,
+    names: List[str] = typer.Argument(..., help="Project folders, or glob patterns such as 'workshop-*'"),
     github: bool = typer.Option(False, "--github"),
     force: bool = typer.Option(False, "--yes", "-y"),
+    background: bool = typer.Option(False, "--background", "-b", help="Move the folder aside now, remove it in the background"),
+    jobs: int = typer.Option(8, "--jobs", "-j", min=1, help="Max projects deleted at the same time"),
 ):
-    target = pathlib.Path.cwd() / name
+    """Delete project folders NAMES (optionally their GitHub repos too)."""
+    from sparkstart.batch import delete_projects, expand_names
+
+    try:
+        targets = expand_names(names, pathlib.Path.cwd())
+    except ValueError as e:
+        typer.secho(f"Failed : {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
     if not force:
-        typer.confirm(f"Delete {'and remote ' if github else ''}{target} ?", abort=True)
+        if len(targets) == 1:
+            typer.confirm(f"Delete {'and remote ' if github else ''}{targets[0]} ?", abort=True)
+        else:
+            for target in targets:
+                typer.echo(f"  {target}")
+            typer.confirm(f"Delete {'and remote ' if github else ''}these {len(targets)} projects ?", abort=True)
+
+    results = delete_projects(targets, github, background, jobs)
+    if len(results) == 1:
+        if results[0].ok:
+            typer.secho("Project deleted !", fg=typer.colors.GREEN)
+        else:
+            typer.secho(f"Failed : {results[0].error}", fg=typer.colors.RED)
+        return
+
+    for r in results:
+        if r.ok:
+            typer.secho(f"  ✓ {r.name}", fg=typer.colors.GREEN)
+        else:
+            typer.secho(f"  ✗ {r.name}: {r.error}", fg=typer.colors.RED)
+    failed = sum(not r.ok for r in results)
+    typer.echo(f"{len(results) - failed}/{len(results)} projects deleted")
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def gc(
+    path: pathlib.Path = typer.Argument(None, file_okay=False, help="Folder whose trash to empty (default: current)"),
+):
+    """Finish removing projects left behind by interrupted `delete --background` runs."""
+    from sparkstart.utils.trash import TRASH_DIR, reap
+
+    trash = (path or pathlib.Path.cwd()) / TRASH_DIR
+    if not trash.exists():
+        typer.echo("Nothing to clean up")
+        return
+    count = sum(1 for _ in trash.iterdir())
+    reap(trash)
+    typer.secho(f"Removed {count} leftover project(s)", fg=typer.colors.GREEN)
 
+
+@app.command()
+def sync(
+    path: pathlib.Path = typer.Argument(None, file_okay=False, help="Project folder (default: current)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only list what would change"),
+):
+    """Pull template updates into a project; files you edited are left alone."""
+    from sparkstart.sync import sync_project
+
+    try:
+        result = sync_project(path or pathlib.Path.cwd(), dry_run)
+    except (ValueError, OSError) as e:
+        typer.secho(f"Failed : {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    verb = "would be " if dry_run else ""
+    for name in result.updated:
+        typer.secho(f"  ✓ {name} ({verb}updated)", fg=typer.colors.GREEN)
+    for name in result.added:
+        typer.secho(f"  + {name} ({verb}added)", fg=typer.colors.GREEN)
+    for name in result.kept:
+        typer.secho(f"  ! {name} (changed here and in the templates: left alone)", fg=typer.colors.YELLOW)
+    for name in result.dropped:
+        typer.echo(f"  - {name} (no longer generated: left in place)")
+    if not (result.updated or result.added):
+        typer.echo(f"Up to date with templates {result.templates}")
+
+
+@app.command("check-devcontainer")
+def check_devcontainer(
+    path: pathlib.Path = typer.Argument(None, file_okay=False, help="Project folder (default: current)"),
+):
+    """Check a project's .devcontainer files without Docker."""
+    from sparkstart.scaffolders.devcontainer import read_devcontainer, validate_devcontainer
+
+    problems = validate_devcontainer(read_devcontainer(path or pathlib.Path.cwd()))
+    for problem in problems:
+        typer.secho(f"  ✗ {problem}", fg=typer.colors.RED)
+    if problems:
+        raise typer.Exit(1)
+    typer.secho("Dev container config OK", fg=typer.colors.GREEN)
+
+
+cache_app = typer.Typer(help="Manage the wheel cache (`new --install`) and the shared Conan cache.", no_args_is_help=True)
+app.add_typer(cache_app, name="cache")
+
+
+@cache_app.command("prefill")
+def cache_prefill(
+    requirements: List[str] = typer.Argument(None, help="Requirements to cache (default: those of the Python templates)"),
+):
+    """Download wheels into the cache, so later installs work offline."""
+    from sparkstart.wheelhouse import prefill, template_requirements, usage
+
+    requirements = requirements or template_requirements()
+    typer.echo(f"Caching wheels for {', '.join(requirements)}...")
     try:
-        from sparkstart.core import delete_project
+        added = prefill(requirements)
+    except RuntimeError as e:
+        typer.secho(f"Failed : {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    count, size = usage()
+    typer.secho(f"Cached {len(added)} wheel(s); the cache holds {count} ({size / 2**20:.1f} MiB)", fg=typer.colors.GREEN)
+
+
+@cache_app.command("prune")
+def cache_prune(
+    days: float = typer.Option(30, "--days", min=0, help="Drop wheels not used for this many days (0: everything)"),
+):
+    """Remove wheels that no recent project used."""
+    from sparkstart.wheelhouse import prune
+
+    removed, freed = prune(days)
+    typer.secho(f"Removed {removed} wheel(s), freed {freed / 2**20:.1f} MiB", fg=typer.colors.GREEN)
 
-        delete_project(target, github)
-        typer.secho("Project deleted !", fg=typer.colors.GREEN)
-    except Exception as e:
+
+@cache_app.command("conan")
+def cache_conan(
+    requires: List[str] = typer.Argument(None, help="Conan references (default: the C++ template's, e.g. gtest)"),
+):
+    """Install prebuilt C++ dependencies into the Conan cache shared by generated projects."""
+    from sparkstart.conan_cache import conan_home, prebuild
+
+    try:
+        refs = prebuild(requires or ())
+    except RuntimeError as e:
         typer.secho(f"Failed : {e}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    typer.secho(f"Ready in {conan_home()}: {', '.join(refs)}", fg=typer.colors.GREEN)
+
+
+@app.command()
+def serve(
+    root: pathlib.Path = typer.Option(None, "--root", file_okay=False, help="Folder to create projects in (default: current)"),
+    socket: pathlib.Path = typer.Option(None, "--socket", dir_okay=False, help="Listen on this Unix socket instead of TCP"),
+    host: str = typer.Option("127.0.0.1", "--host"),
+    port: int = typer.Option(8765, "--port", "-p"),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Requests handled at the same time"),
+    queue: int = typer.Option(32, "--queue", min=0, help="Requests waiting for a worker before new ones get 503"),
+    pool: int = typer.Option(2, "--pool", min=0, help="Python venvs kept ready in advance (0 to disable)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Log every request"),
+):
+    """Keep sparkstart loaded and create/delete projects over HTTP (see sparkstart.server)."""
+    from sparkstart.server import TOKEN_FILE, TOKEN_HEADER, serve as run_server
+
+    def ready(address: str) -> None:
+        typer.secho(f"sparkstart serving {root or pathlib.Path.cwd()} on {address} (Ctrl+C to stop)", fg=typer.colors.GREEN)
+        if socket is None:
+            typer.echo(f"Send the token in {TOKEN_FILE} as the {TOKEN_HEADER} header")
+
+    run_server(root or pathlib.Path.cwd(), socket, host, port, workers, queue, pool, verbose, on_ready=ready)
+
+
+if __name__ == "__main__":  # spawned `batch` workers import this module again
+    app()
@@ -0,0 +1,112 @@
+"""
+conan_cache.py – one Conan home, shared by every generated C++ project
+
+Conan picks binaries by package id, and the id depends on the profile. Each
+project resolving its own `default` profile (and a cppstd that differs from
+the one its CMakeLists asks for) is how googletest ends up compiled from
+source again and again. sparkstart keeps its own Conan home instead:
+
+    <cache>/conan/                 CONAN_HOME for generated projects
+    <cache>/conan/profiles/sparkstart
+                                   detected once, pinned to the templates'
+                                   C++ standard and build type
+
+`prebuild` installs the template's requirements into it once (downloading
+ConanCenter binaries, or building them where none match); afterwards the
+generated build.sh finds this home and profile and runs `conan install`
+against binaries that are already there.
+
+    sparkstart cache conan              # gtest and whatever conanfile.txt requires
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import re
+import tempfile
+from typing import Dict, Iterable, List
+
+from sparkstart.utils.common import get_cache_dir, run_shell
+
+PROFILE = "sparkstart"
+CPPSTD = "17"  # CMAKE_CXX_STANDARD in the cpp template
+BUILD_TYPE = "Release"
+
+
+def conan_home() -> pathlib.Path:
+    return get_cache_dir("conan")
+
+
+def conan_env() -> Dict[str, str]:
+    return {**os.environ, "CONAN_HOME": str(conan_home())}
+
+
+def profile_path() -> pathlib.Path:
+    return conan_home() / "profiles" / PROFILE
+
+
+def _conan(*args: str, cwd: pathlib.Path | None = None) -> bytes:
+    from sparkstart.toolchain import which
+
+    conan = which("conan")
+    if conan is None:
+        raise RuntimeError("'conan' not found. Install it with: pip install conan")
+    return run_shell([conan, *args], cwd=cwd or conan_home(), env=conan_env())
+
+
+def pin_settings(profile: str, **settings: str) -> str:
+    """*profile* text with each [settings] *key* set to *value* (added if missing)."""
+    lines = profile.splitlines()
+    try:
+        start = lines.index("[settings]") + 1
+    except ValueError:
+        lines += ["[settings]"]
+        start = len(lines)
+    end = next((i for i in range(start, len(lines)) if lines[i].startswith("[")), len(lines))
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    for key, value in settings.items():
+        for i in range(start, end):
+            if re.match(rf"{re.escape(key)}\s*=", lines[i]):
+                lines[i] = f"{key}={value}"
+                break
+        else:
+            lines.insert(end, f"{key}={value}")
+            end += 1
+    return "\n".join(lines) + "\n"
+
+
+def ensure_profile() -> pathlib.Path:
+    """Detect the `sparkstart` profile on first use and pin what the templates fix."""
+    path = profile_path()
+    if not path.exists():
+        _conan("profile", "detect", "--name", PROFILE, "--force")
+        path.write_text(pin_settings(path.read_text(), **{"compiler.cppstd": CPPSTD, "build_type": BUILD_TYPE}))
+    return path
+
+
+def template_requires() -> List[str]:
+    """The [requires] of the cpp template's conanfile.txt."""
+    from sparkstart.templates import render
+
+    requires, section = [], None
+    for line in render("cpp/conanfile.txt", name="project").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line.startswith("["):
+            section = line
+        elif line and section == "[requires]":
+            requires.append(line)
+    return requires
+
+
+def prebuild(requires: Iterable[str] = ()) -> List[str]:
+    """Put binaries for *requires* (default: the template's) in the shared home; return them."""
+    requires = list(requires) or template_requires()
+    ensure_profile()
+    args = ["install", "--build=missing", "-pr:h", PROFILE, "-pr:b", PROFILE]
+    for ref in requires:
+        args += ["--requires", ref]
+    with tempfile.TemporaryDirectory(prefix="sparkstart-conan-") as tmp:
+        _conan(*args, cwd=pathlib.Path(tmp))  # it leaves env scripts in the working directory
+    return requires
@@ -1,10 +1,14 @@
 """
 core.py – all the heavy lifting for sparkstart
-    • folder scaffold          (src/, README, .gitignore, etc.)
-    • local virtual-env        (.venv) for Python
-    • git repo + first commit
+    • folder scaffold          (src/, README, .gitignore, etc. – see plan.py)
+    • local virtual-env        (.venv) for Python, optionally with its
+                               dependencies from the local wheel cache
+    • git repo + first commit  (one `git fast-import`, no `git add` re-scan)
     • optional --github push   (per-project token in .projinit.env or $GITHUB_TOKEN)
 
+The steps run as a dependency graph (sparkstart.pipeline), so independent
+ones – venv creation, file writes, remote repo creation – overlap.
+
 Requires: requests, python-dotenv
     pip install requests python-dotenv
 """
@@ -14,19 +18,16 @@ from __future__ import annotations
 import os
 import pathlib
 import shutil
-import webbrowser
-
-from sparkstart.templates.common import README_TEXT, NEW_TOKEN_URL
-from sparkstart.templates.cpp import README_CPP
 
-from sparkstart.utils.common import run_shell, get_project_token, save_project_token
-from sparkstart.utils.github import create_github_repo, delete_github_repo, get_github_user
+from sparkstart.pipeline import DONE, Pipeline, Step
+from sparkstart.plan import Plan, publish, staging_path, write_plan
+from sparkstart.sync import LOCK_FILE, make_lock
+from sparkstart.timings import span
+from sparkstart.utils.common import run_shell, get_project_token
+from sparkstart.utils.git import GitFile, MODE_EXEC, MODE_FILE, init_and_commit
 
-from sparkstart.scaffolders.python import scaffold_python
-from sparkstart.scaffolders.cpp import scaffold_cpp
-from sparkstart.scaffolders.rust import scaffold_rust
-from sparkstart.scaffolders.javascript import scaffold_javascript
-from sparkstart.scaffolders.devcontainer import scaffold_devcontainer
+# Scaffolders, templates and the GitHub client (requests) are imported where
+# they are used, so a project only loads the code for its own language.
 
 
 def create_project(
@@ -34,86 +35,357 @@ def create_project(
     github: bool = False, 
     lang: str = "python", 
     devcontainer: bool = False,
-    template: str | None = None
+    template: str | None = None,
+    install: bool = False,
+    fast_build: bool = False,
+    bench: bool = False,
 ) -> None:
     """
     Make a fully-initialised project directory.
 
+    Everything is built in a hidden staging directory next to *path* and
+    renamed into place at the end, so on failure *path* never exists.
+
     Parameters
     ----------
     path   : pathlib.Path  target directory (must not already exist)
     github : bool          if True, also create & push remote repo
-    lang   : str           language: "python", "rust", "javascript", or "cpp"
+    lang   : str           "python", "rust", "javascript", "cpp" or a plugin language
     devcontainer : bool    if True, generate .devcontainer config
-    template     : str     template name (e.g. "pygame") or None
+    template     : str     template name (e.g. "pygame", or a plugin's) or None
+    install      : bool    if True, install a Python project's dependencies into
+                           .venv from the wheel cache (see sparkstart.wheelhouse)
+    fast_build   : bool    if True, set a C++ or Rust project up for fast incremental builds
+    bench        : bool    if True, add a benchmark harness with a sample benchmark
     """
-    # Create project folder
-    path.mkdir(parents=False, exist_ok=False)
-    
-    # Add README
-    if lang == "cpp":
-        (path / "README.md").write_text(README_CPP.format(name=path.name))
-    else:
-        (path / "README.md").write_text(README_TEXT.format(name=path.name))
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+    token, prompted = _resolve_token(path) if github else (None, False)
 
-    # Language-specific scaffolding
-    if lang == "python":
-        scaffold_python(path, template)
-    elif lang == "rust":
-        scaffold_rust(path)
-    elif lang == "javascript":
-        scaffold_javascript(path)
-    elif lang == "cpp":
-        scaffold_cpp(path)
-    else:
-        raise ValueError(f"Unknown language: {lang}. Choose: python, rust, javascript, cpp")
+    staging = staging_path(path)
+    pipeline = build_pipeline(
+        path, staging, github, lang, devcontainer, template,
+        save_token=prompted, install=install, fast_build=fast_build, bench=bench,
+    )
+    try:
+        with span("create_project", path=path, lang=lang):
+            pipeline.run({"token": token})
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        if pipeline.status.get("remote") == DONE and pipeline.status.get("publish") != DONE:
+            _discard_remote(path.name, token)
+        raise
 
-    # Dev Container
+
+def plan_project(
+    name: str,
+    lang: str = "python",
+    devcontainer: bool = False,
+    template: str | None = None,
+    fast_build: bool = False,
+    bench: bool = False,
+) -> Plan:
+    """Return every file create_project would write, without touching the disk."""
+    plan = Plan()
+    for part in _plan_parts(name, lang, devcontainer, template, fast_build, bench).values():
+        plan.update(part())
+    plan.add(LOCK_FILE, make_lock(name, _lock_options(lang, devcontainer, template, fast_build, bench), plan))
+    return plan
+
+
+def _lock_options(lang: str, devcontainer: bool, template: str | None, fast_build: bool, bench: bool) -> dict:
+    """plan_project's keyword arguments, as recorded in .sparkstart.lock for `sparkstart sync`."""
+    return {"lang": lang, "devcontainer": devcontainer, "template": template, "fast_build": fast_build, "bench": bench}
+
+
+def _plan_parts(
+    name: str, lang: str, devcontainer: bool, template: str | None, fast_build: bool = False, bench: bool = False,
+) -> dict:
+    """Map pipeline step name -> callable returning that step's Plan, in merge order."""
+    parts = {
+        "readme": lambda: _readme_plan(name),
+        "scaffold": _language_plan(name, lang, template, fast_build, bench),
+    }
     if devcontainer:
-        if shutil.which("docker") is None:
-            import typer
-            typer.secho(
-                "WARNING: Docker not found. You need Docker to use Dev Containers.",
-                fg=typer.colors.YELLOW
-            )
-        scaffold_devcontainer(path, lang)
+        from sparkstart.scaffolders.devcontainer import scaffold_devcontainer
+
+        parts["devcontainer"] = lambda: scaffold_devcontainer(lang)
+    return parts
+
+
+def build_pipeline(
+    path: pathlib.Path,
+    staging: pathlib.Path,
+    github: bool = False,
+    lang: str = "python",
+    devcontainer: bool = False,
+    template: str | None = None,
+    save_token: bool = False,
+    install: bool = False,
+    fast_build: bool = False,
+    bench: bool = False,
+) -> Pipeline:
+    """
+    Describe create_project as a graph of steps (see sparkstart.pipeline).
+
+    The graph reads one context value, "token" (GitHub token or None). Plan
+    steps are pure; "write" applies their merged Plan to *staging* (with a
+    .sparkstart.lock of what the templates generated, see sparkstart.sync), and
+    "publish" renames *staging* to *path* once everything inside it is done.
+    Callers may add Steps before running: a step providing "plan:<x>" (a Plan)
+    is merged into the project, one providing "staged:<x>" must finish before
+    publish.
+
+        readme ─────┐
+        scaffold ───┼─ (save-token) ─┐
+        devcontainer┘                │
+        mkdir ───────────────────────┴─ write ─ commit ─┐
+          └─ venv (Python) ─ (install) ──────────────────┼─ publish ─┐
+        tools ───────────────────────────────────────────┘           ├─ push
+        remote (token) ──────────────────────────────────────────────┘
+    """
+    pipeline = Pipeline([
+        Step("tools", lambda ctx: _check_tools(devcontainer), outputs=("tools",)),
+        Step("mkdir", lambda ctx: staging.mkdir(parents=False, exist_ok=False), outputs=("dir",)),
+    ])
+    parts = _plan_parts(path.name, lang, devcontainer, template, fast_build, bench)
+    for name, part in parts.items():
+        key = f"plan:{name}"
+        pipeline.add(Step(name, lambda ctx, key=key, part=part: {key: part()}, outputs=(key,)))
+
+    if save_token:
+        # it appends to the language's .gitignore, so it goes after scaffolding
+        pipeline.add(Step(
+            "save-token", lambda ctx: {"plan:token": _token_plan(ctx["plan:scaffold"], ctx["token"])},
+            inputs=("plan:scaffold", "token"), outputs=("plan:token",),
+        ))
+
+    if lang == "python":
+        from sparkstart.utils.venv_seed import create_venv
+
+        if os.name == "nt":  # Windows venvs cannot be moved: build in place after publish
+            venv_dir, prefix, venv_out = path / ".venv", None, "venv"
+            pipeline.add(Step("venv", lambda ctx: create_venv(venv_dir), inputs=("published",), outputs=(venv_out,)))
+        else:
+            venv_dir, prefix, venv_out = staging / ".venv", path / ".venv", "staged:venv"
+            pipeline.add(Step(
+                "venv", lambda ctx: create_venv(venv_dir, prefix=prefix),
+                inputs=("dir",), outputs=(venv_out,),
+            ))
+        if install:
+            pipeline.add(Step(
+                "install", lambda ctx: _install_dependencies(venv_dir, prefix, ctx["plan:scaffold"]),
+                inputs=(venv_out, "plan:scaffold"), outputs=("staged:install" if prefix else "installed",),
+            ))
+
+    def write(ctx: dict) -> dict:
+        plan, generated = Plan(), Plan()
+        for key in plan_keys:
+            plan.update(ctx[key])
+            if key[len("plan:"):] in parts:
+                generated.update(ctx[key])
+        # hashes of what the templates made (before e.g. save-token edits .gitignore)
+        options = _lock_options(lang, devcontainer, template, fast_build, bench)
+        plan.add(LOCK_FILE, make_lock(path.name, options, generated))
+        write_plan(plan, staging)
+        return {"plan": plan}
+
+    def commit(ctx: dict) -> dict:
+        files = [GitFile(f.path, f.data, MODE_EXEC if f.mode & 0o111 else MODE_FILE) for f in ctx["plan"]]
+        return {"commit": init_and_commit(staging, "Initial commit", files)}
+
+    outputs = [out for step in pipeline.steps.values() for out in step.outputs]
+    plan_keys = tuple(out for out in outputs if out.startswith("plan:"))
+    pipeline.add(Step("write", write, inputs=("dir",) + plan_keys, outputs=("plan",)))
+    pipeline.add(Step("commit", commit, inputs=("plan", "tools"), outputs=("commit",)))
+
+    staged = tuple(out for step in pipeline.steps.values() for out in step.outputs if out.startswith("staged:"))
+    pipeline.add(Step(
+        "publish", lambda ctx: publish(staging, path),
+        inputs=("commit",) + staged, outputs=("published",),
+    ))
+
+    if github:
+        pipeline.add(Step("remote", _create_remote(path.name), inputs=("token",), outputs=("repo_url",)))
+        pipeline.add(Step(
+            "push", _push(path), inputs=("published", "commit", "repo_url", "token"), outputs=("pushed",),
+        ))
+
+    return pipeline
+
+
+def _check_tools(devcontainer: bool) -> None:
+    from sparkstart.toolchain import discover
+
+    tools = discover(["git", "docker"] if devcontainer else ["git"])
 
     # git repository
-    if shutil.which("git") is None:
+    if not tools["git"].found:
         raise RuntimeError("`git` executable not found in PATH")
 
-    # GitHub remote + push (optional)
-    token: str | None = None
-    if github:
-        # token preference: .projinit.env  >  $GITHUB_TOKEN  >  prompt user
-        token = get_project_token(path) or os.getenv("GITHUB_TOKEN", "")
-        if not token:
-            import typer  # lazy import to avoid hard dependency in library mode
+    # Dev Container
+    if devcontainer and not tools["docker"].found:
+        import typer
+        typer.secho(
+            "WARNING: Docker not found. You need Docker to use Dev Containers.",
+            fg=typer.colors.YELLOW
+        )
 
-            typer.secho("Opening GitHub to generate a token...", fg=typer.colors.YELLOW)
-            webbrowser.open(NEW_TOKEN_URL.format(name=path.name))
-            token = typer.prompt(
-                "Paste your new GitHub token here (saved to .projinit.env, never committed)"
-            )
-            save_project_token(path, token)
 
-    run_shell(["git", "init", "-b", "main"], cwd=path)
-    run_shell(["git", "add", "."], cwd=path)
-    run_shell(["git", "commit", "-m", "Initial commit"], cwd=path)
+def _install_dependencies(venv_dir: pathlib.Path, prefix: pathlib.Path | None, sources: Plan) -> None:
+    """pip install the project's dependencies from the wheel cache; only warn on failure."""
+    from sparkstart.utils.venv_seed import relocate_venv
+    from sparkstart.wheelhouse import install, project_requirements
 
-    if github:
-        repo_url = create_github_repo(path.name, token)
-        # inject token into HTTPS URL for authentication: https://TOKEN@github.com/...
-        auth_repo_url = repo_url.replace("https://", f"https://{token}@", 1)
+    if "pyproject.toml" not in sources:
+        return
+    try:
+        install(venv_dir, project_requirements(sources["pyproject.toml"].data))
+    except (RuntimeError, OSError, ValueError) as e:
+        import typer
+        typer.secho(
+            f"WARNING: could not install the dependencies ({str(e).splitlines()[-1]}); run pip install yourself.",
+            fg=typer.colors.YELLOW
+        )
+    if prefix is not None:
+        relocate_venv(venv_dir, str(venv_dir.absolute()), prefix)  # new scripts' shebangs
+
+
+def _readme_plan(name: str) -> Plan:
+    # C++ projects replace this with their own, longer README
+    from sparkstart.templates import render
+
+    plan = Plan()
+    plan.add("README.md", render("common/README.md", name=name))
+    return plan
+
+
+def _language_plan(name: str, lang: str, template: str | None, fast_build: bool = False, bench: bool = False):
+    """
+    Return a callable producing the language scaffolder's Plan (see
+    sparkstart.registry), with the --fast-build and --bench changes applied on top.
+    """
+    from sparkstart import registry
+
+    scaffold = registry.get_language(lang)
+    apply_template = registry.get_template(lang, template) if template else None
+
+    def run() -> Plan:
+        if apply_template is None:
+            plan = scaffold(name, template)
+        else:
+            plan = scaffold(name, None)
+            plan = apply_template(name, plan) or plan
+        if fast_build:
+            from sparkstart.scaffolders.fast_build import scaffold_fast_build
+
+            plan.update(scaffold_fast_build(lang, plan))
+        if bench:
+            from sparkstart.scaffolders.bench import scaffold_bench
+
+            plan.update(scaffold_bench(lang, name, plan))
+        return plan
+    return run
+
+
+def _token_plan(sources: Plan, token: str) -> Plan:
+    """.projinit.env holding *token*, plus a .gitignore that ignores it (cf. save_project_token)."""
+    plan = Plan()
+    plan.add(".projinit.env", f"GITHUB_TOKEN={token}\n", mode=0o600)
+
+    lines = sources[".gitignore"].data.decode().splitlines() if ".gitignore" in sources else []
+    if ".projinit.env" not in lines:
+        lines.append(".projinit.env")
+        plan.add(".gitignore", "\n".join(lines) + "\n")
+    return plan
+
+
+def _create_remote(repo_name: str):
+    def run(ctx: dict) -> dict:
+        from sparkstart.utils.github import create_github_repo
+
+        # auto_init: the Git Data API (see _push) only works on a non-empty repo
+        return {"repo_url": create_github_repo(repo_name, ctx["token"], auto_init=True)}
+    return run
 
-        run_shell(["git", "remote", "add", "origin", auth_repo_url], cwd=path)
-        run_shell(["git", "push", "-u", "origin", "main"], cwd=path)
+
+def _push(path: pathlib.Path):
+    """
+    Upload the initial commit through the Git Data API, falling back to
+    `git push --force` for non-HTTP remotes, if the API fails, or if GitHub's
+    copy of the commit came out different; then track origin/main like
+    `push -u` would.
+    """
+    def run(ctx: dict) -> None:
+        url, commit, token = ctx["repo_url"], ctx["commit"], ctx["token"]
+        remote_sha = None
+        if url.startswith(("https://", "http://")):
+            import requests
+            from sparkstart.utils.github import push_commit
+
+            try:
+                remote_sha = push_commit(url, commit, token)
+            except (requests.RequestException, RuntimeError, ValueError, KeyError) as e:
+                import typer
+                typer.secho(
+                    f"WARNING: GitHub API upload failed ({str(e).splitlines()[0]}); pushing with git instead.",
+                    fg=typer.colors.YELLOW
+                )
+        if remote_sha != commit.sha:
+            # inject token into HTTPS URL for authentication: https://TOKEN@github.com/...
+            auth_repo_url = url.replace("https://", f"https://{token}@", 1)
+            run_shell(["git", "push", "--force", auth_repo_url, "main:main"], cwd=path)
+
+        # the token stays out of .git/config
+        run_shell(["git", "remote", "add", "origin", url], cwd=path)
+        run_shell(["git", "update-ref", "refs/remotes/origin/main", commit.sha], cwd=path)
+        run_shell(["git", "branch", "--set-upstream-to=origin/main", "main"], cwd=path)
+    return run
 
 
-def delete_project(path: pathlib.Path, github: bool = False) -> None:
+def _resolve_token(path: pathlib.Path) -> tuple[str, bool]:
+    """
+    Return (token, prompted).
+    Token preference: .projinit.env  >  $GITHUB_TOKEN  >  prompt user.
+    A prompted token still has to be saved with save_project_token().
+    """
+    token = get_project_token(path) or os.getenv("GITHUB_TOKEN", "")
+    if token:
+        return token, False
+
+    import typer  # lazy import to avoid hard dependency in library mode
+    import webbrowser
+    from sparkstart.templates.common import NEW_TOKEN_URL
+
+    typer.secho("Opening GitHub to generate a token...", fg=typer.colors.YELLOW)
+    webbrowser.open(NEW_TOKEN_URL.format(name=path.name))
+    token = typer.prompt(
+        "Paste your new GitHub token here (saved to .projinit.env, never committed)"
+    )
+    return token, True
+
+
+def _discard_remote(repo_name: str, token: str) -> None:
+    """Best-effort removal of a remote repo whose local project failed to build."""
+    from sparkstart.utils.github import delete_github_repo, get_github_user
+
+    try:
+        delete_github_repo(get_github_user(token), repo_name, token)
+    except Exception:
+        pass  # we cannot clean it up anyway
+
+
+def delete_project(
+    path: pathlib.Path, github: bool = False, background: bool = False, reap: bool = True
+) -> None:
     """
     Delete *path* directory; optionally delete its remote GitHub repo.
 
+    With *background*, *path* is renamed into <parent>/.sparkstart-trash/ and
+    removed by a detached process, so this returns as soon as it is gone
+    from its old location (see sparkstart.utils.trash). *reap*=False skips
+    starting that process, for callers deleting many projects at once.
+
     Token resolution order:
         1.  .projinit.env inside the project
         2.  $GITHUB_TOKEN
@@ -129,8 +401,17 @@ def delete_project(path: pathlib.Path, github: bool = False) -> None:
             raise RuntimeError(
                 "No GitHub token found in .projinit.env or $GITHUB_TOKEN"
             )
+        from sparkstart.utils.github import delete_github_repo, get_github_user
+
         owner = get_github_user(token)
         delete_github_repo(owner, path.name, token)
 
     # finally delete local directory
-    shutil.rmtree(path)
+    from sparkstart.utils.trash import move_to_trash, rmtree_parallel, spawn_reaper
+
+    if background:
+        trash = move_to_trash(path).parent
+        if reap:
+            spawn_reaper(trash)
+    else:
+        rmtree_parallel(path)
@@ -0,0 +1,139 @@
+"""
+pipeline.py – run project-creation steps as a dependency graph
+
+A Step names the context values it reads (`inputs`) and the ones it
+produces (`outputs`). The scheduler derives the edges from those names and
+runs every step whose inputs are ready on a thread pool, so independent work
+(file writes, venv creation, remote repo creation, tool discovery) overlaps.
+
+Threads are enough here: the slow steps wait on child processes (git,
+ensurepip) or on the network, so they never hold the GIL while they work.
+
+When a step fails, every step downstream of it is cancelled without being
+started; unrelated steps still finish. `run()` then re-raises the first
+failure, so callers see the same exception as if the steps ran in sequence.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sparkstart.timings import span
+
+PENDING, DONE, FAILED, CANCELLED = "pending", "done", "failed", "cancelled"
+
+
+@dataclass
+class Step:
+    """A named unit of work: fn(ctx) -> {output: value} (or None)."""
+
+    name: str
+    fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+class Pipeline:
+    """A set of Steps wired together by their inputs and outputs."""
+
+    def __init__(self, steps: Iterable[Step] = ()) -> None:
+        self.steps: Dict[str, Step] = {}
+        self.status: Dict[str, str] = {}
+        for step in steps:
+            self.add(step)
+
+    def add(self, step: Step) -> Step:
+        """Register *step*; names and outputs must be unique."""
+        if step.name in self.steps:
+            raise ValueError(f"duplicate step {step.name!r}")
+        for out in step.outputs:
+            if out in self._producers():
+                raise ValueError(f"{out!r} is already produced by {self._producers()[out]!r}")
+        self.steps[step.name] = step
+        return step
+
+    def _producers(self) -> Dict[str, str]:
+        return {out: s.name for s in self.steps.values() for out in s.outputs}
+
+    def dependencies(self, given: Iterable[str] = ()) -> Dict[str, List[str]]:
+        """Map each step to the steps it waits for; raise ValueError if unsatisfiable."""
+        producers = self._producers()
+        given = set(given)
+        deps: Dict[str, List[str]] = {}
+        for step in self.steps.values():
+            deps[step.name] = []
+            for name in step.inputs:
+                if name in producers:
+                    deps[step.name].append(producers[name])
+                elif name not in given:
+                    raise ValueError(f"step {step.name!r} needs {name!r}, which nothing provides")
+
+        # reject cycles before running anything
+        state: Dict[str, int] = {}
+
+        def visit(name: str) -> None:
+            if state.get(name) == 1:
+                raise ValueError(f"dependency cycle through step {name!r}")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in deps[name]:
+                visit(dep)
+            state[name] = 2
+
+        for name in deps:
+            visit(name)
+        return deps
+
+    @staticmethod
+    def _call(step: Step, ctx: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with span(step.name, "step"):
+            return step.fn(ctx)
+
+    def run(self, context: Optional[Dict[str, Any]] = None, max_workers: int = 8) -> Dict[str, Any]:
+        """Execute all steps; return the context with every output filled in."""
+        ctx: Dict[str, Any] = dict(context or {})
+        deps = self.dependencies(ctx)
+        dependents: Dict[str, List[str]] = {name: [] for name in deps}
+        for name, needs in deps.items():
+            for dep in needs:
+                dependents[dep].append(name)
+
+        self.status = {name: PENDING for name in deps}
+        errors: List[BaseException] = []
+        running: Dict[Future, str] = {}
+
+        def cancel_downstream(name: str) -> None:
+            for child in dependents[name]:
+                if self.status[child] == PENDING:
+                    self.status[child] = CANCELLED
+                    cancel_downstream(child)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                for name, needs in deps.items():
+                    if self.status[name] == PENDING and name not in running.values() \
+                            and all(self.status[d] == DONE for d in needs):
+                        running[pool.submit(self._call, self.steps[name], dict(ctx))] = name
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        produced = future.result() or {}
+                    except BaseException as e:
+                        self.status[name] = FAILED
+                        errors.append(e)
+                        cancel_downstream(name)
+                        continue
+                    for out in self.steps[name].outputs:
+                        ctx[out] = produced.get(out)
+                    self.status[name] = DONE
+
+        if errors:
+            raise errors[0]
+        return ctx
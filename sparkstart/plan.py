@@ -0,0 +1,93 @@
+"""
+plan.py – declarative scaffold plans and the single writer that applies them
+
+Scaffolders no longer touch the disk. They return a Plan: project-relative
+files (path, bytes, mode) plus any empty directories. `write_plan` applies a
+plan in one pass (all directories first, then every file created with its
+final mode), and `publish` moves the finished staging directory into place
+with one atomic rename, so a failed run never leaves half a project behind.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import secrets
+from typing import Dict, Iterator, NamedTuple, Set, Union
+
+
+class FileSpec(NamedTuple):
+    """One file to create: project-relative POSIX path, content, permissions."""
+
+    path: str
+    data: bytes
+    mode: int = 0o644
+
+
+class Plan:
+    """Ordered set of files (and empty directories) making up a project."""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, FileSpec] = {}
+        self.dirs: Set[str] = set()
+
+    def add(self, path: str, data: Union[str, bytes], mode: int = 0o644) -> None:
+        """Add (or replace) a file; text is encoded as UTF-8."""
+        if isinstance(data, str):
+            data = data.encode()
+        self.files[path] = FileSpec(path, data, mode)
+
+    def mkdir(self, path: str) -> None:
+        """Create *path* even if no file ends up inside it."""
+        self.dirs.add(path)
+
+    def update(self, other: "Plan") -> None:
+        """Merge *other* into this plan; its files win on conflicts."""
+        self.files.update(other.files)
+        self.dirs |= other.dirs
+
+    def __iter__(self) -> Iterator[FileSpec]:
+        return iter(self.files.values())
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.files
+
+    def __getitem__(self, path: str) -> FileSpec:
+        return self.files[path]
+
+
+def write_plan(plan: Plan, root: pathlib.Path) -> None:
+    """Write every file of *plan* under the existing directory *root*."""
+    dirs = set(plan.dirs)
+    for spec in plan:
+        parent = spec.path.rpartition("/")[0]
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+    for d in sorted(dirs):  # parents sort before their children
+        os.mkdir(root / d)
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for spec in plan:
+        fd = os.open(root / spec.path, flags, spec.mode)
+        try:
+            view = memoryview(spec.data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+
+def staging_path(target: pathlib.Path) -> pathlib.Path:
+    """A hidden sibling of *target*: same filesystem, so publishing is a rename."""
+    return target.parent / f".{target.name}.sparkstart-{secrets.token_hex(4)}"
+
+
+def publish(staging: pathlib.Path, target: pathlib.Path) -> None:
+    """Atomically move the finished *staging* directory to *target*."""
+    if target.exists():  # rename() would silently replace an empty directory
+        raise FileExistsError(f"{target} already exists")
+    os.rename(staging, target)
@@ -0,0 +1,151 @@
+"""
+registry.py – languages and templates, built in or contributed by plugins
+
+Third-party packages register through entry points:
+
+    [project.entry-points."sparkstart.languages"]
+    go = "sparkstart_go:scaffold"          # fn(name, template) -> Plan
+
+    [project.entry-points."sparkstart.templates"]
+    "python@fastapi" = "acme_templates:fastapi"   # fn(name, plan) -> Plan | None
+
+A language scaffolder returns the project's Plan. A template receives the
+language's plan (built with template=None) and edits it in place or returns
+a replacement.
+
+Scanning entry points means reading the metadata of every installed
+distribution, so the result is cached in <cache>/plugins.json. That cache is
+keyed by the name and mtime of each *.dist-info / *.egg-info directory on
+sys.path. Installing, upgrading or removing a distribution changes the key.
+The lookup itself only lists the sys.path directories.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+
+from sparkstart.utils.common import get_cache_dir
+
+LANGUAGE_GROUP = "sparkstart.languages"
+TEMPLATE_GROUP = "sparkstart.templates"
+INDEX_FILE = "plugins.json"
+
+BUILTIN_LANGUAGES = {
+    "python": "sparkstart.scaffolders.python:scaffold_python",
+    "rust": "sparkstart.scaffolders.rust:scaffold_rust",
+    "javascript": "sparkstart.scaffolders.javascript:scaffold_javascript",
+    "cpp": "sparkstart.scaffolders.cpp:scaffold_cpp",
+}
+# handled by the language scaffolder itself (no separate template function)
+BUILTIN_TEMPLATES = {"python": ["pygame"]}
+
+_index: Optional[Dict[str, Dict[str, str]]] = None
+_lock = threading.Lock()
+
+
+def metadata_fingerprint() -> str:
+    """Hash of sys.path and the mtime of every distribution's metadata dir on it."""
+    h = hashlib.sha256()
+    for entry in sys.path:
+        h.update(f"\0{entry}".encode())
+        try:
+            with os.scandir(entry or ".") as it:
+                found = sorted(
+                    (d.name, d.stat().st_mtime_ns) for d in it
+                    if d.name.endswith((".dist-info", ".egg-info"))
+                )
+        except OSError:  # zip files, missing dirs
+            continue
+        for name, mtime in found:
+            h.update(f"\n{name}:{mtime}".encode())
+    return h.hexdigest()
+
+
+def _scan_entry_points() -> Dict[str, Dict[str, str]]:
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    index: Dict[str, Dict[str, str]] = {}
+    for group in (LANGUAGE_GROUP, TEMPLATE_GROUP):
+        found = eps.select(group=group) if hasattr(eps, "select") else eps.get(group, [])
+        index[group] = {ep.name: ep.value for ep in found}
+    return index
+
+
+def plugin_index() -> Dict[str, Dict[str, str]]:
+    """{group: {name: "module:attr"}} for installed plugins, from the cache when valid."""
+    global _index
+    with _lock:
+        if _index is not None:
+            return _index
+
+        key = metadata_fingerprint()
+        path = get_cache_dir() / INDEX_FILE
+        try:
+            cached = json.loads(path.read_text())
+            if cached.get("key") == key:
+                _index = cached["entry_points"]
+                return _index
+        except (OSError, ValueError, KeyError):
+            pass
+
+        _index = _scan_entry_points()
+        tmp = path.with_name(f"{INDEX_FILE}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps({"key": key, "entry_points": _index}))
+            os.replace(tmp, path)
+        except OSError:
+            pass  # a read-only cache only costs us the rescan next time
+        return _index
+
+
+def reset() -> None:
+    """Forget the in-process index (e.g. after installing a plugin)."""
+    global _index
+    with _lock:
+        _index = None
+
+
+def _load(ref: str) -> Callable:
+    module, _, attr = ref.partition(":")
+    obj = importlib.import_module(module)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def languages() -> List[str]:
+    plugins = plugin_index()[LANGUAGE_GROUP]
+    return list(BUILTIN_LANGUAGES) + sorted(set(plugins) - set(BUILTIN_LANGUAGES))
+
+
+def templates(lang: str) -> List[str]:
+    prefix = f"{lang}@"
+    plugins = [name[len(prefix):] for name in plugin_index()[TEMPLATE_GROUP] if name.startswith(prefix)]
+    builtin = BUILTIN_TEMPLATES.get(lang, [])
+    return builtin + sorted(set(plugins) - set(builtin))
+
+
+def get_language(lang: str) -> Callable:
+    """Scaffolder for *lang*: fn(name, template) -> Plan. Built-ins win over plugins."""
+    ref = BUILTIN_LANGUAGES.get(lang) or plugin_index()[LANGUAGE_GROUP].get(lang)
+    if ref is None:
+        raise ValueError(f"Unknown language: {lang}. Choose: {', '.join(languages())}")
+    return _load(ref)
+
+
+def get_template(lang: str, template: str) -> Optional[Callable]:
+    """Template function for *lang*, or None if the language scaffolder handles it."""
+    if template in BUILTIN_TEMPLATES.get(lang, []):
+        return None
+    ref = plugin_index()[TEMPLATE_GROUP].get(f"{lang}@{template}")
+    if ref is None:
+        choices = ", ".join(templates(lang)) or "none"
+        raise ValueError(f"Unknown template {template!r} for {lang}. Choose: {choices}")
+    return _load(ref)
@@ -0,0 +1,5 @@
+def insert_after(text: str, anchor: str, addition: str, file: str, option: str) -> str:
+    """*text* with *addition* right after the first *anchor*; ValueError naming *option* if it has none."""
+    if anchor not in text:
+        raise ValueError(f"{option}: {file} has no {anchor.strip()!r} to hook into")
+    return text.replace(anchor, anchor + addition, 1)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+
+from sparkstart.plan import Plan
+from sparkstart.scaffolders import insert_after
+from sparkstart.templates import render, render_tree
+
+BENCH_LANGS = ("python", "rust", "cpp", "javascript")
+PYTEST_BENCHMARK = "pytest-benchmark"
+CRITERION = "criterion"
+GOOGLE_BENCHMARK = "benchmark/1.8.3"  # Conan reference, next to gtest in conanfile.txt
+
+
+def _hook(text: str, anchor: str, addition: str, file: str) -> str:
+    return insert_after(text, anchor, addition, file, "--bench")
+
+
+def scaffold_bench(lang: str, name: str, sources: Plan) -> Plan:
+    """Plan a sample benchmark, and what it needs to build and run, on top of a scaffolded project."""
+    if lang not in BENCH_LANGS:
+        raise ValueError(f"--bench is not available for {lang} (only: {', '.join(BENCH_LANGS)})")
+    return {"python": _bench_python, "rust": _bench_rust, "cpp": _bench_cpp, "javascript": _bench_javascript}[lang](name, sources)
+
+
+def _bench_python(name: str, sources: Plan) -> Plan:
+    plan = render_tree("bench/python")
+    pyproject = sources["pyproject.toml"].data.decode()
+    pyproject = _hook(
+        pyproject, "[project.optional-dependencies]\n", f'bench = ["pytest", "{PYTEST_BENCHMARK}"]\n', "pyproject.toml"
+    )
+    # a plain `pytest` stays fast: benchmarks run with `pytest benchmarks`
+    pyproject = pyproject.rstrip("\n") + '\n\n[tool.pytest.ini_options]\ntestpaths = ["tests"]\n'
+    plan.add("pyproject.toml", pyproject)
+    return plan
+
+
+def _bench_rust(name: str, sources: Plan) -> Plan:
+    plan = render_tree("bench/rust", crate=name.replace("-", "_"))
+    plan.add("Cargo.toml", sources["Cargo.toml"].data + plan["Cargo.toml"].data)
+    return plan
+
+
+def _bench_cpp(name: str, sources: Plan) -> Plan:
+    plan = render_tree("bench/cpp")
+    plan.add("conanfile.txt", _hook(sources["conanfile.txt"].data.decode(), "\ngtest/1.14.0\n", f"{GOOGLE_BENCHMARK}\n", "conanfile.txt"))
+    cmake = sources["CMakeLists.txt"].data.decode()
+    plan.add("CMakeLists.txt", _hook(cmake, "\nadd_subdirectory(tests)\n", "\n# BENCHMARKS (./build/bench/benchmarks)\nadd_subdirectory(bench)\n", "CMakeLists.txt"))
+    if "cmake/FastBuild.cmake" in sources:  # --fast-build
+        bench = plan["bench/CMakeLists.txt"].data.decode()
+        plan.add("bench/CMakeLists.txt", _hook(bench, "add_executable(benchmarks bench_main.cpp)\n", "fast_build_target(benchmarks)\n", "bench/CMakeLists.txt"))
+    return plan
+
+
+def _bench_javascript(name: str, sources: Plan) -> Plan:
+    plan = render_tree("bench/javascript")
+    package = json.loads(sources["package.json"].data)
+    package.setdefault("scripts", {})["bench"] = "node bench/index.bench.js"
+    plan.add("package.json", json.dumps(package, indent=2) + "\n")
+    return plan
@@ -1,16 +1,116 @@
+from __future__ import annotations
+
+import json
 import pathlib
-from sparkstart.templates.devcontainer import DEVCONTAINER_JSON, DEVCONTAINER_PYTHON
-
-def scaffold_devcontainer(path: pathlib.Path, lang: str) -> None:
-    """Create .devcontainer configuration."""
-    (path / ".devcontainer").mkdir()
-    
-    if lang == "cpp":
-        content = DEVCONTAINER_JSON
-    elif lang == "python":
-        content = DEVCONTAINER_PYTHON
-    else:
-        # Fallback or Todo
-        return
-
-    (path / ".devcontainer" / "devcontainer.json").write_text(content + "\n")
+import re
+from typing import Dict, List
+
+from sparkstart.plan import Plan
+from sparkstart.templates import render_tree
+
+DEVCONTAINER_LANGS = ("python", "rust", "javascript", "cpp")
+DEVCONTAINER_DIR = ".devcontainer"
+
+
+def scaffold_devcontainer(lang: str) -> Plan:
+    """Plan .devcontainer configuration: a Dockerfile plus devcontainer.json with cache volumes
+    (and, for Python, the Dockerfile.dockerignore that keeps its build context small)."""
+    if lang not in DEVCONTAINER_LANGS:
+        raise ValueError(f"--devcontainer is not available for {lang} (only: {', '.join(DEVCONTAINER_LANGS)})")
+    plan = Plan()
+    plan.mkdir(DEVCONTAINER_DIR)
+    for spec in render_tree(f"devcontainer/{lang}"):
+        plan.add(f"{DEVCONTAINER_DIR}/{spec.path}", spec.data)
+    return plan
+
+
+def _dockerfile_args(dockerfile: str) -> Dict[str, str]:
+    return dict(re.findall(r"^ARG\s+(\w+)=(\S+)", dockerfile, re.MULTILINE))
+
+
+def _expand(text: str, args: Dict[str, str]) -> str:
+    return re.sub(r"\$\{(\w+)\}|\$(\w+)", lambda m: args.get(m[1] or m[2], m[0]), text)
+
+
+def validate_devcontainer(plan: Plan) -> List[str]:
+    """
+    Problems with the .devcontainer files in *plan* (empty if none), without Docker.
+
+    Checks that devcontainer.json parses and points at a Dockerfile that exists
+    and starts FROM an image, that cache volumes are well-formed and created
+    owned by the container user in the image, and that nothing uncacheable
+    (system packages) runs on every container creation.
+    """
+    config_path = f"{DEVCONTAINER_DIR}/devcontainer.json"
+    if config_path not in plan:
+        return [f"{config_path} is missing"]
+    try:
+        config = json.loads(plan[config_path].data)
+    except ValueError as e:
+        return [f"{config_path}: invalid JSON ({e})"]
+    if not isinstance(config, dict):
+        return [f"{config_path}: expected a JSON object"]
+
+    problems = []
+    dockerfile = ""
+    build = config.get("build")
+    if "image" in config and build:
+        problems.append("devcontainer.json: set either 'image' or 'build', not both")
+    elif build:
+        name = build.get("dockerfile") if isinstance(build, dict) else None
+        path = f"{DEVCONTAINER_DIR}/{name}"
+        if not name:
+            problems.append("devcontainer.json: 'build' has no 'dockerfile'")
+        elif path not in plan:
+            problems.append(f"devcontainer.json: build.dockerfile {name!r} does not exist")
+        else:
+            dockerfile = plan[path].data.decode()
+            problems += [f"{name}: {p}" for p in _check_dockerfile(dockerfile)]
+    elif "image" not in config:
+        problems.append("devcontainer.json: needs an 'image' or a 'build'")
+
+    args = _dockerfile_args(dockerfile)
+    created = _expand(dockerfile, args)
+    for mount in config.get("mounts", []):
+        if not isinstance(mount, str):
+            continue  # object form: left to the devcontainer CLI
+        fields = dict(item.split("=", 1) for item in mount.split(",") if "=" in item)
+        target = fields.get("target", fields.get("dst", ""))
+        if not target.startswith("/") or not fields.get("source", fields.get("src")):
+            problems.append(f"devcontainer.json: mount {mount!r} needs a source and an absolute target")
+        elif fields.get("type") == "volume" and dockerfile and target not in created:
+            problems.append(f"devcontainer.json: volume {target} is not created in the Dockerfile (it would be root-owned)")
+
+    # a string, an argv list, or {name: either} for commands run in parallel
+    post_create = config.get("postCreateCommand", "")
+    commands = post_create.values() if isinstance(post_create, dict) else [post_create]
+    if any(re.search(r"\bapt(-get)?\s+install\b", json.dumps(c)) for c in commands):
+        problems.append("devcontainer.json: postCreateCommand installs system packages on every container; do it in the Dockerfile")
+    for feature, options in config.get("features", {}).items():
+        if isinstance(options, dict) and options.get("upgradePackages"):
+            problems.append(f"devcontainer.json: {feature} upgradePackages runs on every image build")
+    return problems
+
+
+def _check_dockerfile(dockerfile: str) -> List[str]:
+    lines = [line.strip() for line in dockerfile.replace("\\\n", " ").splitlines()]
+    instructions = [line for line in lines if line and not line.startswith("#")]
+    problems = []
+    if not instructions or not re.match(r"(ARG|FROM)\s", instructions[0], re.IGNORECASE):
+        problems.append("must start with FROM (or ARG)")
+    elif not any(re.match(r"FROM\s", i, re.IGNORECASE) for i in instructions):
+        problems.append("has no FROM")
+    if "--mount=" in dockerfile and not re.match(r"#\s*syntax=docker/dockerfile:1", dockerfile):
+        problems.append("RUN --mount needs `# syntax=docker/dockerfile:1` on the first line")
+    return problems
+
+
+def read_devcontainer(project: pathlib.Path) -> Plan:
+    """The .devcontainer files of *project* on disk, as a Plan (for validate_devcontainer)."""
+    plan = Plan()
+    folder = project / DEVCONTAINER_DIR
+    if folder.is_dir():
+        for path in sorted(folder.rglob("*")):
+            if path.is_file():
+                plan.add(path.relative_to(project).as_posix(), path.read_bytes())
+    return plan
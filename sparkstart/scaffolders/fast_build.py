@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+
+import typer
+from sparkstart.plan import Plan
+from sparkstart.scaffolders import insert_after
+from sparkstart.templates import render
+from sparkstart.toolchain import discover
+from sparkstart.utils.common import get_cache_dir
+
+FAST_BUILD_LANGS = ("cpp", "rust")
+CARGO_CONFIG = ".cargo/config.toml"
+
+# (alternatives, what they are for): any one of a group will do
+CPP_TOOLS = [
+    (("ninja",), "faster than make"),
+    (("ccache", "sccache"), "compiler cache"),
+    (("mold", "ld.lld"), "fast linker"),
+]
+
+
+def _insert_after(text: str, anchor: str, addition: str, file: str) -> str:
+    return insert_after(text, anchor, addition, file, "--fast-build")
+
+
+def scaffold_fast_build(lang: str, sources: Plan) -> Plan:
+    """Plan the files that switch a scaffolded project to fast incremental builds."""
+    if lang not in FAST_BUILD_LANGS:
+        raise ValueError(f"--fast-build is not available for {lang} (only: {', '.join(FAST_BUILD_LANGS)})")
+    return _fast_cpp(sources) if lang == "cpp" else _fast_rust(sources)
+
+
+def _fast_cpp(sources: Plan) -> Plan:
+    tools = discover([name for names, _ in CPP_TOOLS for name in names])
+    missing = [f"{'/'.join(names)} ({what})" for names, what in CPP_TOOLS if not any(tools[n].found for n in names)]
+    if missing:
+        typer.secho(
+            f"WARNING: --fast-build: not installed: {', '.join(missing)}.\n"
+            "  The build uses the defaults instead until they are.",
+            fg=typer.colors.YELLOW
+        )
+
+    plan = Plan()
+    plan.add("cmake/FastBuild.cmake", render("fast-build/cpp/FastBuild.cmake"))
+    plan.add("src/pch.hpp", render("fast-build/cpp/pch.hpp"))
+
+    cmake = sources["CMakeLists.txt"].data.decode()
+    cmake = _insert_after(
+        cmake, "set(CMAKE_CXX_STANDARD_REQUIRED ON)\n",
+        "\n# Faster builds: compiler cache, fast linker, PCH, unity builds\ninclude(cmake/FastBuild.cmake)\n",
+        "CMakeLists.txt",
+    )
+    cmake = _insert_after(cmake, "add_executable(${PROJECT_NAME} src/main.cpp)\n", "fast_build_target(${PROJECT_NAME})\n", "CMakeLists.txt")
+    plan.add("CMakeLists.txt", cmake)
+
+    if "tests/CMakeLists.txt" in sources:
+        tests = sources["tests/CMakeLists.txt"].data.decode()
+        tests = _insert_after(tests, "add_executable(unit_tests test_main.cpp)\n", "fast_build_target(unit_tests)\n", "tests/CMakeLists.txt")
+        plan.add("tests/CMakeLists.txt", tests)
+
+    build = sources["build.sh"]
+    script = build.data.decode().replace("\n# 3. Configure (CMake)\n", "\n" + render("fast-build/cpp/build.sh") + "# 3. Configure (CMake)\n", 1)
+    script = script.replace("\ncmake --build .\n", '\ncmake --build . --parallel "$JOBS"\n', 1)
+    if "--parallel" not in script:
+        raise ValueError("--fast-build: build.sh has no `cmake --build .` to speed up")
+    plan.add("build.sh", script, mode=build.mode)
+    return plan
+
+
+def _fast_rust(sources: Plan) -> Plan:
+    """Tuned Cargo profiles, plus a local (git-ignored) config for sccache and a shared target dir."""
+    plan = Plan()
+    plan.add("Cargo.toml", sources["Cargo.toml"].data.decode() + render("fast-build/rust/profiles.toml"))
+
+    settings = []
+    if not os.getenv("RUSTC_WRAPPER"):
+        sccache = discover(["sccache"])["sccache"]
+        if sccache.found:
+            settings += ["# sccache: compiled crates are cached across builds and projects", f"rustc-wrapper = {_toml_str(sccache.path)}"]
+        else:
+            typer.secho("WARNING: --fast-build: sccache not installed (cargo install sccache); builds are not cached.", fg=typer.colors.YELLOW)
+    if not os.getenv("CARGO_TARGET_DIR"):
+        settings += [
+            "# one target directory for every sparkstart project: a dependency built",
+            "# for one of them is reused by the next (binaries: <dir>/debug/<name>)",
+            f"target-dir = {_toml_str(str(get_cache_dir('cargo-target')))}",
+        ]
+    if settings:
+        plan.add(CARGO_CONFIG, render("fast-build/rust/config.toml", settings="\n".join(settings)))
+        lines = sources[".gitignore"].data.decode().splitlines() if ".gitignore" in sources else []
+        if CARGO_CONFIG not in lines:
+            plan.add(".gitignore", "\n".join(lines + [CARGO_CONFIG]) + "\n")
+    return plan
+
+
+def _toml_str(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
@@ -1,20 +1,8 @@
-import pathlib
-import textwrap
-from sparkstart.templates.rust import GITIGNORE_RUST
+from __future__ import annotations
 
-def scaffold_rust(path: pathlib.Path) -> None:
-    """Create Rust project structure with Hello World."""
-    (path / "src").mkdir()
-    (path / "src" / "main.rs").write_text('fn main() {\n    println!("Hello, world!");\n}\n')
-    (path / ".gitignore").write_text(GITIGNORE_RUST + "\n")
-    
-    # Create Cargo.toml
-    cargo_toml = textwrap.dedent(f'''
-        [package]
-        name = "{path.name}"
-        version = "0.1.0"
-        edition = "2021"
+from sparkstart.plan import Plan
+from sparkstart.templates import render_tree
 
-        [dependencies]
-    ''').strip()
-    (path / "Cargo.toml").write_text(cargo_toml + "\n")
+def scaffold_rust(name: str, template: str | None = None) -> Plan:
+    """Plan Rust project structure with Hello World."""
+    return render_tree("rust", name=name)
@@ -0,0 +1,464 @@
+"""
+server.py – `sparkstart serve`: create and delete projects over HTTP
+
+A one-shot `sparkstart new` pays for interpreter start-up, imports, the
+template bundle and a fresh virtual environment on every call. The server
+pays once: it imports everything up front, keeps a VenvPool of Python venvs
+cloned ahead of time, and answers JSON requests on a local TCP port or a
+Unix socket:
+
+    POST   /projects          {"name": "demo", "lang": "python", "template": null,
+                               "devcontainer": false, "github": false, "install": false,
+                               "fast_build": false, "bench": false}
+                              -> 201 {"name", "path", "seconds"}
+    DELETE /projects/<name>   ?github=1 to delete the GitHub repo too
+                              -> 200 {"name", "seconds"}
+    GET    /status            -> 200 {"workers", "queue", "pool", "projects", ...}
+
+Requests must send Content-Type: application/json. On TCP they must also
+carry the session's secret in an X-Sparkstart-Token header (the server
+writes it to <root>/.sparkstart-serve.token, readable by our user only) and
+a localhost Host, and any Origin must be the server itself: otherwise any
+web page open in a browser could post to 127.0.0.1 and create, or delete,
+GitHub repositories with our token. A Unix socket is protected by its
+permissions instead (0600 from the moment it is bound).
+
+Projects live directly under the server's root folder. At most *workers*
+requests run at once and *queue_size* more wait; beyond that the server
+answers 503 with a Retry-After header instead of piling up work.
+Errors are {"error": message} with 400 (bad request), 403 (not an
+authorised client), 404, 409 (exists), 415 (not JSON) or 500.
+
+    curl --unix-socket /tmp/sparkstart.sock -H 'Content-Type: application/json' \
+         -d '{"name": "demo"}' http://localhost/projects
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import os
+import pathlib
+import secrets
+import shutil
+import signal
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from sparkstart.batch import SPEC_KEYS, ProjectSpec
+from sparkstart.utils.venv_seed import clone_venv, get_seed, install_pool, relocate_venv
+
+POOL_DIR = ".sparkstart-pool"
+DEFAULT_PORT = 8765
+MAX_BODY = 64 * 1024
+TOKEN_HEADER = "X-Sparkstart-Token"
+TOKEN_FILE = ".sparkstart-serve.token"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+class Busy(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+class Rejected(Exception):
+    """The request is refused before it reaches the service (403, 415)."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class VenvPool:
+    """
+    Keeps *size* virtual environments cloned ahead of time in *root*, which
+    must be on the projects' filesystem: `take` renames one into place and
+    only rewrites its paths, and a background thread clones a replacement.
+    """
+
+    def __init__(self, root: pathlib.Path, size: int) -> None:
+        self.root = root
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._ready: Deque[pathlib.Path] = collections.deque()
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._fill, name="venv-pool", daemon=True)
+
+    def start(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)  # slots left by a previous run
+        self.root.mkdir(parents=True)
+        self._thread.start()
+
+    def _fill(self) -> None:
+        while not self._closed:
+            with self._lock:
+                missing = self.size - len(self._ready)
+            if missing <= 0:
+                self._wanted.wait()
+                self._wanted.clear()
+                continue
+            slot = self.root / secrets.token_hex(4)
+            try:
+                slot.mkdir()
+                clone_venv(get_seed(), slot / ".venv")
+            except OSError:
+                shutil.rmtree(slot, ignore_errors=True)
+                self._wanted.wait(timeout=30)  # retry later; requests fall back meanwhile
+                continue
+            with self._lock:
+                self._ready.append(slot)
+
+    def take(self, dest: pathlib.Path, prefix: Optional[pathlib.Path] = None) -> bool:
+        """Move a ready venv to *dest*, pointing at *prefix*; False if the pool is empty."""
+        with self._lock:
+            if not self._ready:
+                self.misses += 1
+                return False
+            slot = self._ready.popleft()
+            self.hits += 1
+        self._wanted.set()
+
+        try:
+            os.rename(slot / ".venv", dest)
+        except OSError:  # e.g. *dest* is on another filesystem
+            shutil.rmtree(slot, ignore_errors=True)
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return False
+        os.rmdir(slot)
+        relocate_venv(dest, str((slot / ".venv").absolute()), prefix)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": self.size, "ready": len(self._ready), "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._closed = True
+        self._wanted.set()
+        self._thread.join(timeout=30)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class Service:
+    """The server's state: where projects go, the worker queue and the venv pool."""
+
+    def __init__(self, root: pathlib.Path, workers: int = 4, queue_size: int = 32, pool_size: int = 2) -> None:
+        self.root = root.absolute()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pool = VenvPool(self.root / POOL_DIR, pool_size) if pool_size and os.name != "nt" else None
+        self.started = time.time()
+        self.counts = {"created": 0, "deleted": 0, "failed": 0, "rejected": 0}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sparkstart-worker")
+        self._reaper = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sparkstart-reaper")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._pending = 0
+
+    def start(self) -> None:
+        """Import and load everything a request needs, and start filling the pool."""
+        from sparkstart import core, registry  # noqa: F401
+        from sparkstart.templates import get_bundle
+        from sparkstart.toolchain import discover
+        import sparkstart.utils.github  # noqa: F401  (requests)
+
+        for lang in registry.languages():
+            registry.get_language(lang)
+        get_bundle()
+        discover(["git"])
+        self.root.mkdir(parents=True, exist_ok=True)
+        if self.pool:
+            self.pool.start()
+            install_pool(self.pool)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._reaper.shutdown(wait=True)
+        if self.pool:
+            install_pool(None)
+            self.pool.close()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue fn(*args) for a worker; raise Busy if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.counts["rejected"] += 1
+            raise Busy()
+        with self._lock:
+            self._pending += 1
+
+        def run() -> Any:
+            with self._lock:
+                self._pending -= 1
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._slots.release()
+
+        return self._executor.submit(run)
+
+    def project_path(self, name: str) -> pathlib.Path:
+        if not name or name.startswith(".") or "/" in name or os.sep in name or name != name.strip():
+            raise ValueError(f"invalid project name: {name!r}")
+        return self.root / name
+
+    def create(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a create request, run it on a worker and wait for it."""
+        from sparkstart import registry
+
+        unknown = set(fields) - SPEC_KEYS
+        if unknown:
+            raise ValueError(f"unknown keys {sorted(unknown)}")
+        if not isinstance(fields.get("name"), str):
+            raise ValueError("a project needs a name")
+        spec = ProjectSpec(**fields)
+        path = self.project_path(spec.name)
+        registry.get_language(spec.lang)
+        if spec.template:
+            registry.get_template(spec.lang, spec.template)
+        if spec.github and not os.getenv("GITHUB_TOKEN"):
+            raise ValueError("$GITHUB_TOKEN must be set for the server to use github")
+        if path.exists():
+            raise FileExistsError(f"{spec.name} already exists")
+
+        seconds = self._wait(self.submit(self._create, spec, path), "created")
+        return {"name": spec.name, "path": str(path), "seconds": seconds}
+
+    def _create(self, spec: ProjectSpec, path: pathlib.Path) -> float:
+        from sparkstart.core import create_project
+
+        start = time.perf_counter()
+        create_project(path, spec.github, spec.lang, spec.devcontainer, spec.template, spec.install, spec.fast_build, spec.bench)
+        return time.perf_counter() - start
+
+    def delete(self, name: str, github: bool = False) -> Dict[str, Any]:
+        """Delete a project on a worker; its files are removed after the reply."""
+        path = self.project_path(name)
+        if not path.is_dir():
+            raise FileNotFoundError(f"{name} does not exist")
+        seconds = self._wait(self.submit(self._delete, path, github), "deleted")
+        return {"name": name, "seconds": seconds}
+
+    def _delete(self, path: pathlib.Path, github: bool) -> float:
+        from sparkstart.core import delete_project
+        from sparkstart.utils.trash import TRASH_DIR, reap
+
+        start = time.perf_counter()
+        delete_project(path, github, background=True, reap=False)
+        self._reaper.submit(reap, self.root / TRASH_DIR)
+        return time.perf_counter() - start
+
+    def _wait(self, future: Future, counter: str) -> Any:
+        try:
+            result = future.result()
+        except BaseException:
+            with self._lock:
+                self.counts["failed"] += 1
+            raise
+        with self._lock:
+            self.counts[counter] += 1
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            status = {
+                "root": str(self.root),
+                "uptime": round(time.time() - self.started, 1),
+                "workers": {"max": self.workers, "busy": self._running},
+                "queue": {"max": self.queue_size, "pending": self._pending},
+                "projects": dict(self.counts),
+            }
+        status["pool"] = self.pool.stats() if self.pool else None
+        return status
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: a portal can reuse its connection
+    server_version = "sparkstart"
+
+    @property
+    def service(self) -> Service:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def do_GET(self) -> None:
+        self._dispatch(lambda path, query: self.service.status() if path == "/status" else None)
+
+    def do_POST(self) -> None:
+        def create(path: str, query: dict) -> Optional[Tuple[int, dict]]:
+            if path != "/projects":
+                return None
+            return 201, self.service.create(self._body())
+        self._dispatch(create)
+
+    def do_DELETE(self) -> None:
+        def delete(path: str, query: dict) -> Optional[dict]:
+            if not path.startswith("/projects/"):
+                return None
+            github = query.get("github", ["0"])[-1].lower() in ("1", "true", "yes")
+            return self.service.delete(path[len("/projects/"):], github)
+        self._dispatch(delete)
+
+    def _check_client(self) -> None:
+        """Refuse what a browser page could send us: see the module docstring."""
+        token = self.server.token  # type: ignore[attr-defined]
+        if token is None:  # Unix socket
+            return
+        port = self.server.server_address[1]
+        allowed = LOCAL_HOSTS | {self.server.server_address[0]}
+        host = urlsplit("//" + self.headers.get("Host", ""))
+        if host.hostname not in allowed or (host.port or 80) != port:
+            raise Rejected(403, "unexpected Host header")
+        origin = self.headers.get("Origin")
+        if origin is not None:
+            url = urlsplit(origin)
+            if url.hostname not in allowed or url.port != port:
+                raise Rejected(403, f"cross-origin request from {origin}")
+        if not secrets.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+            raise Rejected(403, f"missing or wrong {TOKEN_HEADER} header")
+
+    def _body(self) -> Dict[str, Any]:
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            raise Rejected(415, "Content-Type must be application/json")
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ValueError("request body too large")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise ValueError("request body is not valid JSON")
+        if not isinstance(body, dict):
+            raise ValueError("request body must be a JSON object")
+        return body
+
+    def _dispatch(self, route: Callable[[str, dict], Any]) -> None:
+        url = urlsplit(self.path)
+        headers = {}
+        try:
+            self._check_client()
+            result = route(url.path, parse_qs(url.query))
+            if result is None:
+                status, payload = 404, {"error": f"no route for {self.command} {url.path}"}
+            else:
+                status, payload = result if isinstance(result, tuple) else (200, result)
+        except Rejected as e:
+            status, payload = e.status, {"error": str(e)}
+        except Busy:
+            status, payload = 503, {"error": "server busy, try again later"}
+            headers["Retry-After"] = "1"
+        except (ValueError, TypeError) as e:
+            status, payload = 400, {"error": str(e)}
+        except FileExistsError as e:
+            status, payload = 409, {"error": str(e)}
+        except FileNotFoundError as e:
+            status, payload = 404, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+        if status >= 400:
+            headers["Connection"] = "close"  # the request body may not have been read
+        self._reply(status, payload, headers)
+
+    def _reply(self, status: int, payload: dict, headers: Dict[str, str]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    service: Service,
+    socket_path: Optional[pathlib.Path] = None,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    verbose: bool = False,
+    token: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """
+    An HTTP server for *service* on *socket_path* if given, else on *host*:*port*.
+
+    TCP clients must send *token* (a fresh random one if None) in the
+    X-Sparkstart-Token header; read it back from `server.token`.
+    """
+    if socket_path is not None:
+        if socket_path.is_socket():
+            socket_path.unlink()  # left by a server that did not shut down cleanly
+        umask = os.umask(0o077)  # only our user may connect, from the moment it exists
+        try:
+            server: socketserver.BaseServer = UnixHTTPServer(str(socket_path), Handler)
+        finally:
+            os.umask(umask)
+        server.token = None  # type: ignore[attr-defined]
+    else:
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.token = token or secrets.token_urlsafe(32)  # type: ignore[attr-defined]
+    server.service = service  # type: ignore[attr-defined]
+    server.verbose = verbose  # type: ignore[attr-defined]
+    return server
+
+
+def serve(
+    root: pathlib.Path,
+    socket_path: Optional[pathlib.Path] = None,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    workers: int = 4,
+    queue_size: int = 32,
+    pool_size: int = 2,
+    verbose: bool = False,
+    on_ready: Callable[[str], None] = print,
+) -> None:
+    """Run the server until interrupted (Ctrl+C or SIGTERM)."""
+    service = Service(root, workers, queue_size, pool_size)
+    service.start()
+    server = make_server(service, socket_path, host, port, verbose, os.getenv("SPARKSTART_SERVE_TOKEN"))
+    address = str(socket_path) if socket_path else "http://{}:{}".format(*server.server_address[:2])
+    token_file = None
+    if server.token is not None:  # type: ignore[attr-defined]
+        token_file = service.root / TOKEN_FILE
+        token_file.unlink(missing_ok=True)  # an older one may be readable by others
+        fd = os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(server.token + "\n")  # type: ignore[attr-defined]
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        on_ready(address)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        for path in (socket_path, token_file):
+            if path is not None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,158 @@
+"""
+sync.py – pull template improvements into an existing project
+
+Every project records, in .sparkstart.lock, the options it was created with,
+the version (content hash) of the template bundle and a hash of each file the
+templates generated (suffixed "+x" for executables, so a lost or added
+executable bit is a change like any other):
+
+    {"lock_version": 1, "name": "demo", "templates": "3f2a…",
+     "options": {"lang": "cpp", "devcontainer": true, ...},
+     "files": {"CMakeLists.txt": "<sha256>", ...}}
+
+`sparkstart sync` regenerates the project's files in memory and compares
+hashes. A file is rewritten only when the templates now produce something
+else *and* the copy on disk still matches the lock (nobody edited it). Files
+the templates did not change are neither read nor touched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from sparkstart.plan import FileSpec, Plan
+
+LOCK_FILE = ".sparkstart.lock"
+LOCK_VERSION = 1
+
+
+@dataclass
+class SyncResult:
+    """What sync_project did (or would do, with dry_run) to each file."""
+
+    updated: List[str] = field(default_factory=list)  # unchanged locally, changed upstream
+    added: List[str] = field(default_factory=list)  # new in the templates
+    kept: List[str] = field(default_factory=list)  # changed on both sides: left alone
+    dropped: List[str] = field(default_factory=list)  # no longer generated: left in place
+    templates: str = ""
+
+
+def file_hash(data: bytes, mode: int = 0o644) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    # Windows has no executable bit to compare against
+    return digest + "+x" if mode & 0o111 and os.name != "nt" else digest
+
+
+def _local_hash(path: pathlib.Path) -> str:
+    return file_hash(path.read_bytes(), path.stat().st_mode)
+
+
+def templates_digest() -> str:
+    from sparkstart.templates import get_bundle
+
+    return get_bundle().digest()
+
+
+def make_lock(name: str, options: Dict[str, Any], plan: Plan) -> str:
+    """The .sparkstart.lock text for a project *name* whose templates produced *plan*."""
+    return _dump({
+        "lock_version": LOCK_VERSION,
+        "name": name,
+        "templates": templates_digest(),
+        "options": options,
+        "files": {spec.path: file_hash(spec.data, spec.mode) for spec in plan if spec.path != LOCK_FILE},
+    })
+
+
+def _dump(lock: Dict[str, Any]) -> str:
+    return json.dumps(lock, indent=2, sort_keys=True) + "\n"
+
+
+def read_lock(project: pathlib.Path) -> Dict[str, Any]:
+    path = project / LOCK_FILE
+    try:
+        lock = json.loads(path.read_text())
+    except FileNotFoundError:
+        raise ValueError(f"{project} has no {LOCK_FILE} (not created by sparkstart, or by an older version)") from None
+    except ValueError as e:
+        raise ValueError(f"{path}: invalid lock file ({e})") from None
+    if lock.get("lock_version") != LOCK_VERSION:
+        raise ValueError(f"{path}: unsupported lock_version {lock.get('lock_version')!r}")
+    return lock
+
+
+def _write(path: pathlib.Path, spec: FileSpec) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".sparkstart-tmp")
+    tmp.write_bytes(spec.data)
+    os.chmod(tmp, spec.mode)
+    os.replace(tmp, path)
+
+
+def _check_options(options: Dict[str, Any], path: pathlib.Path) -> None:
+    """Raise ValueError unless plan_project still takes every option in the lock."""
+    import inspect
+    from sparkstart.core import plan_project
+
+    known = set(inspect.signature(plan_project).parameters) - {"name"}
+    unknown = sorted(set(options) - known)
+    if unknown:
+        raise ValueError(
+            f"{path}: options {unknown} are not known to this version of sparkstart "
+            f"(it knows: {', '.join(sorted(known))})"
+        )
+
+
+def sync_project(project: pathlib.Path, dry_run: bool = False) -> SyncResult:
+    """Re-apply the current templates to *project* (see the module docstring)."""
+    from sparkstart.core import plan_project
+
+    lock = read_lock(project)
+    _check_options(lock["options"], project / LOCK_FILE)
+    upstream = plan_project(lock["name"], **lock["options"])
+    old: Dict[str, str] = lock["files"]
+    new: Dict[str, str] = {}
+    result = SyncResult(templates=templates_digest())
+
+    for spec in upstream:
+        if spec.path == LOCK_FILE:
+            continue
+        digest = file_hash(spec.data, spec.mode)
+        locked = old.get(spec.path)
+        if digest == locked:
+            new[spec.path] = digest  # templates unchanged: the local file is not even read
+            continue
+
+        path = project / spec.path
+        if locked is None:
+            if path.exists():
+                if _local_hash(path) == digest:
+                    new[spec.path] = digest
+                else:
+                    result.kept.append(spec.path)  # created by hand in the meantime
+                continue
+            result.added.append(spec.path)
+        else:
+            local = _local_hash(path) if path.is_file() else None
+            if local == digest:
+                new[spec.path] = digest
+                continue
+            if local != locked:  # edited (or deleted) locally
+                result.kept.append(spec.path)
+                new[spec.path] = locked
+                continue
+            result.updated.append(spec.path)
+        new[spec.path] = digest
+        if not dry_run:
+            _write(path, spec)
+
+    result.dropped = sorted(set(old) - set(new) - set(result.kept))
+    updated_lock = {**lock, "templates": result.templates, "files": new}
+    if not dry_run and updated_lock != lock:
+        (project / LOCK_FILE).write_text(_dump(updated_lock))
+    return result
@@ -0,0 +1,142 @@
+"""
+Project templates, precompiled into one indexed bundle.
+
+The template files live under templates/src/ (one folder per language, plus
+`<lang>@<template>` overlays such as `python@pygame`). `build_bundle` packs
+them into templates.bundle:
+
+    b"SPKB" | version u32 | index length u32 | JSON index | file data
+
+The index maps each entry name to (offset, length, mode). At runtime the
+bundle is memory-mapped once and a project only reads the slices for its own
+entries; nothing is imported or dedented per language.
+
+Rebuild after editing templates/src:  python scripts/build_templates.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import stat
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+SOURCES = pathlib.Path(__file__).with_name("src")
+BUNDLE = pathlib.Path(__file__).with_name("templates.bundle")
+
+MAGIC = b"SPKB"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+# Source files are stored without their leading dot, so that e.g. a template
+# .gitignore does not apply to this repository.
+DOTFILES = {"gitignore"}
+# Build droppings (e.g. from `compileall`) that must never end up in a project.
+SKIP_DIRS = {"__pycache__"}
+
+
+def build_bundle(src: pathlib.Path = SOURCES, dest: pathlib.Path = BUNDLE) -> None:
+    """Pack every file under *src* into the bundle at *dest*."""
+    index: Dict[str, Tuple[int, int, int]] = {}
+    chunks: List[bytes] = []
+    offset = 0
+    for path in sorted(p for p in src.rglob("*") if p.is_file()):
+        rel = path.relative_to(src).as_posix()
+        if SKIP_DIRS.intersection(rel.split("/")):
+            continue
+        data = path.read_bytes()
+        mode = 0o755 if path.stat().st_mode & stat.S_IXUSR else 0o644
+        index[rel] = (offset, len(data), mode)
+        chunks.append(data)
+        offset += len(data)
+
+    raw_index = json.dumps(index, sort_keys=True, separators=(",", ":")).encode()
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.write_bytes(HEADER.pack(MAGIC, VERSION, len(raw_index)) + raw_index + b"".join(chunks))
+    os.replace(tmp, dest)
+
+
+class Bundle:
+    """Read-only, memory-mapped view of a template bundle."""
+
+    def __init__(self, path: pathlib.Path = BUNDLE) -> None:
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, NotADirectoryError):
+            # inside a zipapp there is no file to map: read it through the loader
+            import pkgutil
+
+            data = pkgutil.get_data(__name__, path.name) if path == BUNDLE else None
+            if data is None:
+                raise
+            self._map = data
+        magic, version, index_len = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise RuntimeError(f"{path} is not a sparkstart template bundle (v{VERSION})")
+        start = HEADER.size
+        self.index: Dict[str, List[int]] = json.loads(self._map[start:start + index_len])
+        self._data = start + index_len
+
+    def names(self, prefix: str = "") -> List[str]:
+        return [name for name in self.index if name.startswith(prefix)]
+
+    def read(self, name: str) -> bytes:
+        try:
+            offset, length, _ = self.index[name]
+        except KeyError:
+            raise KeyError(f"no template entry {name!r}") from None
+        start = self._data + offset
+        return self._map[start:start + length]
+
+    def mode(self, name: str) -> int:
+        return self.index[name][2]
+
+    def digest(self) -> str:
+        """Content hash of the whole bundle: the version of the templates."""
+        return hashlib.sha256(self._map).hexdigest()[:16]
+
+
+_bundle: Optional[Bundle] = None
+_lock = threading.Lock()
+
+
+def get_bundle() -> Bundle:
+    """The packaged bundle, mapped on first use."""
+    global _bundle
+    with _lock:
+        if _bundle is None:
+            _bundle = Bundle()
+        return _bundle
+
+
+def render(entry: str, /, **values: str) -> str:
+    """Bundle *entry* with each `{key}` placeholder replaced by *values*[key]."""
+    text = get_bundle().read(entry).decode()
+    for key, value in values.items():
+        text = text.replace("{" + key + "}", value)
+    return text
+
+
+def project_path(rel: str) -> str:
+    """Where an entry's relative path lands inside the generated project."""
+    head, _, tail = rel.rpartition("/")
+    if tail in DOTFILES:
+        tail = "." + tail
+    return f"{head}/{tail}" if head else tail
+
+
+def render_tree(prefix: str, **values: str):
+    """Plan holding every entry under *prefix*/ (rendered), at its project path."""
+    from sparkstart.plan import Plan
+
+    bundle = get_bundle()
+    plan = Plan()
+    for entry in bundle.names(prefix + "/"):
+        plan.add(project_path(entry[len(prefix) + 1:]), render(entry, **values), bundle.mode(entry))
+    return plan
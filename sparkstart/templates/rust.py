@@ -1,7 +0,0 @@
-import textwrap
-
-GITIGNORE_RUST = textwrap.dedent("""
-    /target
-    .DS_Store
-    .projinit.env
-""").strip()
@@ -0,0 +1,19 @@
+#include <benchmark/benchmark.h>
+
+#include <vector>
+
+// Replace with your own code (move it out of main.cpp into its own file).
+static std::vector<long> build_squares(long n) {
+    std::vector<long> squares;
+    for (long i = 0; i < n; ++i) {
+        squares.push_back(i * i);
+    }
+    return squares;
+}
+
+static void BM_BuildSquares(benchmark::State& state) {
+    for (auto _ : state) {
+        benchmark::DoNotOptimize(build_squares(state.range(0)));
+    }
+}
+BENCHMARK(BM_BuildSquares)->Arg(1000)->Arg(10000);
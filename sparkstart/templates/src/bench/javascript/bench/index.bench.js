@@ -0,0 +1,22 @@
+// Benchmarks (no dependencies: node's perf_hooks). Run them with:
+//
+//     npm run bench
+//
+// Each case is warmed up first so the JIT has compiled it, then timed.
+const { performance } = require("node:perf_hooks");
+
+function bench(name, fn, { iterations = 10000, warmup = 1000 } = {}) {
+  for (let i = 0; i < warmup; i++) fn();
+  const start = performance.now();
+  for (let i = 0; i < iterations; i++) fn();
+  const ms = performance.now() - start;
+  const perOp = (ms * 1e6) / iterations;
+  console.log(`${name.padEnd(24)} ${perOp.toFixed(0).padStart(10)} ns/op  ${Math.round((iterations * 1000) / ms)} ops/s`);
+}
+
+// Replace with your own code, e.g. `const { ... } = require("../index.js");`
+function buildSquares(n) {
+  return Array.from({ length: n }, (_, i) => i * i);
+}
+
+bench("buildSquares 10k", () => buildSquares(10000), { iterations: 1000 });
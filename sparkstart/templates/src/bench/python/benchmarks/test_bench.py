@@ -0,0 +1,18 @@
+"""
+Benchmarks (pytest-benchmark). Run them with:
+
+    pytest benchmarks
+
+`pytest` alone runs tests/ only. Compare runs with --benchmark-autosave
+and --benchmark-compare.
+"""
+
+
+def build_squares(n):
+    # replace with your own code, e.g. `from src.main import ...`
+    return [i * i for i in range(n)]
+
+
+def test_build_squares(benchmark):
+    result = benchmark(build_squares, 10_000)
+    assert len(result) == 10_000
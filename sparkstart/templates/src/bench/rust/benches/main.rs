@@ -0,0 +1,20 @@
+// Benchmarks (criterion). Run them with:
+//
+//     cargo bench
+//
+// Reports, with the change since the previous run, land in target/criterion/.
+// To benchmark your own code, move it from src/main.rs into src/lib.rs and
+// `use {crate}::...` here.
+
+use criterion::{black_box, criterion_group, criterion_main, Criterion};
+
+fn build_squares(n: u64) -> Vec<u64> {
+    (0..n).map(|i| i * i).collect()
+}
+
+fn bench_build_squares(c: &mut Criterion) {
+    c.bench_function("build_squares 10k", |b| b.iter(|| build_squares(black_box(10_000))));
+}
+
+criterion_group!(benches, bench_build_squares);
+criterion_main!(benches);
@@ -0,0 +1,39 @@
+#!/bin/bash
+set -e
+
+# ==============================================================================
+# Build Script - a shortcut for the CMake workflow
+# ==============================================================================
+
+echo "🚀 Building {name}..."
+
+# 1. Create build directory
+mkdir -p build
+
+# 2. Dependency Management (Conan, if installed)
+# sparkstart keeps one Conan cache + profile for all its projects
+# (`sparkstart cache conan` fills it), so dependencies such as gtest
+# are installed as prebuilt binaries instead of being compiled here.
+CMAKE_ARGS=()
+if command -v conan >/dev/null 2>&1; then
+    SPARKSTART_CONAN="${SPARKSTART_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/sparkstart}/conan"
+    PROFILE=default
+    if [ -z "$CONAN_HOME" ] && [ -f "$SPARKSTART_CONAN/profiles/sparkstart" ]; then
+        export CONAN_HOME="$SPARKSTART_CONAN"
+        PROFILE=sparkstart
+    elif [ ! -f "${CONAN_HOME:-$HOME/.conan2}/profiles/default" ]; then
+        conan profile detect
+    fi
+    conan install . --output-folder=build --build=missing -pr:h "$PROFILE" -pr:b "$PROFILE"
+    TOOLCHAIN=$(find "$PWD/build" -name conan_toolchain.cmake | head -n 1)
+    CMAKE_ARGS+=("-DCMAKE_TOOLCHAIN_FILE=$TOOLCHAIN" "-DCMAKE_BUILD_TYPE=Release")
+fi
+
+# 3. Configure (CMake)
+cd build
+cmake .. "${CMAKE_ARGS[@]}"
+
+# 4. Build (Compile)
+cmake --build .
+
+echo "✅ Build complete! Run with: ./build/{name}"
@@ -0,0 +1,6 @@
+#include <gtest/gtest.h>
+
+TEST(HelloTest, BasicAssertions) {
+    EXPECT_STRNE("hello", "world");
+    EXPECT_EQ(7 * 6, 42);
+}
@@ -0,0 +1,62 @@
+# ==============================================================================
+# FastBuild.cmake — shorter edit-compile cycles (from `sparkstart new --fast-build`)
+# ==============================================================================
+# Every speed-up is optional: a tool that is not installed is skipped, and
+# the project builds exactly as before.
+#
+#   • ccache / sccache   reuse object files across rebuilds, branches, clones
+#   • mold / lld         link in a fraction of the time of the default ld
+#   • precompiled header src/pch.hpp is parsed once per target, not per file
+#   • unity builds       -DFAST_BUILD_UNITY=ON compiles sources in batches
+#
+# build.sh picks the generator (Ninja when installed) and runs one compile
+# job per CPU core. Turn any of these off with -DFAST_BUILD_<NAME>=OFF.
+# ==============================================================================
+
+option(FAST_BUILD_CACHE "Use ccache or sccache when installed" ON)
+option(FAST_BUILD_LINKER "Link with mold or lld when installed" ON)
+option(FAST_BUILD_PCH "Precompile src/pch.hpp" ON)
+option(FAST_BUILD_UNITY "Unity (jumbo) builds: fewer, bigger compilation units" OFF)
+
+# Call after add_executable/add_library for each target that should use the PCH
+function(fast_build_target target)
+    if(FAST_BUILD_PCH AND NOT CMAKE_VERSION VERSION_LESS 3.16)
+        target_precompile_headers(${target} PRIVATE ${PROJECT_SOURCE_DIR}/src/pch.hpp)
+    endif()
+endfunction()
+
+# --- Compiler cache -----------------------------------------------------------
+if(FAST_BUILD_CACHE AND NOT CMAKE_CXX_COMPILER_LAUNCHER)
+    find_program(FAST_BUILD_CACHE_PROGRAM NAMES ccache sccache)
+    if(FAST_BUILD_CACHE_PROGRAM)
+        message(STATUS "Compiler cache: ${FAST_BUILD_CACHE_PROGRAM}")
+        get_filename_component(cache_name ${FAST_BUILD_CACHE_PROGRAM} NAME_WE)
+        if(cache_name STREQUAL "ccache")
+            # without these, precompiled headers would make every lookup miss
+            set(CMAKE_CXX_COMPILER_LAUNCHER
+                ${CMAKE_COMMAND} -E env CCACHE_SLOPPINESS=pch_defines,time_macros,include_file_mtime,include_file_ctime
+                ${FAST_BUILD_CACHE_PROGRAM})
+        else()
+            set(CMAKE_CXX_COMPILER_LAUNCHER ${FAST_BUILD_CACHE_PROGRAM})
+        endif()
+    endif()
+endif()
+
+# --- Linker -------------------------------------------------------------------
+if(FAST_BUILD_LINKER AND NOT MSVC AND NOT CMAKE_VERSION VERSION_LESS 3.18)
+    include(CheckLinkerFlag)
+    foreach(linker mold lld)
+        check_linker_flag(CXX "-fuse-ld=${linker}" FAST_BUILD_HAVE_${linker})
+        if(FAST_BUILD_HAVE_${linker})
+            message(STATUS "Linker: ${linker}")
+            add_link_options("-fuse-ld=${linker}")
+            break()
+        endif()
+    endforeach()
+endif()
+
+# --- Unity builds ---------------------------------------------------------------
+if(FAST_BUILD_UNITY)
+    set(CMAKE_UNITY_BUILD ON)
+    set(CMAKE_UNITY_BUILD_BATCH_SIZE 16)
+endif()
@@ -0,0 +1,7 @@
+# Fast build: Ninja when installed (a build/ made with another generator
+# keeps it), and one compile job per CPU core
+if command -v ninja >/dev/null 2>&1 && [ ! -f build/CMakeCache.txt ]; then
+    CMAKE_ARGS+=(-G Ninja)
+fi
+JOBS=$(nproc 2>/dev/null || sysctl -n hw.ncpu 2>/dev/null || echo 4)
+
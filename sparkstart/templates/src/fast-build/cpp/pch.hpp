@@ -0,0 +1,14 @@
+// =============================================================================
+// pch.hpp — precompiled header (see cmake/FastBuild.cmake)
+// =============================================================================
+// Compiled once per target, then reused by every source file. List the
+// heavy headers that rarely change: the standard library, third-party
+// libraries. Not your own headers: editing one would rebuild everything.
+// =============================================================================
+#pragma once
+
+#include <algorithm>
+#include <iostream>
+#include <memory>
+#include <string>
+#include <vector>
@@ -0,0 +1,5 @@
+def hello() -> str:
+    return "Hello, world!"
+
+if __name__ == "__main__":
+    print(hello())
@@ -0,0 +1,4 @@
+from src.main import hello
+
+def test_hello():
+    assert hello() == "Hello, world!"
@@ -0,0 +1,82 @@
+import pygame
+import sys
+import random
+
+def main():
+    pygame.init()
+    clock = pygame.time.Clock()
+
+    # Constants
+    WIDTH, HEIGHT = 600, 400
+    BLOCK_SIZE = 20
+    WHITE = (255, 255, 255)
+    BLACK = (0, 0, 0)
+    RED = (213, 50, 80)
+    GREEN = (0, 255, 0)
+
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption('Sparkstart Snake')
+
+    # Snake state
+    x1, y1 = WIDTH / 2, HEIGHT / 2
+    x1_change, y1_change = 0, 0
+    snake_list = []
+    length_of_snake = 1
+
+    # Food
+    foodx = round(random.randrange(0, WIDTH - BLOCK_SIZE) / 20.0) * 20.0
+    foody = round(random.randrange(0, HEIGHT - BLOCK_SIZE) / 20.0) * 20.0
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    x1_change = -BLOCK_SIZE
+                    y1_change = 0
+                elif event.key == pygame.K_RIGHT:
+                    x1_change = BLOCK_SIZE
+                    y1_change = 0
+                elif event.key == pygame.K_UP:
+                    y1_change = -BLOCK_SIZE
+                    x1_change = 0
+                elif event.key == pygame.K_DOWN:
+                    y1_change = BLOCK_SIZE
+                    x1_change = 0
+
+        if x1 >= WIDTH or x1 < 0 or y1 >= HEIGHT or y1 < 0:
+            # Game Over behavior simplified: just reset
+            x1, y1 = WIDTH / 2, HEIGHT / 2
+            x1_change, y1_change = 0, 0
+            snake_list = []
+            length_of_snake = 1
+
+        x1 += x1_change
+        y1 += y1_change
+        screen.fill(BLACK)
+
+        pygame.draw.rect(screen, GREEN, [foodx, foody, BLOCK_SIZE, BLOCK_SIZE])
+
+        snake_head = []
+        snake_head.append(x1)
+        snake_head.append(y1)
+        snake_list.append(snake_head)
+        if len(snake_list) > length_of_snake:
+            del snake_list[0]
+
+        for x in snake_list:
+            pygame.draw.rect(screen, WHITE, [x[0], x[1], BLOCK_SIZE, BLOCK_SIZE])
+
+        pygame.display.update()
+
+        if x1 == foodx and y1 == foody:
+            foodx = round(random.randrange(0, WIDTH - BLOCK_SIZE) / 20.0) * 20.0
+            foody = round(random.randrange(0, HEIGHT - BLOCK_SIZE) / 20.0) * 20.0
+            length_of_snake += 1
+
+        clock.tick(10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+def test_import_pygame():
+    import pygame
+    assert pygame.ver is not None
@@ -0,0 +1,131 @@
+"""
+timings.py – where did the time go?
+
+Code marks its phases with `span(name, category)`; the spans are only
+recorded while a Tracer is installed, so the markers cost next to nothing
+otherwise. The pipeline wraps every step, `run_shell` every subprocess and
+the GitHub client every API call.
+
+    from sparkstart.timings import tracing
+
+    with tracing() as tracer:
+        create_project(path)
+    print(tracer.table())
+    tracer.write_chrome_trace("trace.json")   # chrome://tracing or ui.perfetto.dev
+
+`sparkstart new --timings` prints the table; `--trace FILE` writes the JSON.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+
+class Span(NamedTuple):
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int
+    thread: int
+    depth: int  # spans open around it on the same thread
+    args: Dict[str, Any]
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class Tracer:
+    """Collects spans from every thread."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.origin_ns = time.perf_counter_ns()
+        self.thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "phase", **args: Any) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._local.depth = depth
+            thread = threading.current_thread()
+            with self._lock:
+                self.thread_names.setdefault(thread.ident, thread.name)
+                self.spans.append(Span(name, category, start, end, thread.ident, depth, args))
+
+    def table(self) -> str:
+        """Spans in start order, nested by thread, with their offset and duration."""
+        spans = sorted(self.spans, key=lambda s: (s.start_ns, -s.end_ns))
+        lines = [f"{'start':>9} {'duration':>10}  {'kind':<10} what"]
+        for s in spans:
+            offset = (s.start_ns - self.origin_ns) / 1e6
+            lines.append(f"{offset:>7.1f}ms {s.seconds * 1000:>8.1f}ms  {s.category:<10} {'  ' * s.depth}{s.name}")
+        if spans:
+            wall = (max(s.end_ns for s in spans) - min(s.start_ns for s in spans)) / 1e6
+            busy: Dict[str, float] = {}
+            for s in spans:
+                if s.depth == 0 or s.category == "subprocess":
+                    busy[s.category] = busy.get(s.category, 0.0) + s.seconds * 1000
+            totals = ", ".join(f"{cat} {ms:.1f}ms" for cat, ms in sorted(busy.items(), key=lambda kv: -kv[1]))
+            lines.append(f"wall {wall:.1f}ms  ({totals})")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The spans in Chrome's Trace Event Format (complete "X" events, in µs)."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for s in self.spans:
+            events.append({
+                "ph": "X", "name": s.name, "cat": s.category, "pid": pid, "tid": s.thread,
+                "ts": (s.start_ns - self.origin_ns) / 1000, "dur": (s.end_ns - s.start_ns) / 1000,
+                "args": {k: str(v) for k, v in s.args.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: "os.PathLike[str] | str") -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+@contextlib.contextmanager
+def tracing(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Record every span, from any thread, into *tracer* (a new one by default)."""
+    global _tracer
+    previous, _tracer = _tracer, tracer or Tracer()
+    try:
+        yield _tracer
+    finally:
+        _tracer = previous
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = "phase", **args: Any) -> Iterator[None]:
+    """Time the block into the installed Tracer, if there is one."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, category, **args):
+        yield
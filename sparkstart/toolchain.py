@@ -0,0 +1,144 @@
+"""
+toolchain.py – find the external tools a project needs, once
+
+Every `shutil.which` walks the whole $PATH, and a run used to probe the same
+tools from several places (checks.py, core, the C++ scaffolder). `discover`
+resolves a list of tools in parallel, optionally with their `--version`, and
+caches the answer:
+
+  • in-process, so repeated queries cost a dict lookup;
+  • on disk in <cache>/toolchain.json, keyed by $PATH and the mtime of every
+    directory on it. Installing or removing a tool changes its directory's
+    mtime, which invalidates the cache, so "not found" answers can be cached too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Iterable, Optional
+
+from sparkstart.utils.common import get_cache_dir
+
+CACHE_FILE = "toolchain.json"
+VERSION_TIMEOUT = 10  # seconds; some tools (docker) are slow to answer
+
+
+@dataclass
+class Tool:
+    """Where a tool lives (None if missing) and, when asked for, its version line."""
+
+    name: str
+    path: Optional[str] = None
+    version: Optional[str] = None
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+
+_tools: Dict[str, Tool] = {}
+_key: Optional[str] = None
+_lock = threading.Lock()
+
+
+def path_fingerprint() -> str:
+    """Hash of $PATH (and $PATHEXT) plus the mtime of each directory on it."""
+    h = hashlib.sha256()
+    path = os.environ.get("PATH", os.defpath)
+    h.update(f"{path}\0{os.environ.get('PATHEXT', '')}".encode())
+    for d in path.split(os.pathsep):
+        try:
+            mtime = os.stat(d or ".").st_mtime_ns
+        except OSError:
+            mtime = -1
+        h.update(f"\n{d}:{mtime}".encode())
+    return h.hexdigest()
+
+
+def _probe(tool: Tool, versions: bool) -> Tool:
+    if tool.path is None:  # not looked up yet
+        tool.path = shutil.which(tool.name)
+    if versions and tool.path and tool.version is None:
+        try:
+            out = subprocess.run(
+                [tool.path, "--version"], capture_output=True, text=True, timeout=VERSION_TIMEOUT,
+            )
+            lines = (out.stdout or out.stderr).strip().splitlines()
+            tool.version = lines[0] if lines else ""
+        except (OSError, subprocess.SubprocessError):
+            tool.version = ""
+    return tool
+
+
+def _load(key: str) -> Dict[str, Tool]:
+    try:
+        data = json.loads((get_cache_dir() / CACHE_FILE).read_text())
+        if data.get("key") == key:
+            return {name: Tool(**fields) for name, fields in data["tools"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {}
+
+
+def _save(key: str, tools: Dict[str, Tool]) -> None:
+    path = get_cache_dir() / CACHE_FILE
+    tmp = path.with_name(f"{CACHE_FILE}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({"key": key, "tools": {n: asdict(t) for n, t in tools.items()}}))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # the cache is an optimisation only
+
+
+def discover(names: Iterable[str], versions: bool = False) -> Dict[str, Tool]:
+    """Return {name: Tool} for *names*, probing the ones not cached yet in parallel."""
+    global _key
+    names = list(dict.fromkeys(names))
+    key = path_fingerprint()
+    with _lock:
+        if key != _key:
+            _tools.clear()
+            _tools.update(_load(key))
+            _key = key
+        found = {name: _tools[name] for name in names if name in _tools}
+        # copies: the cached Tools are shared and only ever replaced, never changed
+        todo = [
+            replace(found[name]) if name in found else Tool(name) for name in names
+            if name not in found or (versions and found[name].found and found[name].version is None)
+        ]
+    if not todo:
+        return found
+
+    # `--version` can take seconds (docker): other lookups must not wait for it
+    with ThreadPoolExecutor(max_workers=len(todo)) as pool:
+        probed = list(pool.map(lambda t: _probe(t, versions), todo))
+    found.update((tool.name, tool) for tool in probed)
+    with _lock:
+        if _key == key:  # $PATH did not change meanwhile
+            _tools.update((tool.name, tool) for tool in probed)
+            _save(key, _tools)
+    return {name: found[name] for name in names}
+
+
+def which(name: str) -> Optional[str]:
+    """Cached `shutil.which`."""
+    return discover([name])[name].path
+
+
+def clear_cache() -> None:
+    """Forget every cached lookup, in memory and on disk."""
+    global _key
+    with _lock:
+        _tools.clear()
+        _key = None
+        try:
+            os.unlink(get_cache_dir() / CACHE_FILE)
+        except FileNotFoundError:
+            pass
@@ -1,19 +1,39 @@
+from __future__ import annotations
+
 import pathlib
+import re
 import subprocess
 import os
-from dotenv import dotenv_values
-from typing import List
+from typing import Dict, List
+
+from sparkstart.timings import span
+
+# credentials embedded in URLs (https://<token>@github.com/...)
+URL_CREDENTIALS = re.compile(r"://[^@/\s]+@")
+
 
-def run_shell(cmd: List[str], cwd: pathlib.Path) -> None:
-    """Run *cmd* in *cwd*; raise RuntimeError on non-zero exit."""
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+def redact(text: str) -> str:
+    return URL_CREDENTIALS.sub("://***@", text)
+
+def run_shell(
+    cmd: List[str], cwd: pathlib.Path, input: bytes | None = None, env: Dict[str, str] | None = None
+) -> bytes:
+    """Run *cmd* in *cwd* (feeding *input* to stdin, with *env* if given); return stdout, raise RuntimeError on non-zero exit."""
+    # traces and error messages get shared: keep tokens embedded in URLs out of them
+    shown = [redact(arg) for arg in cmd]
+    with span(" ".join(shown[:2]), "subprocess", cmd=" ".join(shown)):
+        result = subprocess.run(cmd, cwd=cwd, input=input, env=env, capture_output=True)
     if result.returncode != 0:
+        stderr = redact(result.stderr.decode(errors="replace").strip())
         raise RuntimeError(
-            f"$ {' '.join(cmd)}\n{result.stderr.strip() or 'command failed'}"
+            f"$ {' '.join(shown)}\n{stderr or 'command failed'}"
         )
+    return result.stdout
 
 def get_project_token(project_root: pathlib.Path) -> str | None:
     """Return token from .projinit.env or '' if file missing/empty."""
+    from dotenv import dotenv_values
+
     return dotenv_values(project_root / ".projinit.env").get("GITHUB_TOKEN", "")
 
 def save_project_token(project_root: pathlib.Path, token: str | None) -> None:
@@ -25,3 +45,16 @@ def save_project_token(project_root: pathlib.Path, token: str | None) -> None:
     if ".projinit.env" not in lines:
         lines.append(".projinit.env")
         gi.write_text("\n".join(lines) + "\n")
+
+def get_cache_dir(*parts: str) -> pathlib.Path:
+    """Return sparkstart's cache directory (or a sub-folder of it), creating it if needed.
+
+    Override with $SPARKSTART_CACHE_DIR; defaults to $XDG_CACHE_HOME/sparkstart.
+    """
+    base = os.getenv("SPARKSTART_CACHE_DIR")
+    if not base:
+        xdg = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg, "sparkstart")
+    path = pathlib.Path(base, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,302 @@
+"""
+git.py – create a repository and its first commit in a single pass
+
+Instead of `git add .` (which re-hashes the whole worktree, .venv included,
+before .gitignore is applied) followed by `git commit`, we:
+
+    1. `git init -b main`
+    2. `git var -l` to resolve the author/committer identity and config
+    3. stream every file through one `git fast-import`
+    4. write .git/index ourselves from the stat data we already have
+
+The resulting commit is identical to what `git add . && git commit` makes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import re
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sparkstart.utils.common import run_shell
+
+MODE_FILE = 0o100644
+MODE_EXEC = 0o100755
+MODE_LINK = 0o120000
+
+
+class GitFile(NamedTuple):
+    """One tracked file: repo-relative POSIX path, content, git mode."""
+
+    path: str
+    data: bytes
+    mode: int
+
+
+class Commit(NamedTuple):
+    """The commit init_and_commit made: enough to recreate it byte for byte elsewhere."""
+
+    sha: str
+    message: str
+    author: str  # "Name <email> 1700000000 +0200", as in `git var -l`
+    committer: str
+    files: List[GitFile]
+
+
+# --- .gitignore matching -------------------------------------------------
+
+def _glob_to_regex(pattern: str) -> "re.Pattern[str]":
+    out = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out += "/.*"
+            i += 3
+        elif pattern[i] == "*":
+            out += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            out += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            cls = pattern[i + 1:end].replace("\\", "\\\\")
+            out += "[^" + cls[1:] + "]" if cls.startswith("!") else "[" + cls + "]"
+            i = end + 1
+        else:
+            out += re.escape(pattern[i])
+            i += 1
+    return re.compile(out + r"\Z")
+
+
+class IgnoreRules:
+    """Ordered gitignore rules; the last matching rule wins."""
+
+    def __init__(self) -> None:
+        # (base dir, regex, negate, dir_only, anchored)
+        self.rules: List[Tuple[str, "re.Pattern[str]", bool, bool, bool]] = []
+
+    def add(self, text: str, base: str = "") -> None:
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            self.rules.append((base, _glob_to_regex(line.lstrip("/")), negate, dir_only, anchored))
+
+    def add_file(self, path: pathlib.Path, base: str = "") -> None:
+        try:
+            self.add(path.read_text(errors="replace"), base)
+        except OSError:
+            pass
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        result = False
+        for base, regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel.startswith(base + "/"):
+                    continue
+                sub = rel[len(base) + 1:]
+            else:
+                sub = rel
+            if regex.match(sub if anchored else sub.rsplit("/", 1)[-1]):
+                result = not negate
+        return result
+
+    def excludes(self, rel: str) -> bool:
+        """True if file *rel* or any directory above it is ignored."""
+        parts = rel.split("/")
+        for i in range(1, len(parts)):
+            if self.ignored("/".join(parts[:i]), True):
+                return True
+        return self.ignored(rel, False)
+
+
+def load_ignore_rules(root: pathlib.Path, config: Dict[str, str]) -> IgnoreRules:
+    """Global excludes, then .git/info/exclude, then the top-level .gitignore."""
+    rules = IgnoreRules()
+    excludes = config.get("core.excludesfile")
+    if excludes:
+        rules.add_file(pathlib.Path(os.path.expanduser(excludes)))
+    else:
+        xdg = os.getenv("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        rules.add_file(pathlib.Path(xdg, "git", "ignore"))
+    rules.add_file(root / ".git" / "info" / "exclude")
+    rules.add_file(root / ".gitignore")
+    return rules
+
+
+def collect_files(root: pathlib.Path, rules: IgnoreRules, filemode: bool = True) -> List[GitFile]:
+    """Walk *root* like `git add .` would, never descending into ignored dirs."""
+    files: List[GitFile] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir
+        if rel_dir:
+            rules.add_file(pathlib.Path(dirpath, ".gitignore"), rel_dir)
+
+        keep = []
+        for name in sorted(dirnames):
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            full = os.path.join(dirpath, name)
+            if name == ".git" or rules.ignored(rel, True):
+                continue
+            if os.path.islink(full):  # symlinked dirs are tracked as links
+                filenames.append(name)
+                continue
+            keep.append(name)
+        dirnames[:] = keep
+
+        for name in sorted(filenames):
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            full = os.path.join(dirpath, name)
+            if rules.ignored(rel, False):
+                continue
+            if os.path.islink(full):
+                files.append(GitFile(rel, os.fsencode(os.readlink(full)), MODE_LINK))
+                continue
+            with open(full, "rb") as f:
+                data = f.read()
+            executable = filemode and os.stat(full).st_mode & 0o111
+            files.append(GitFile(rel, data, MODE_EXEC if executable else MODE_FILE))
+    return files
+
+
+# --- fast-import + index ---------------------------------------------------
+
+def _quote_path(path: str) -> bytes:
+    raw = path.encode()
+    if raw.startswith(b'"') or b"\n" in raw:
+        escaped = raw.replace(b"\\", b"\\\\").replace(b'"', b'\\"').replace(b"\n", b"\\n")
+        return b'"' + escaped + b'"'
+    return raw
+
+
+def build_fast_import_stream(
+    files: List[GitFile], message: str, author: str, committer: str, ref: str = "refs/heads/main"
+) -> bytes:
+    """Serialise one root commit of *files* in git fast-import format."""
+    msg = message.encode()
+    parts = [
+        f"commit {ref}\nauthor {author}\ncommitter {committer}\n".encode(),
+        b"data %d\n" % len(msg), msg, b"\n",
+    ]
+    for f in files:
+        parts += [b"M %o inline " % f.mode, _quote_path(f.path), b"\ndata %d\n" % len(f.data), f.data, b"\n"]
+    parts.append(b"\ndone\n")
+    return b"".join(parts)
+
+
+def blob_sha1(data: bytes) -> bytes:
+    """Raw SHA-1 git assigns to a blob with *data*."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).digest()
+
+
+def tree_sha1(files: List[GitFile]) -> bytes:
+    """Raw SHA-1 of the root tree holding *files* (subtrees built from their paths)."""
+    children: Dict[str, List[GitFile]] = {}
+    entries: List[Tuple[bytes, bytes]] = []  # (sort key, entry)
+    for f in files:
+        head, sep, rest = f.path.partition("/")
+        if sep:
+            children.setdefault(head, []).append(f._replace(path=rest))
+        else:
+            name = f.path.encode()
+            entries.append((name, b"%o %s\0" % (f.mode, name) + blob_sha1(f.data)))
+    for head, sub in children.items():
+        name = head.encode()
+        entries.append((name + b"/", b"40000 %s\0" % name + tree_sha1(sub)))
+    body = b"".join(entry for _, entry in sorted(entries))
+    return hashlib.sha1(b"tree %d\0" % len(body) + body).digest()
+
+
+def commit_sha1(tree: bytes, message: str, author: str, committer: str) -> str:
+    """Hex SHA-1 of a root commit of *tree* (raw) with the given message and idents."""
+    body = f"tree {tree.hex()}\nauthor {author}\ncommitter {committer}\n\n{message}".encode()
+    return hashlib.sha1(b"commit %d\0" % len(body) + body).hexdigest()
+
+
+def write_index(root: pathlib.Path, files: List[GitFile]) -> None:
+    """Write a v2 .git/index with fresh stat data, so `git status` needn't re-hash."""
+    entries = []
+    for f in sorted(files, key=lambda f: f.path.encode()):
+        st = os.lstat(root / f.path)
+        name = f.path.encode()
+        entry = struct.pack(
+            ">10I20sH",
+            int(st.st_ctime) & 0xFFFFFFFF, st.st_ctime_ns % 1_000_000_000,
+            int(st.st_mtime) & 0xFFFFFFFF, st.st_mtime_ns % 1_000_000_000,
+            st.st_dev & 0xFFFFFFFF, st.st_ino & 0xFFFFFFFF,
+            f.mode, st.st_uid & 0xFFFFFFFF, st.st_gid & 0xFFFFFFFF,
+            st.st_size & 0xFFFFFFFF,
+            blob_sha1(f.data), min(len(name), 0xFFF),
+        ) + name
+        entries.append(entry + b"\0" * (8 - len(entry) % 8))
+    body = b"DIRC" + struct.pack(">II", 2, len(entries)) + b"".join(entries)
+    (root / ".git" / "index").write_bytes(body + hashlib.sha1(body).digest())
+
+
+def _parse_var_list(output: bytes) -> Dict[str, str]:
+    values: Dict[str, str] = {}
+    for line in output.decode(errors="replace").splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key] = value  # like git config, the last value wins
+    return values
+
+
+def init_and_commit(
+    root: pathlib.Path, message: str = "Initial commit", files: Optional[List[GitFile]] = None
+) -> Commit:
+    """
+    `git init -b main` *root* and record *files* (default: everything not
+    ignored under *root*) as the first commit on main, with a matching index.
+    """
+    run_shell(["git", "init", "-b", "main"], cwd=root)
+    config = _parse_var_list(run_shell(["git", "var", "-l"], cwd=root))
+
+    # `git var -l` falls back to a guessed identity where `git commit` would refuse
+    for ident in ("GIT_AUTHOR_IDENT", "GIT_COMMITTER_IDENT"):
+        if "(none)>" in config.get(ident, "(none)>"):
+            raise RuntimeError(
+                "$ git var -l\nAuthor identity unknown: set it with\n"
+                '  git config --global user.email "you@example.com"\n'
+                '  git config --global user.name "Your Name"'
+            )
+
+    rules = load_ignore_rules(root, config)
+    if files is None:
+        files = collect_files(root, rules, config.get("core.filemode", "true") == "true")
+    else:
+        # parents first, as git reads them: a deeper file's `!rule` must come later to win
+        nested = [f for f in files if f.path.endswith("/.gitignore")]
+        for f in sorted(nested, key=lambda f: f.path.count("/")):
+            rules.add(f.data.decode(errors="replace"), f.path.rsplit("/", 1)[0])
+        files = [f for f in files if not rules.excludes(f.path)]
+
+    author, committer = config["GIT_AUTHOR_IDENT"], config["GIT_COMMITTER_IDENT"]
+    stream = build_fast_import_stream(files, message + "\n", author, committer)
+    run_shell(["git", "fast-import", "--quiet", "--done"], cwd=root, input=stream)
+
+    if config.get("extensions.objectformat", "sha1") == "sha1":
+        write_index(root, files)
+        sha = commit_sha1(tree_sha1(files), message + "\n", author, committer)
+    else:
+        run_shell(["git", "read-tree", "HEAD"], cwd=root)
+        sha = run_shell(["git", "rev-parse", "HEAD"], cwd=root).decode().strip()
+    return Commit(sha, message + "\n", author, committer, files)
@@ -1,24 +1,254 @@
+"""
+github.py – the few GitHub REST calls sparkstart needs
+
+Every call goes through `api_request`, which keeps to GitHub's limits:
+
+  • it tracks X-RateLimit-Remaining/-Reset and, once fewer than
+    RATE_RESERVE requests are left, spreads the rest over the time to reset
+    (waiting at most MAX_WAIT seconds, else failing fast);
+  • it retries transient failures (connection errors, 5xx, 429, secondary
+    rate limits) with jittered exponential backoff, honouring Retry-After,
+    but only for calls that are safe to repeat;
+  • `get_json` revalidates cached GETs with If-None-Match, and a 304 does
+    not count against the quota.
+
+`push_commit` uploads a commit through the Git Data API (blobs, tree,
+commit, ref) instead of `git push`: a handful of small JSON requests on an
+already-open connection, with the blob uploads running concurrently.
+
+Set $SPARKSTART_GITHUB_API to talk to GitHub Enterprise (or a test stub).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
 import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict
+
 import requests
+from requests.adapters import HTTPAdapter
 
-def get_github_user(token: str) -> str:
-    """Get the authenticated GitHub username."""
-    r = requests.get(
-        "https://api.github.com/user",
-        headers={
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json",
-        },
-        timeout=10,
-    )
+from sparkstart.timings import span
+
+if TYPE_CHECKING:
+    from sparkstart.utils.git import Commit
+
+API_URL = os.getenv("SPARKSTART_GITHUB_API", "https://api.github.com").rstrip("/")
+UPLOAD_WORKERS = 8
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5  # seconds; attempt n waits up to BACKOFF_BASE * 2**n (full jitter)
+MAX_WAIT = 60  # seconds we are willing to sleep for the rate limit before giving up
+RATE_RESERVE = 10  # below this many remaining requests, pace ourselves until the reset
+IDEMPOTENT = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LOGIN_TTL = 600  # seconds a token -> login lookup is reused
+
+_logins: dict[str, tuple[str, float]] = {}
+_logins_pending: dict[str, "Future[str]"] = {}  # lookups in flight, shared by concurrent callers
+_logins_lock = threading.Lock()
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+_rate = {"remaining": None, "reset": 0.0}  # from the latest response's X-RateLimit-* headers
+_rate_lock = threading.Lock()
+_sleep = time.sleep
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide keep-alive session for the GitHub API, so every
+    call after the first reuses an open TLS connection instead of a new handshake.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
+            session.headers["Accept"] = "application/vnd.github+json"
+            _session = session
+        return _session
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"token {token}"}
+
+
+def _check(r: requests.Response) -> requests.Response:
     if r.status_code >= 300:
         raise RuntimeError(f"GitHub API error {r.status_code}: {r.text.strip()}")
-    return r.json()["login"]
+    return r
+
+
+def _throttle() -> None:
+    """Before a request: wait if the remaining quota is nearly used up."""
+    with _rate_lock:
+        remaining, reset = _rate["remaining"], _rate["reset"]
+        if remaining is None or remaining >= RATE_RESERVE:
+            return
+        until_reset = reset - time.time()
+        if until_reset <= 0:
+            return
+        wait = until_reset if remaining <= 0 else until_reset / remaining
+        if wait > MAX_WAIT:
+            raise RuntimeError(
+                f"GitHub rate limit exhausted; it resets at {time.strftime('%H:%M:%S', time.localtime(reset))}"
+            )
+        if remaining > 0:
+            _rate["remaining"] = remaining - 1  # our own share, before the response says so
+    _sleep(wait)
+
+
+def _record_rate(r: requests.Response) -> None:
+    remaining, reset = r.headers.get("X-RateLimit-Remaining"), r.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    with _rate_lock:
+        _rate["remaining"], _rate["reset"] = int(remaining), float(reset)
+
+
+def _retry_after(value: str) -> float:
+    """Seconds to wait for a Retry-After header: delay-seconds or an HTTP-date (RFC 9110)."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return BACKOFF_BASE  # unparseable: wait a little, as for a plain retry
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_delay(r: requests.Response | None, attempt: int, idempotent: bool) -> float | None:
+    """Seconds to wait before retrying after *r* (None: connection error), or None to give up.
+
+    Rate-limited requests were rejected unprocessed, so they are retried
+    whatever the method; 5xx responses and lost connections only when the
+    call is safe to repeat.
+    """
+    if r is not None:
+        limited = r.status_code == 429 or r.status_code == 403 and (
+            r.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in r.headers
+            or "rate limit" in r.text.lower()
+        )
+        if not limited and not (idempotent and r.status_code in RETRY_STATUSES):
+            return None
+        if "Retry-After" in r.headers:
+            return _retry_after(r.headers["Retry-After"])
+        if r.headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in r.headers:
+            return max(0.0, float(r.headers["X-RateLimit-Reset"]) - time.time())
+    return random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+
 
-def create_github_repo(repo_name: str, token: str | None = None) -> str:
+def api_request(
+    method: str, url: str, token: str, idempotent: bool | None = None, **kwargs: Any
+) -> requests.Response:
+    """
+    One GitHub API call, rate-limited and retried (see module docstring).
+    *idempotent* defaults to the HTTP method's semantics; pass True for
+    POSTs that are safe to repeat (e.g. content-addressed Git Data objects).
+    The final response is returned whatever its status; see _check.
+    """
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT
+    kwargs.setdefault("timeout", 10)
+    headers = {**kwargs.pop("headers", {}), **_auth(token)}
+    send = getattr(get_session(), method.lower())
+
+    attempt = 0
+    while True:
+        _throttle()
+        try:
+            with span(f"{method} {url.replace(API_URL, '', 1)}", "http", attempt=attempt):
+                r = send(url, headers=headers, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if not idempotent or attempt == MAX_RETRIES:
+                raise
+            r = None
+        else:
+            _record_rate(r)
+        delay = _retry_delay(r, attempt, idempotent)
+        if r is not None and (delay is None or delay > MAX_WAIT or attempt == MAX_RETRIES):
+            return r  # a long wait means the primary limit: let the caller fail now
+        _sleep(delay)
+        attempt += 1
+
+
+def get_json(url: str, token: str) -> Any:
+    """GET *url* as JSON, revalidating a cached copy with its ETag (a 304 is free)."""
+    from sparkstart.utils.common import get_cache_dir
+
+    entry = get_cache_dir("http") / (hashlib.sha256(f"{token}\0{url}".encode()).hexdigest() + ".json")
+    try:
+        cached = json.loads(entry.read_text())
+    except (OSError, ValueError):
+        cached = None
+
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    r = api_request("GET", url, token, headers=headers)
+    if r.status_code == 304 and cached:
+        return cached["body"]
+    body = _check(r).json()
+    if r.headers.get("ETag"):
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps({"etag": r.headers["ETag"], "body": body}))
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+    return body
+
+
+def get_github_user(token: str) -> str:
+    """
+    Get the authenticated GitHub username.
+    Cached per token for LOGIN_TTL seconds; concurrent callers share one request.
+    """
+    with _logins_lock:
+        login, expires = _logins.get(token, ("", 0.0))
+        if time.monotonic() < expires:
+            return login
+        pending = _logins_pending.get(token)
+        if pending is None:
+            pending = _logins_pending[token] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return pending.result()
+
+    # the request runs outside the lock: other tokens' lookups are not held up
+    try:
+        login = get_json(f"{API_URL}/user", token)["login"]
+    except BaseException as e:
+        with _logins_lock:
+            del _logins_pending[token]
+        pending.set_exception(e)
+        raise
+    with _logins_lock:
+        _logins[token] = (login, time.monotonic() + LOGIN_TTL)
+        del _logins_pending[token]
+    pending.set_result(login)
+    return login
+
+def create_github_repo(repo_name: str, token: str | None = None, auto_init: bool = False) -> str:
     """
     Create repo under authenticated user; return clone URL.
     *token* optional – falls back to $GITHUB_TOKEN.
+    *auto_init* gives it a first commit: the Git Data API refuses empty repos.
     """
     token = token or os.getenv("GITHUB_TOKEN")
     if not token:
@@ -27,28 +257,74 @@ def create_github_repo(repo_name: str, token: str | None = None) -> str:
             "Save one in .projinit.env, set $GITHUB_TOKEN, or pass --github without a token to be prompted."
         )
 
-    r = requests.post(
-        "https://api.github.com/user/repos",
-        headers={
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json",
-        },
-        json={"name": repo_name, "private": False},
-        timeout=10,
+    # not retried: a repeat after a lost response would fail with "name already exists"
+    r = api_request(
+        "POST", f"{API_URL}/user/repos", token,
+        json={"name": repo_name, "private": False, "auto_init": auto_init},
     )
-    if r.status_code >= 300:
-        raise RuntimeError(f"GitHub API error {r.status_code}: {r.text.strip()}")
+    _check(r)
     return r.json()["clone_url"]  # e.g. https://github.com/user/repo.git
 
 def delete_github_repo(owner: str, repo_name: str, token: str) -> None:
     """Delete a GitHub repository."""
-    r = requests.delete(
-        f"https://api.github.com/repos/{owner}/{repo_name}",
-        headers={
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json",
-        },
-        timeout=10,
-    )
-    if r.status_code >= 300:
-        raise RuntimeError(f"GitHub API error {r.status_code}: {r.text.strip()}")
+    _check(api_request("DELETE", f"{API_URL}/repos/{owner}/{repo_name}", token))
+
+
+def _signature(ident: str) -> dict:
+    """`Name <email> 1700000000 +0200` -> the API's {name, email, date}."""
+    m = re.fullmatch(r"(.*) <(.*)> (\d+) ([+-])(\d\d)(\d\d)", ident)
+    if not m:
+        raise ValueError(f"unparseable git identity: {ident!r}")
+    name, email, ts, sign, hh, mm = m.groups()
+    offset = timedelta(hours=int(hh), minutes=int(mm)) * (-1 if sign == "-" else 1)
+    return {"name": name, "email": email, "date": datetime.fromtimestamp(int(ts), timezone(offset)).isoformat()}
+
+
+def repo_path(repo_url: str) -> str:
+    """`https://github.com/owner/repo.git` -> `owner/repo`."""
+    owner, repo = repo_url.rstrip("/").split("/")[-2:]
+    return f"{owner}/{repo[:-4] if repo.endswith('.git') else repo}"
+
+
+def push_commit(repo_url: str, commit: Commit, token: str, branch: str = "main") -> str:
+    """
+    Recreate *commit* in the repo at *repo_url* with the Git Data API and
+    force *branch* to it; return the commit's SHA on GitHub.
+
+    That SHA equals `commit.sha` unless GitHub stored a field differently,
+    in which case the caller should fall back to `git push`.
+    """
+    repo = f"{API_URL}/repos/{repo_path(repo_url)}"
+    base = f"{repo}/git"
+
+    # Git objects are content-addressed, so creating one twice is harmless
+    def post(url: str, payload: dict, timeout: int = 10) -> requests.Response:
+        return api_request("POST", url, token, idempotent=True, json=payload, timeout=timeout)
+
+    def upload(data: bytes) -> str:
+        payload = {"content": base64.b64encode(data).decode(), "encoding": "base64"}
+        return _check(post(f"{base}/blobs", payload, timeout=30)).json()["sha"]
+
+    unique = list(dict.fromkeys(f.data for f in commit.files))
+    with ThreadPoolExecutor(max_workers=max(1, min(UPLOAD_WORKERS, len(unique)))) as pool:
+        blobs: Dict[bytes, str] = dict(zip(unique, pool.map(upload, unique)))
+
+    tree = [{"path": f.path, "mode": f"{f.mode:06o}", "type": "blob", "sha": blobs[f.data]} for f in commit.files]
+    tree_sha = _check(post(f"{base}/trees", {"tree": tree}, timeout=30)).json()["sha"]
+
+    r = post(f"{base}/commits", {
+        "message": commit.message,
+        "tree": tree_sha,
+        "parents": [],
+        "author": _signature(commit.author),
+        "committer": _signature(commit.committer),
+    })
+    sha = _check(r).json()["sha"]
+
+    # auto_init created the branch; if it went to another default branch, create ours
+    r = api_request("PATCH", f"{base}/refs/heads/{branch}", token, idempotent=True, json={"sha": sha, "force": True})
+    if r.status_code in (404, 422):
+        _check(api_request("POST", f"{base}/refs", token, json={"ref": f"refs/heads/{branch}", "sha": sha}))
+        r = api_request("PATCH", repo, token, idempotent=True, json={"default_branch": branch})
+    _check(r)
+    return sha
@@ -0,0 +1,155 @@
+"""
+trash.py – instant project deletion: rename now, remove later
+
+`move_to_trash` renames a project into <parent>/.sparkstart-trash/, a sibling
+on the same filesystem, so it disappears from its old path with one rename.
+`spawn_reaper` then removes the trash from a detached process, and
+`rmtree_parallel` does the removal itself: directories are listed with
+os.scandir on a thread pool, so the unlink() calls of a big .venv,
+node_modules or target/ tree overlap instead of running one at a time.
+
+A reaper that gets interrupted just leaves entries in the trash; `sparkstart
+gc` (or the next background delete in the same folder) removes them.
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import secrets
+import stat
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+TRASH_DIR = ".sparkstart-trash"
+
+
+def _refuse_symlink(path: os.PathLike) -> None:
+    """Like shutil.rmtree: never delete through a symlink, it may point anywhere."""
+    if os.path.islink(path):
+        raise OSError(f"{os.fspath(path)} is a symbolic link; delete the link itself, not its target")
+
+
+def move_to_trash(path: pathlib.Path) -> pathlib.Path:
+    """Atomically move *path* into its parent's trash folder and return the new location."""
+    _refuse_symlink(path)
+    trash = path.parent / TRASH_DIR
+    trash.mkdir(exist_ok=True)
+    _refuse_symlink(trash)
+    dest = trash / f"{path.name}-{secrets.token_hex(4)}"
+    os.rename(path, dest)
+    return dest
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass  # another reaper got there first
+    except PermissionError:
+        if os.name != "nt":
+            raise
+        os.chmod(path, stat.S_IWRITE)  # read-only files (e.g. .git/objects) on Windows
+        os.unlink(path)
+
+
+def rmtree_parallel(path: pathlib.Path, workers: Optional[int] = None) -> None:
+    """Remove the directory tree at *path*, listing and unlinking on *workers* threads.
+
+    Symlinks inside the tree are removed, never followed; *path* itself
+    being one raises OSError, as with shutil.rmtree. Entries that vanish
+    concurrently are ignored, so two reapers can safely work on the same tree.
+    """
+    _refuse_symlink(path)
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    dirs: List[str] = []
+    errors: List[BaseException] = []
+    lock = threading.Lock()
+    pending = threading.Semaphore(0)
+    outstanding = [1]
+
+    def clear(directory: str) -> None:
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        with lock:
+                            dirs.append(entry.path)
+                            outstanding[0] += 1
+                        pool.submit(clear, entry.path)
+                    else:
+                        _unlink(entry.path)
+        except FileNotFoundError:
+            pass
+        except BaseException as e:
+            with lock:
+                errors.append(e)
+        finally:
+            with lock:
+                outstanding[0] -= 1
+                if outstanding[0] == 0:
+                    pending.release()
+
+    root = os.fspath(path)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pool.submit(clear, root)
+        pending.acquire()
+    if errors:
+        raise errors[0]
+
+    # children were appended after their parents: remove them in reverse
+    for d in reversed([root] + dirs):
+        try:
+            os.rmdir(d)
+        except FileNotFoundError:
+            pass
+
+
+def reap(trash: pathlib.Path) -> None:
+    """Remove everything inside *trash*, then *trash* itself if nothing new arrived."""
+    _refuse_symlink(trash)
+    try:
+        entries = list(trash.iterdir())
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir() and not entry.is_symlink():
+            rmtree_parallel(entry)
+        else:
+            _unlink(str(entry))
+    try:
+        trash.rmdir()
+    except OSError:
+        pass  # another delete moved something in meanwhile; its reaper handles it
+
+
+def spawn_reaper(trash: pathlib.Path) -> None:
+    """Reap *trash* from a detached process that outlives this one."""
+    if getattr(sys, "frozen", False):  # PyInstaller binary: no -m, go through the CLI
+        cmd = [sys.executable, "gc", str(trash.parent)]
+    else:
+        cmd = [sys.executable, "-m", "sparkstart.utils.trash", str(trash)]
+
+    # make sure the child imports this very sparkstart, even when it is not installed
+    src_root = str(pathlib.Path(__file__).resolve().parents[2])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src_root, env.get("PYTHONPATH")) if p)
+
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True  # survive the terminal closing
+    subprocess.Popen(
+        cmd, env=env, close_fds=True,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        **kwargs,
+    )
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:]:
+        reap(pathlib.Path(arg))
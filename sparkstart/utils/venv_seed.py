@@ -0,0 +1,183 @@
+"""
+venv_seed.py – fast virtual-env creation from a cached, pip-seeded template
+
+`venv.create(with_pip=True)` runs ensurepip every time, which costs seconds.
+Instead we build one seed venv per interpreter (keyed by its path + version)
+in the sparkstart cache, then clone it: files are reflinked or hard-linked
+when the filesystem allows it, and only pyvenv.cfg and the bin/ scripts,
+which embed the venv's absolute path, are rewritten for the new location.
+
+A long-running process can go further and `install_pool` a source of venvs
+that were cloned ahead of time (see sparkstart.server.VenvPool):
+`create_venv` then only renames one into place and relocates it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import venv
+from typing import Optional, Protocol
+
+from sparkstart.timings import span
+from sparkstart.utils.common import get_cache_dir
+
+ORIGIN_FILE = "origin"  # path the seed was built at, next to the seed's .venv
+FICLONE = 0x40049409  # linux/fs.h: share extents with another file (reflink)
+
+
+class Pool(Protocol):
+    def take(self, dest: pathlib.Path, prefix: Optional[pathlib.Path]) -> bool:
+        """Move a ready venv to *dest*, pointing at *prefix*; False if none could be used."""
+
+
+_pool: Optional[Pool] = None
+
+
+def install_pool(pool: Optional[Pool]) -> None:
+    """Make create_venv take venvs from *pool* first (None: stop)."""
+    global _pool
+    _pool = pool
+
+
+def seed_key() -> str:
+    """Cache key for the running interpreter."""
+    exe = os.path.realpath(sys.executable)
+    digest = hashlib.sha256(f"{exe}\n{sys.version}".encode()).hexdigest()[:16]
+    return f"py{sys.version_info[0]}{sys.version_info[1]}-{digest}"
+
+
+def get_seed() -> pathlib.Path:
+    """Return the seed directory for this interpreter, building it on first use."""
+    root = get_cache_dir("venvs")
+    seed = root / seed_key()
+    if (seed / ORIGIN_FILE).exists():
+        return seed
+
+    # build aside and rename into place, so concurrent builders never see half a seed
+    staging = pathlib.Path(tempfile.mkdtemp(prefix=".build-", dir=root))
+    try:
+        with span("build seed venv (ensurepip)", "venv"):
+            venv.create(staging / ".venv", with_pip=True)
+        (staging / ORIGIN_FILE).write_text(str(staging / ".venv"))
+        try:
+            os.rename(staging, seed)
+        except OSError:
+            if not (seed / ORIGIN_FILE).exists():  # not just a lost race
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return seed
+
+
+def _reflink(src: str, dst: str) -> None:
+    import fcntl
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _make_copier():
+    """Return copy(src, dst) that settles on the cheapest strategy that works."""
+    strategies = [_reflink, os.link, shutil.copy2]
+
+    def copy(src: str, dst: str) -> None:
+        while True:
+            try:
+                strategies[0](src, dst)
+                return
+            except OSError:
+                if len(strategies) == 1:
+                    raise
+                strategies.pop(0)
+
+    return copy
+
+
+def relocate_venv(venv_dir: pathlib.Path, old_prefix: str, new_prefix: pathlib.Path | None = None) -> None:
+    """Rewrite the absolute *old_prefix* in pyvenv.cfg and bin/ scripts to *new_prefix*
+    (default: *venv_dir* itself).
+
+    Files are replaced rather than edited in place, so hard links back to the
+    seed are broken instead of modified.
+    """
+    old, new = old_prefix.encode(), str((new_prefix or venv_dir).absolute()).encode()
+    for f in [venv_dir / "pyvenv.cfg", *(venv_dir / "bin").iterdir()]:
+        if f.is_symlink() or not f.is_file():
+            continue
+        data = f.read_bytes()
+        if old not in data:
+            continue
+        tmp = f.with_name(f.name + ".sparkstart-tmp")
+        tmp.write_bytes(data.replace(old, new))
+        shutil.copymode(f, tmp)
+        os.replace(tmp, f)
+
+
+def clone_venv(seed: pathlib.Path, dest: pathlib.Path, prefix: pathlib.Path | None = None) -> None:
+    """Materialise the seed's venv at *dest* (which must not exist), pointing at *prefix*."""
+    src_root = seed / ".venv"
+    old_prefix = (seed / ORIGIN_FILE).read_text()
+    copy = _make_copier()
+
+    dest.mkdir()
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        rel = os.path.relpath(dirpath, src_root)
+        out = dest if rel == "." else dest / rel
+        for name in dirnames + filenames:
+            src = os.path.join(dirpath, name)
+            if os.path.islink(src):
+                target = os.readlink(src)
+                if target.startswith(old_prefix):
+                    target = str((prefix or dest).absolute()) + target[len(old_prefix):]
+                os.symlink(target, out / name)
+            elif name in dirnames:
+                (out / name).mkdir()
+            else:
+                copy(src, str(out / name))
+    relocate_venv(dest, old_prefix, prefix)
+
+
+def create_venv(dest: pathlib.Path, prefix: pathlib.Path | None = None) -> None:
+    """Create a pip-seeded virtual environment at *dest*.
+
+    *prefix* is where the venv will live once *dest* is moved (e.g. out of a
+    staging directory); its paths are written for that location.
+
+    Takes a prebuilt venv from the installed pool, if any, else clones the
+    cached seed when possible and falls back to a plain
+    `venv.create` on Windows (launchers embed their path, so *prefix* is not
+    supported there), when $SPARKSTART_NO_VENV_CACHE is set, or if cloning fails.
+    """
+    if os.name == "nt":
+        venv.create(dest, with_pip=True)
+        return
+
+    pool = _pool
+    if pool is not None:
+        with span("take pooled venv", "venv"):
+            if pool.take(dest, prefix):
+                return
+
+    if not os.getenv("SPARKSTART_NO_VENV_CACHE"):
+        try:
+            seed = get_seed()
+            with span("clone seed venv", "venv"):
+                clone_venv(seed, dest, prefix)
+            return
+        except OSError:
+            shutil.rmtree(dest, ignore_errors=True)
+
+    with span("venv.create (ensurepip)", "venv"):
+        venv.create(dest, with_pip=True)
+    if prefix is not None:
+        relocate_venv(dest, str(dest.absolute()), prefix)
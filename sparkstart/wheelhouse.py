@@ -0,0 +1,255 @@
+"""
+wheelhouse.py – a local wheel cache for the dependencies of new Python projects
+
+A fresh .venv only has pip, so the first thing everyone does is a networked
+`pip install`. With `sparkstart new --install` the project's dependencies
+(and its `test` extra) are installed from <cache>/wheels instead:
+
+    objects/<sha256>.whl    each wheel once, named by its content
+    index/<wheel filename>  a link to the object: pip's --find-links directory
+
+Installs run pip with --no-index, so a warm cache never touches the
+network. When wheels are missing, `prefill` downloads them (one `pip
+download` per requirement, in parallel) and the install is retried.
+`prefill` too resolves each requirement from the cache alone first, and
+only asks the package index for those the cache cannot satisfy.
+A wheel's mtime records when it was last used; `prune` drops the stale ones.
+
+The install itself is one pip call, not one per wheel: pip's resolver has
+to see the whole set to pick versions that fit together, and several pips
+writing into the same site-packages would race. What is left after
+resolution is unpacking local files, and the pipeline already runs it
+alongside the git and GitHub steps (see sparkstart.core).
+
+    sparkstart cache prefill            # everything the built-in templates need
+    sparkstart cache prefill numpy      # or any requirement
+    sparkstart cache prune --days 30
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from sparkstart.utils.common import get_cache_dir, run_shell
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+DOWNLOAD_WORKERS = 4
+PIP_FLAGS = ["--disable-pip-version-check", "--no-input", "--quiet"]
+EXTRAS = ("test", "bench")
+REPORT_PIP = (22, 2)  # first pip with `install --report`; Python 3.8-3.10 bundle older ones
+
+
+def objects_dir() -> pathlib.Path:
+    return get_cache_dir("wheels", "objects")
+
+
+def index_dir() -> pathlib.Path:
+    return get_cache_dir("wheels", "index")
+
+
+def project_requirements(pyproject: bytes | str, extras: Iterable[str] = EXTRAS) -> List[str]:
+    """The dependencies (plus *extras*) declared in a pyproject.toml."""
+    if isinstance(pyproject, bytes):
+        pyproject = pyproject.decode()
+    project = tomllib.loads(pyproject).get("project", {})
+    reqs = list(project.get("dependencies", []))
+    for extra in extras:
+        reqs += project.get("optional-dependencies", {}).get(extra, [])
+    return list(dict.fromkeys(reqs))
+
+
+def template_requirements() -> List[str]:
+    """Everything the built-in and plugin Python templates depend on."""
+    from sparkstart import registry
+    from sparkstart.core import plan_project
+
+    reqs: List[str] = []
+    for template in [None, *registry.templates("python")]:
+        plan = plan_project("project", "python", template=template, bench=True)
+        if "pyproject.toml" in plan:
+            reqs += project_requirements(plan["pyproject.toml"].data)
+    return list(dict.fromkeys(reqs))
+
+
+def _link(src: pathlib.Path, dest: pathlib.Path) -> None:
+    """Atomically point *dest* at *src*: a hard link, or a symlink where those fail."""
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        os.symlink(src, tmp)
+    os.replace(tmp, dest)
+
+
+def add(wheel: pathlib.Path) -> pathlib.Path:
+    """Store *wheel* in the cache (once per content) and return its index entry."""
+    h = hashlib.sha256()
+    with open(wheel, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    obj = objects_dir() / f"{h.hexdigest()}.whl"
+    if not obj.exists():
+        tmp = obj.with_name(f".{obj.name}.{os.getpid()}.tmp")
+        _link_or_copy(wheel, tmp)
+        os.replace(tmp, obj)
+
+    entry = index_dir() / wheel.name
+    if not (entry.exists() and os.path.samefile(entry, obj)):
+        _link(obj, entry)
+    os.utime(entry)
+    return entry
+
+
+def _link_or_copy(src: pathlib.Path, dest: pathlib.Path) -> None:
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+def prefill(requirements: Iterable[str], python: Optional[str] = None) -> List[pathlib.Path]:
+    """
+    Download wheels for *requirements* and their dependencies into the cache,
+    for *python* (default: this interpreter, the one new venvs are cloned from).
+    Return the index entries that were added or refreshed.
+    """
+    requirements = list(dict.fromkeys(requirements))
+    if not requirements:
+        return []
+    python = python or sys.executable
+    with tempfile.TemporaryDirectory(prefix="sparkstart-wheels-") as tmp:
+        def download(req: str) -> None:
+            dest = pathlib.Path(tmp, hashlib.sha256(req.encode()).hexdigest()[:12])
+            dest.mkdir()
+            cmd = [
+                python, "-m", "pip", "download", *PIP_FLAGS, "--only-binary=:all:",
+                "--find-links", str(index_dir()), "--dest", str(dest), req,
+            ]
+            try:  # already cached, with all its dependencies: no network
+                run_shell([*cmd, "--no-index"], cwd=pathlib.Path(tmp))
+            except RuntimeError:
+                run_shell(cmd, cwd=pathlib.Path(tmp))
+
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(requirements))) as pool:
+            list(pool.map(download, requirements))
+        wheels = {w.name: w for w in pathlib.Path(tmp).glob("*/*.whl")}
+        return [add(w) for w in wheels.values()]
+
+
+def _pip_version(venv_dir: pathlib.Path) -> Tuple[int, ...]:
+    """(major, minor) of the pip in *venv_dir*, from its dist-info folder; () if not found."""
+    for pattern in ("lib/python*/site-packages/pip-*.dist-info", "Lib/site-packages/pip-*.dist-info"):
+        for info in venv_dir.glob(pattern):
+            m = re.match(r"pip-(\d+)\.(\d+)", info.name)
+            if m:
+                return int(m[1]), int(m[2])
+    return ()
+
+
+def install(venv_dir: pathlib.Path, requirements: List[str], fetch: bool = True) -> None:
+    """
+    Install *requirements* into the venv at *venv_dir* from the cache alone.
+    With *fetch*, missing wheels are downloaded into the cache first;
+    otherwise (or if that does not help) raise RuntimeError.
+    """
+    if not requirements:
+        return
+    bindir = venv_dir / ("Scripts" if os.name == "nt" else "bin")
+    python = str(bindir / "python")
+    with tempfile.TemporaryDirectory(prefix="sparkstart-pip-") as tmp:
+        report = pathlib.Path(tmp, "report.json") if _pip_version(venv_dir) >= REPORT_PIP else None
+        cmd = [
+            python, "-m", "pip", "install", *PIP_FLAGS, "--no-index", "--find-links", str(index_dir()),
+            *(["--report", str(report)] if report else []), *requirements,
+        ]
+        try:
+            run_shell(cmd, cwd=venv_dir)
+        except RuntimeError:
+            if not fetch:
+                raise
+            prefill(requirements, python)
+            run_shell(cmd, cwd=venv_dir)
+        if report:
+            _touch_installed(report)
+        else:
+            _touch_listed(python, venv_dir)
+
+
+def _touch_installed(report: pathlib.Path) -> None:
+    """Mark the wheels in pip's install report as used now (see prune)."""
+    try:
+        items = json.loads(report.read_text())["install"]
+    except (OSError, ValueError, KeyError):
+        return
+    for item in items:
+        name = item.get("download_info", {}).get("url", "").rsplit("/", 1)[-1]
+        try:
+            os.utime(index_dir() / name)
+        except OSError:
+            pass
+
+
+def _touch_listed(python: str, venv_dir: pathlib.Path) -> None:
+    """Like _touch_installed, for a pip without --report: match `pip list` against the index."""
+    try:
+        installed = json.loads(run_shell([python, "-m", "pip", "list", "--disable-pip-version-check", "--format=json"], cwd=venv_dir))
+    except (RuntimeError, ValueError):
+        return
+    # wheel filenames start with the escaped name and the version (PEP 427)
+    prefixes = {f"{re.sub(r'[-_.]+', '_', d['name']).lower()}-{d['version']}-" for d in installed}
+    for entry in index_dir().iterdir():
+        if entry.name.lower().startswith(tuple(prefixes)):
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+
+
+def prune(max_age_days: float = 30) -> Tuple[int, int]:
+    """Drop wheels unused for *max_age_days* (0: all of them); return (wheels, bytes) freed."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    kept = set()
+    for entry in index_dir().iterdir():
+        if entry.name.startswith("."):  # being written
+            continue
+        try:
+            st = entry.stat()
+        except OSError:  # dangling symlink
+            entry.unlink()
+            continue
+        if max_age_days <= 0 or st.st_mtime < cutoff:
+            entry.unlink()
+            removed += 1
+        else:
+            kept.add((st.st_dev, st.st_ino))
+
+    freed = 0
+    for obj in objects_dir().iterdir():
+        if obj.name.startswith("."):
+            continue
+        st = obj.stat()
+        if (st.st_dev, st.st_ino) not in kept:
+            obj.unlink()
+            freed += st.st_size
+    return removed, freed
+
+
+def usage() -> Tuple[int, int]:
+    """(wheels, bytes) currently in the cache."""
+    sizes = [obj.stat().st_size for obj in objects_dir().iterdir() if not obj.name.startswith(".")]
+    return sum(1 for e in index_dir().iterdir() if not e.name.startswith(".")), sum(sizes)
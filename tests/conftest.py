@@ -3,6 +3,33 @@ import os
 import shutil
 import pathlib
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache(tmp_path_factory):
+    """
+    Keep sparkstart's on-disk caches (venv seeds, etc.) out of the user's
+    home directory. Shared by the whole session so the seed is built once.
+    """
+    cache = tmp_path_factory.mktemp("sparkstart-cache")
+    original = os.environ.get("SPARKSTART_CACHE_DIR")
+    os.environ["SPARKSTART_CACHE_DIR"] = str(cache)
+    yield cache
+    if original is None:
+        del os.environ["SPARKSTART_CACHE_DIR"]
+    else:
+        os.environ["SPARKSTART_CACHE_DIR"] = original
+
+@pytest.fixture(autouse=True)
+def fresh_toolchain():
+    """
+    Tool lookups are cached (sparkstart.toolchain); tests that patch
+    shutil.which must neither see nor leave behind cached answers.
+    """
+    from sparkstart import toolchain
+
+    toolchain.clear_cache()
+    yield
+    toolchain.clear_cache()
+
 @pytest.fixture
 def tmp_cwd(tmp_path):
     """
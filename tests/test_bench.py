@@ -0,0 +1,47 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from sparkstart.core import plan_project
+from sparkstart.wheelhouse import project_requirements
+
+
+def test_python_bench_adds_pytest_benchmark_out_of_the_default_run():
+    plan = plan_project("app", "python", bench=True)
+    assert "benchmarks/test_bench.py" in plan
+    pyproject = plan["pyproject.toml"].data
+    assert "pytest-benchmark" in project_requirements(pyproject)
+    assert b'testpaths = ["tests"]' in pyproject
+
+
+def test_rust_bench_uses_criterion():
+    plan = plan_project("my-crate", "rust", bench=True)
+    cargo = plan["Cargo.toml"].data.decode()
+    assert cargo.startswith("[package]") and 'criterion = "0.5"' in cargo
+    assert "harness = false" in cargo
+    assert "use my_crate::" in plan["benches/main.rs"].data.decode()
+
+
+def test_cpp_bench_links_google_benchmark_from_conan():
+    with patch("shutil.which", return_value="/usr/bin/fake-tool"):
+        plan = plan_project("engine", "cpp", fast_build=True, bench=True)
+    assert b"\nbenchmark/" in plan["conanfile.txt"].data
+    assert plan["CMakeLists.txt"].data.decode().rstrip().endswith("add_subdirectory(bench)")
+    bench = plan["bench/CMakeLists.txt"].data.decode()
+    assert "benchmark::benchmark_main" in bench and "fast_build_target(benchmarks)" in bench
+
+
+def test_javascript_bench_is_an_npm_script():
+    plan = plan_project("web", "javascript", bench=True)
+    package = json.loads(plan["package.json"].data)
+    assert package["scripts"] == {"start": "node index.js", "bench": "node bench/index.bench.js"}
+    assert "bench/index.bench.js" in plan
+
+
+def test_bench_needs_a_supported_language():
+    from sparkstart.plan import Plan
+    from sparkstart.scaffolders.bench import scaffold_bench
+
+    with pytest.raises(ValueError, match="--bench is not available for go"):
+        scaffold_bench("go", "x", Plan())  # e.g. a plugin language
@@ -0,0 +1,30 @@
+import json
+import pathlib
+import subprocess
+import sys
+
+SCRIPT = pathlib.Path(__file__).parent.parent / "benchmarks" / "run.py"
+
+
+def run(tmp_path, *args):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--repeat", "1", "--only", "phase/scaffold/rust",
+         "--output", str(tmp_path / "results.json"), "--baseline", str(tmp_path / "baseline.json"), *args],
+        capture_output=True, text=True,
+    )
+
+
+def test_benchmarks_fail_on_regression(tmp_path):
+    saved = run(tmp_path, "--save-baseline")
+    assert saved.returncode == 0, saved.stderr
+    results = json.loads((tmp_path / "results.json").read_text())
+    assert list(results["results"]) == ["phase/scaffold/rust"]
+    assert run(tmp_path).returncode == 0
+
+    # pretend the baseline was ten times faster
+    baseline = json.loads((tmp_path / "baseline.json").read_text())
+    baseline["results"]["phase/scaffold/rust"]["median"] /= 10
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+    regressed = run(tmp_path, "--min-delta", "0")
+    assert regressed.returncode == 1
+    assert "phase/scaffold/rust" in regressed.stdout
@@ -1,4 +1,5 @@
 import pytest
+import os
 import subprocess
 import pathlib
 import sys
@@ -70,3 +71,156 @@ def test_delete_project(tmp_cwd):
     result = runner.invoke(app, ["delete", "todelete", "--yes"])
     assert result.exit_code == 0
     assert not (tmp_cwd / "todelete").exists()
+
+def test_batch_manifest(tmp_cwd):
+    (tmp_cwd / "projects.toml").write_text(
+        '[defaults]\n'
+        'lang = "javascript"\n'
+        '\n'
+        '[[project]]\n'
+        'name = "web-a"\n'
+        '\n'
+        '[[project]]\n'
+        'name = "web-b"\n'
+        '\n'
+        '[[project]]\n'
+        'name = "broken"\n'
+        'lang = "cobol"\n'
+    )
+    result = runner.invoke(app, ["batch", "projects.toml", "--jobs", "2"])
+    assert result.exit_code == 1
+    assert "2/3 projects created" in result.output
+    assert "Unknown language" in result.output
+
+    assert (tmp_cwd / "web-a" / "index.js").exists()
+    assert (tmp_cwd / "web-b" / "package.json").exists()
+
+def test_batch_workers_can_be_spawned(tmp_cwd):
+    # as on macOS, Windows and in frozen builds: every worker imports the main module again
+    (tmp_cwd / "projects.toml").write_text('[[project]]\nname = "web-a"\nlang = "javascript"\n\n'
+                                           '[[project]]\nname = "web-b"\nlang = "javascript"\n')
+    # run sparkstart/__main__.py by path, as the PyInstaller and zipapp builds do
+    src_root = str(pathlib.Path(__file__).resolve().parents[1])
+    driver = (
+        "import multiprocessing, runpy, sys\n"
+        "multiprocessing.set_start_method('spawn')\n"
+        "sys.argv = ['sparkstart', 'batch', 'projects.toml', '--jobs', '2']\n"
+        f"runpy.run_path({src_root + '/sparkstart/__main__.py'!r}, run_name='__main__')\n"
+    )
+    result = subprocess.run([sys.executable, "-c", driver], cwd=tmp_cwd, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": src_root}, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("2/2 projects created") == 1
+    assert (tmp_cwd / "web-a" / "index.js").exists() and (tmp_cwd / "web-b" / "index.js").exists()
+
+def test_github_repo_created_while_scaffolding(tmp_cwd, monkeypatch):
+    import threading
+    import sparkstart.utils.github as gh
+
+    remote = tmp_cwd / "remote.git"
+    subprocess.run(["git", "init", "--bare", "-q", str(remote)], check=True)
+    calls = []
+
+    def fake_create(name, token, auto_init=False):
+        calls.append((name, token, threading.current_thread() is threading.main_thread()))
+        return str(remote)
+
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+    monkeypatch.setattr(gh, "create_github_repo", fake_create)
+    result = runner.invoke(app, ["new", "ghproj", "--lang", "rust", "--github"])
+    assert result.exit_code == 0, result.output
+
+    assert calls == [("ghproj", "tok", False)]
+    pushed = subprocess.run(["git", "log", "--format=%s", "main"], cwd=remote, capture_output=True, text=True)
+    assert pushed.stdout.strip() == "Initial commit"
+
+
+def test_github_repo_discarded_when_local_setup_fails(tmp_cwd, monkeypatch):
+    import sparkstart.utils.github as gh
+
+    deleted = []
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+    monkeypatch.setattr(gh, "create_github_repo", lambda name, token, auto_init=False: "https://github.com/me/x.git")
+    monkeypatch.setattr(gh, "get_github_user", lambda token: "me")
+    monkeypatch.setattr(gh, "delete_github_repo", lambda owner, name, token: deleted.append((owner, name)))
+
+    def broken_scaffold(name, template=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("sparkstart.scaffolders.rust.scaffold_rust", broken_scaffold)
+    result = runner.invoke(app, ["new", "badproj", "--lang", "rust", "--github"])
+    assert result.exit_code != 0
+    assert deleted == [("me", "badproj")]
+
+def test_new_dry_run_writes_nothing(tmp_cwd):
+    result = runner.invoke(app, ["new", "planned", "--lang", "javascript", "--dry-run"])
+    assert result.exit_code == 0
+    assert "package.json" in result.output
+    assert "index.js" in result.output
+    assert list(tmp_cwd.iterdir()) == []
+
+
+def test_failed_new_leaves_nothing_behind(tmp_cwd, monkeypatch):
+    def broken_commit(*args, **kwargs):
+        raise RuntimeError("git exploded")
+
+    monkeypatch.setattr("sparkstart.core.init_and_commit", broken_commit)
+    result = runner.invoke(app, ["new", "halfway", "--lang", "python"])
+    assert result.exit_code != 0
+    assert list(tmp_cwd.iterdir()) == []
+
+def test_bulk_delete_with_glob(tmp_cwd, monkeypatch):
+    import threading
+    import sparkstart.utils.github as gh
+
+    calls = []
+    lock = threading.Lock()
+
+    class FakeResponse:
+        status_code = 200
+        text = ""
+        headers = {}
+
+        def json(self):
+            return {"login": "me"}
+
+    class FakeSession:
+        def get(self, url, **kwargs):
+            with lock:
+                calls.append(("GET", url))
+            return FakeResponse()
+
+        def delete(self, url, **kwargs):
+            with lock:
+                calls.append(("DELETE", url))
+            return FakeResponse()
+
+    for name in ["workshop-1", "workshop-2", "workshop-3", "keep"]:
+        (tmp_cwd / name).mkdir()
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+    monkeypatch.setattr(gh, "_logins", {})
+    monkeypatch.setattr(gh, "get_session", lambda: FakeSession())
+
+    result = runner.invoke(app, ["delete", "workshop-*", "--github", "--yes", "-j", "3"])
+    assert result.exit_code == 0, result.output
+    assert "3/3 projects deleted" in result.output
+
+    assert sorted(tmp_cwd.iterdir()) == [tmp_cwd / "keep"]
+    assert [c for c in calls if c[0] == "GET"] == [("GET", f"{gh.API_URL}/user")]
+    assert sorted(url for method, url in calls if method == "DELETE") == [
+        f"{gh.API_URL}/repos/me/workshop-{i}" for i in (1, 2, 3)
+    ]
+    assert "no project matches" in runner.invoke(app, ["delete", "nope-*", "--yes"]).output
+
+
+def test_bulk_delete_glob_skips_symlinks(tmp_cwd):
+    (tmp_cwd / "elsewhere").mkdir()
+    (tmp_cwd / "elsewhere" / "keep.txt").write_text("keep")
+    (tmp_cwd / "workshop-1").mkdir()
+    (tmp_cwd / "workshop-2").symlink_to(tmp_cwd / "elsewhere", target_is_directory=True)
+
+    result = runner.invoke(app, ["delete", "workshop-*", "--yes"])
+    assert result.exit_code == 0, result.output
+    assert not (tmp_cwd / "workshop-1").exists()
+    assert (tmp_cwd / "workshop-2").is_symlink()
+    assert (tmp_cwd / "elsewhere" / "keep.txt").read_text() == "keep"
@@ -0,0 +1,51 @@
+import os
+import stat
+
+import pytest
+
+from sparkstart import conan_cache
+
+
+@pytest.fixture
+def fake_conan(tmp_path, monkeypatch):
+    """A `conan` on $PATH that logs its arguments and detects a gnu17 profile."""
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    log = tmp_path / "conan.log"
+    script = bindir / "conan"
+    script.write_text(
+        "#!/bin/sh\n"
+        f'echo "$CONAN_HOME $*" >> {log}\n'
+        'if [ "$1" = profile ]; then\n'
+        '  mkdir -p "$CONAN_HOME/profiles"\n'
+        '  printf "[settings]\\narch=x86_64\\nbuild_type=Debug\\ncompiler=gcc\\ncompiler.cppstd=gnu17\\n" > "$CONAN_HOME/profiles/$4"\n'
+        "fi\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("SPARKSTART_CACHE_DIR", str(tmp_path / "cache"))
+    return log
+
+
+def test_pin_settings_replaces_and_adds():
+    profile = "[settings]\ncompiler.cppstd=gnu17\n\n[conf]\ntools.build:jobs=4\n"
+    pinned = conan_cache.pin_settings(profile, **{"compiler.cppstd": "17", "build_type": "Release"})
+    assert pinned == "[settings]\ncompiler.cppstd=17\nbuild_type=Release\n\n[conf]\ntools.build:jobs=4\n"
+
+
+def test_template_requires_gtest():
+    assert conan_cache.template_requires() == ["gtest/1.14.0"]
+
+
+def test_prebuild_uses_the_shared_home_and_pinned_profile(fake_conan):
+    assert conan_cache.prebuild() == ["gtest/1.14.0"]
+    conan_cache.prebuild()
+
+    profile = conan_cache.profile_path().read_text()
+    assert "compiler.cppstd=17\n" in profile and "build_type=Release\n" in profile
+
+    calls = fake_conan.read_text().splitlines()
+    home = str(conan_cache.conan_home())
+    assert all(call.startswith(home + " ") for call in calls)
+    assert sum(" profile detect " in call for call in calls) == 1  # detected once
+    assert calls[-1].endswith("install --build=missing -pr:h sparkstart -pr:b sparkstart --requires gtest/1.14.0")
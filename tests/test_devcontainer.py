@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from sparkstart.cli import app
+from sparkstart.plan import Plan
+from sparkstart.scaffolders.devcontainer import DEVCONTAINER_LANGS, scaffold_devcontainer, validate_devcontainer
+
+
+@pytest.mark.parametrize("lang", DEVCONTAINER_LANGS)
+def test_every_language_gets_a_valid_cached_devcontainer(lang):
+    plan = scaffold_devcontainer(lang)
+    assert validate_devcontainer(plan) == []
+    config = json.loads(plan[".devcontainer/devcontainer.json"].data)
+    assert config["build"]["dockerfile"] == "Dockerfile"
+    assert all(m.startswith("source=sparkstart-") and "type=volume" in m for m in config["mounts"])
+
+
+def test_python_dependencies_get_their_own_image_layer():
+    plan = scaffold_devcontainer("python")
+    assert json.loads(plan[".devcontainer/devcontainer.json"].data)["build"]["context"] == ".."
+    dockerfile = plan[".devcontainer/Dockerfile"].data.decode()
+    assert "COPY pyproject.toml requirements.txt" in dockerfile
+    assert "--mount=type=cache,target=/root/.cache/pip" in dockerfile
+    # only the files that layer reads are sent to Docker
+    ignored = plan[".devcontainer/Dockerfile.dockerignore"].data.decode().split()
+    assert "*" in ignored and "!pyproject.toml" in ignored and "!requirements.txt" in ignored
+
+
+def test_validation_flags_uncached_setup():
+    plan = Plan()
+    plan.add(".devcontainer/devcontainer.json", json.dumps({
+        "build": {"dockerfile": "Dockerfile"},
+        "mounts": ["source=pip,target=/home/vscode/.cache/pip,type=volume", "target=relative"],
+        "postCreateCommand": "sudo apt-get update && sudo apt-get install -y neovim",
+    }))
+    plan.add(".devcontainer/Dockerfile", "RUN --mount=type=cache,target=/x true\nFROM debian\n")
+    problems = "\n".join(validate_devcontainer(plan))
+    for expected in ("must start with FROM", "syntax=docker/dockerfile:1", "not created in the Dockerfile",
+                     "needs a source and an absolute target", "installs system packages"):
+        assert expected in problems
+
+
+def test_check_devcontainer_command(tmp_path):
+    for spec in scaffold_devcontainer("rust"):
+        (tmp_path / spec.path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / spec.path).write_bytes(spec.data)
+    runner = CliRunner()
+    assert runner.invoke(app, ["check-devcontainer", str(tmp_path)]).exit_code == 0
+
+    (tmp_path / ".devcontainer" / "Dockerfile").unlink()
+    result = runner.invoke(app, ["check-devcontainer", str(tmp_path)])
+    assert result.exit_code == 1 and "does not exist" in result.output
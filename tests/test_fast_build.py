@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+import pytest
+
+from sparkstart.core import plan_project
+
+
+def fast_cpp_plan():
+    with patch("shutil.which", return_value="/usr/bin/fake-tool"):
+        return plan_project("engine", "cpp", fast_build=True)
+
+
+def test_fast_build_hooks_into_the_cpp_scaffold():
+    plan = fast_cpp_plan()
+    cmake = plan["CMakeLists.txt"].data.decode()
+    assert "include(cmake/FastBuild.cmake)" in cmake
+    # the launcher and unity settings must be in place before the targets exist
+    assert cmake.index("include(cmake/FastBuild.cmake)") < cmake.index("add_executable(")
+    assert "fast_build_target(${PROJECT_NAME})" in cmake
+    assert "fast_build_target(unit_tests)" in plan["tests/CMakeLists.txt"].data.decode()
+    assert "cmake/FastBuild.cmake" in plan and "src/pch.hpp" in plan
+
+    build = plan["build.sh"]
+    assert build.mode == 0o755
+    assert b"-G Ninja" in build.data and b'--parallel "$JOBS"' in build.data
+
+
+def test_fast_rust_tunes_profiles_and_writes_a_local_cargo_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPARKSTART_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("RUSTC_WRAPPER", raising=False)
+    monkeypatch.delenv("CARGO_TARGET_DIR", raising=False)
+    with patch("shutil.which", return_value="/usr/bin/sccache"):
+        plan = plan_project("crate", "rust", fast_build=True)
+
+    cargo = plan["Cargo.toml"].data.decode()
+    assert cargo.startswith("[package]") and '[profile.dev.package."*"]' in cargo
+    assert 'panic = "abort"' in cargo
+    config = plan[".cargo/config.toml"].data.decode()
+    assert 'rustc-wrapper = "/usr/bin/sccache"' in config
+    assert f'target-dir = "{tmp_path / "cargo-target"}"' in config
+    # machine-local paths stay out of the repository
+    assert ".cargo/config.toml" in plan[".gitignore"].data.decode().splitlines()
+
+
+def test_fast_rust_leaves_cargo_env_overrides_alone(monkeypatch):
+    monkeypatch.setenv("RUSTC_WRAPPER", "sccache")
+    monkeypatch.setenv("CARGO_TARGET_DIR", "/elsewhere")
+    plan = plan_project("crate", "rust", fast_build=True)
+    assert ".cargo/config.toml" not in plan
+    assert b".cargo" not in plan[".gitignore"].data
+
+
+def test_plain_scaffold_is_unchanged():
+    with patch("shutil.which", return_value="/usr/bin/fake-tool"):
+        plan = plan_project("engine", "cpp")
+    assert "cmake/FastBuild.cmake" not in plan
+    assert b"FastBuild" not in plan["CMakeLists.txt"].data
+
+
+def test_fast_build_needs_a_supported_language():
+    with pytest.raises(ValueError, match="not available for javascript"):
+        plan_project("web", "javascript", fast_build=True)
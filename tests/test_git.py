@@ -0,0 +1,71 @@
+import shutil
+import subprocess
+
+from sparkstart.utils.git import GitFile, MODE_FILE, init_and_commit
+
+
+def git(path, *args):
+    return subprocess.run(["git", *args], cwd=path, capture_output=True, text=True, check=True).stdout
+
+
+def make_tree(root):
+    root.mkdir()
+    (root / ".gitignore").write_text("__pycache__/\n.venv/\n*.pyc\n/build\n.projinit.env\n")
+    (root / ".projinit.env").write_text("GITHUB_TOKEN=secret\n")
+    (root / "README.md").write_text("# demo\n")
+    (root / "src").mkdir()
+    (root / "src" / "__init__.py").touch()
+    (root / "src" / "main.py").write_text("print('hi')\n")
+    (root / "src" / "main.pyc").write_bytes(b"\0")
+    (root / "build").mkdir()
+    (root / "build" / "out.o").write_bytes(b"\x7fELF")
+    (root / ".venv" / "lib").mkdir(parents=True)
+    (root / ".venv" / "lib" / "site.py").write_text("x = 1\n")
+    (root / "docs").mkdir()
+    (root / "docs" / ".gitignore").write_text("*.tmp\n!keep.tmp\n")
+    (root / "docs" / "a.tmp").write_text("scratch\n")
+    (root / "docs" / "keep.tmp").write_text("kept\n")
+    (root / "docs" / "my file.md").write_text("spaces\n")
+    (root / "run.sh").write_text("#!/bin/sh\necho hi\n")
+    (root / "run.sh").chmod(0o755)
+    (root / "link").symlink_to("README.md")
+
+
+def test_fast_import_commit_matches_git_add(tmp_path, monkeypatch):
+    monkeypatch.setenv("GIT_AUTHOR_DATE", "1700000000 +0100")
+    monkeypatch.setenv("GIT_COMMITTER_DATE", "1700000000 +0100")
+
+    ours = tmp_path / "ours"
+    make_tree(ours)
+    theirs = tmp_path / "theirs"
+    shutil.copytree(ours, theirs, symlinks=True)
+
+    commit = init_and_commit(ours, "Initial commit")
+
+    git(theirs, "init", "-b", "main")
+    git(theirs, "add", ".")
+    git(theirs, "commit", "-m", "Initial commit")
+
+    assert git(ours, "rev-parse", "HEAD") == git(theirs, "rev-parse", "HEAD")
+    assert commit.sha == git(ours, "rev-parse", "HEAD").strip()
+    assert git(ours, "ls-files", "-s") == git(theirs, "ls-files", "-s")
+    assert git(ours, "status", "--porcelain") == ""
+    assert "docs/a.tmp" not in git(ours, "ls-files")
+
+
+def test_nested_gitignores_apply_parents_first(tmp_path):
+    root = tmp_path / "proj"
+    texts = {
+        "logs/deep/.gitignore": "!keep.log\n",  # listed before its parent on purpose
+        "logs/.gitignore": "*.log\n",
+        "logs/deep/keep.log": "kept\n",
+        "logs/deep/drop.log": "dropped\n",
+        "logs/top.log": "dropped\n",
+    }
+    for path, text in texts.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(text)
+
+    commit = init_and_commit(root, files=[GitFile(p, t.encode(), MODE_FILE) for p, t in texts.items()])
+    assert sorted(f.path for f in commit.files) == ["logs/.gitignore", "logs/deep/.gitignore", "logs/deep/keep.log"]
+    assert git(root, "status", "--porcelain") == ""  # git agrees on what is ignored
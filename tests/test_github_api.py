@@ -0,0 +1,304 @@
+import base64
+import json
+import os
+import re
+import subprocess
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from typer.testing import CliRunner
+
+from sparkstart.cli import app
+
+runner = CliRunner()
+
+
+def git(cwd, *args, input=None, env=None):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, input=input, env={**os.environ, **(env or {})},
+        capture_output=True, check=True,
+    ).stdout.decode().strip()
+
+
+class StubGitHub:
+    """Just enough of the GitHub REST API to create a repo and push via the Git Data API,
+    backed by real bare repositories so that every SHA is the one git would compute."""
+
+    def __init__(self, root):
+        self.root = root
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def repo(self, name):
+        return self.root / f"{name}.git"
+
+    def handle(self, method, path, body):
+        with self.lock:
+            self.requests.append((method, path))
+        if (method, path) == ("POST", "/user/repos"):
+            repo = self.repo(body["name"])
+            git(self.root, "init", "-q", "--bare", "-b", "main", str(repo))
+            if body.get("auto_init"):
+                blob = git(repo, "hash-object", "-w", "--stdin", input=b"# auto\n")
+                tree = git(repo, "mktree", input=f"100644 blob {blob}\tREADME.md\n".encode())
+                git(repo, "update-ref", "refs/heads/main", git(repo, "commit-tree", tree, "-m", "Initial commit"))
+            return 201, {"clone_url": f"{self.url}/me/{body['name']}.git"}
+
+        m = re.fullmatch(r"/repos/me/([^/]+)/git/(blobs|trees|commits|refs/heads/main)", path)
+        if not m:
+            return 404, {"message": "Not Found"}
+        repo, kind = self.repo(m.group(1)), m.group(2)
+        if kind == "blobs":
+            data = base64.b64decode(body["content"])
+            return 201, {"sha": git(repo, "hash-object", "-w", "--stdin", input=data)}
+        if kind == "trees":
+            env = {"GIT_INDEX_FILE": str(repo / "stub-index")}
+            for entry in body["tree"]:
+                git(repo, "update-index", "--add", "--cacheinfo", f"{entry['mode']},{entry['sha']},{entry['path']}", env=env)
+            sha = git(repo, "write-tree", env=env)
+            os.unlink(repo / "stub-index")
+            return 201, {"sha": sha}
+        if kind == "commits":
+            env = {}
+            for role in ("author", "committer"):
+                who = body[role]
+                env[f"GIT_{role.upper()}_NAME"] = who["name"]
+                env[f"GIT_{role.upper()}_EMAIL"] = who["email"]
+                env[f"GIT_{role.upper()}_DATE"] = who["date"]
+            sha = git(repo, "commit-tree", body["tree"], input=body["message"].encode(), env=env)
+            return 201, {"sha": sha}
+        git(repo, "update-ref", "refs/heads/main", body["sha"])  # PATCH refs/heads/main, force
+        return 200, {"object": {"sha": body["sha"]}}
+
+
+@pytest.fixture
+def stub_github(tmp_path, monkeypatch):
+    import sparkstart.utils.github as gh
+
+    stub = StubGitHub(tmp_path / "server")
+    stub.root.mkdir()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            status, payload = stub.handle(self.command, self.path, body)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    stub.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(gh, "API_URL", stub.url)
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+def test_new_github_pushes_through_data_api(tmp_cwd, stub_github):
+    result = runner.invoke(app, ["new", "apiproj", "--lang", "javascript", "--github"])
+    assert result.exit_code == 0, result.output
+
+    project = tmp_cwd / "apiproj"
+    local_head = git(project, "rev-parse", "HEAD")
+    # the auto_init commit was replaced by ours, byte for byte
+    assert git(stub_github.repo("apiproj"), "rev-parse", "main") == local_head
+    assert git(stub_github.repo("apiproj"), "rev-list", "--count", "main") == "1"
+
+    # tracked like `git push -u`, without the token in .git/config
+    assert git(project, "status", "-sb").splitlines()[0] == "## main...origin/main"
+    assert "tok" not in (project / ".git" / "config").read_text()
+
+    files = git(project, "ls-files").splitlines()
+    blob_posts = [p for m, p in stub_github.requests if p.endswith("/git/blobs")]
+    assert 0 < len(blob_posts) <= len(files)
+
+
+def test_new_github_falls_back_to_git_push(tmp_cwd, stub_github, monkeypatch):
+    import sparkstart.core as core
+    import sparkstart.utils.github as gh
+
+    def failing_push(url, commit, token):
+        raise RuntimeError("GitHub API error 422: Reference update failed")
+
+    pushed = []
+
+    def run_shell(cmd, cwd, **kwargs):
+        if cmd[:2] == ["git", "push"]:  # the stub speaks no smart HTTP: push to its bare repo
+            pushed.append(cmd[3])
+            cmd = [*cmd[:3], str(stub_github.repo("fallback")), *cmd[4:]]
+        return real_run_shell(cmd, cwd, **kwargs)
+
+    real_run_shell = core.run_shell
+    monkeypatch.setattr(gh, "push_commit", failing_push)
+    monkeypatch.setattr(core, "run_shell", run_shell)
+    result = runner.invoke(app, ["new", "fallback", "--lang", "javascript", "--github"])
+    assert result.exit_code == 0, result.output
+    assert "pushing with git instead" in result.output
+    assert pushed == [f"{stub_github.url}/me/fallback.git"]
+    assert git(stub_github.repo("fallback"), "rev-parse", "main") == git(tmp_cwd / "fallback", "rev-parse", "HEAD")
+
+
+def test_signature_keeps_the_timezone():
+    from sparkstart.utils.github import _signature
+
+    sig = _signature("Ada Lovelace <ada@example.com> 1700000000 -0130")
+    assert sig["name"] == "Ada Lovelace" and sig["email"] == "ada@example.com"
+    assert datetime.fromisoformat(sig["date"]).timestamp() == 1700000000
+    assert sig["date"].endswith("-01:30")
+
+
+def response(status, body=None, **headers):
+    import requests
+
+    r = requests.Response()
+    r.status_code = status
+    r._content = json.dumps(body or {}).encode()
+    r.headers.update(headers)
+    return r
+
+
+class ScriptedSession:
+    """Answers each call with the next scripted response (an exception is raised)."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    def _send(self, method, url, headers=None, **kwargs):
+        self.calls.append((method, url, dict(headers or {})))
+        nxt = self.script.pop(0)
+        if isinstance(nxt, Exception):
+            raise nxt
+        return nxt
+
+    def get(self, url, **kwargs):
+        return self._send("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._send("POST", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._send("DELETE", url, **kwargs)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import sparkstart.utils.github as gh
+
+    sleeps = []
+    monkeypatch.setattr(gh, "_sleep", sleeps.append)
+    monkeypatch.setattr(gh, "_rate", {"remaining": None, "reset": 0.0})
+    monkeypatch.setattr(gh, "_logins", {})
+
+    def script(*responses):
+        session = ScriptedSession(*responses)
+        monkeypatch.setattr(gh, "get_session", lambda: session)
+        return session
+
+    return gh, script, sleeps
+
+
+def test_transient_errors_are_retried(client):
+    import requests
+
+    gh, script, sleeps = client
+    session = script(
+        requests.ConnectionError("reset by peer"),
+        response(502),
+        response(403, {"message": "You have exceeded a secondary rate limit"}, **{"Retry-After": "3"}),
+        response(204),
+    )
+    gh.delete_github_repo("me", "repo", "tok")
+
+    assert len(session.calls) == 4
+    assert sleeps[2] == 3.0
+    assert all(0 <= s <= gh.BACKOFF_BASE * 2 ** i for i, s in enumerate(sleeps[:2]))
+
+
+def test_repo_creation_is_not_repeated_after_a_server_error(client):
+    gh, script, sleeps = client
+    session = script(response(502), response(201, {"clone_url": "x"}))
+
+    with pytest.raises(RuntimeError, match="502"):
+        gh.create_github_repo("repo", "tok")
+    assert len(session.calls) == 1 and sleeps == []
+
+
+def test_throttles_before_running_out(client):
+    import time
+
+    gh, script, sleeps = client
+    reset = time.time() + 20
+    script(
+        response(204, **{"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": str(reset)}),
+        response(204),
+    )
+    gh.delete_github_repo("me", "a", "tok")
+    gh.delete_github_repo("me", "b", "tok")
+
+    # four requests left for twenty seconds: about five seconds apart
+    assert sleeps and 4 < sleeps[0] <= 5
+
+
+def test_user_lookup_revalidates_with_etag(client):
+    gh, script, sleeps = client
+    session = script(
+        response(200, {"login": "me"}, ETag='"v1"'),
+        response(304),
+    )
+    assert gh.get_github_user("tok") == "me"
+    gh._logins.clear()  # as in a new process
+    assert gh.get_github_user("tok") == "me"
+
+    assert "If-None-Match" not in session.calls[0][2]
+    assert session.calls[1][2]["If-None-Match"] == '"v1"'
+
+
+def test_retry_after_may_be_an_http_date(client):
+    from email.utils import format_datetime
+    from datetime import timedelta, timezone
+
+    gh, script, sleeps = client
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    script(response(429, **{"Retry-After": later}), response(204))
+    gh.delete_github_repo("me", "repo", "tok")
+    assert 25 < sleeps[0] <= 30
+
+
+def test_user_lookups_do_not_wait_for_other_tokens(client, monkeypatch):
+    gh, script, sleeps = client
+    monkeypatch.setattr(gh, "_logins_pending", {})
+    release, calls = threading.Event(), []
+
+    def get_json(url, token):
+        calls.append(token)
+        if token == "slow":
+            release.wait(10)
+        return {"login": f"user-{token}"}
+
+    monkeypatch.setattr(gh, "get_json", get_json)
+    results = []
+    slow = [threading.Thread(target=lambda: results.append(gh.get_github_user("slow"))) for _ in range(2)]
+    for t in slow:
+        t.start()
+    while "slow" not in calls:
+        release.wait(0.01)
+
+    assert gh.get_github_user("fast") == "user-fast"  # not stuck behind "slow"
+    release.set()
+    for t in slow:
+        t.join()
+    assert results == ["user-slow", "user-slow"] and calls.count("slow") == 1
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from sparkstart.pipeline import CANCELLED, DONE, FAILED, Pipeline, Step
+
+
+def test_independent_steps_overlap():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(ctx):
+        barrier.wait()  # deadlocks (and times out) unless both run at once
+
+    pipeline = Pipeline([
+        Step("a", meet, outputs=("a",)),
+        Step("b", meet, outputs=("b",)),
+        Step("join", lambda ctx: {"total": 2}, inputs=("a", "b"), outputs=("total",)),
+    ])
+    assert pipeline.run()["total"] == 2
+    assert set(pipeline.status.values()) == {DONE}
+
+
+def test_failure_cancels_only_downstream_steps():
+    ran = []
+
+    def boom(ctx):
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline([
+        Step("broken", boom, outputs=("x",)),
+        Step("child", lambda ctx: ran.append("child"), inputs=("x",), outputs=("y",)),
+        Step("grandchild", lambda ctx: ran.append("grandchild"), inputs=("y",)),
+        Step("other", lambda ctx: ran.append("other"), outputs=("z",)),
+    ])
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline.run()
+
+    assert ran == ["other"]
+    assert pipeline.status == {
+        "broken": FAILED, "child": CANCELLED, "grandchild": CANCELLED, "other": DONE,
+    }
+
+
+def test_graph_errors_are_reported_before_running():
+    with pytest.raises(ValueError, match="nothing provides"):
+        Pipeline([Step("a", lambda ctx: None, inputs=("missing",))]).run()
+
+    cyclic = Pipeline([
+        Step("a", lambda ctx: None, inputs=("b",), outputs=("a",)),
+        Step("b", lambda ctx: None, inputs=("a",), outputs=("b",)),
+    ])
+    with pytest.raises(ValueError, match="cycle"):
+        cyclic.run()
@@ -0,0 +1,84 @@
+import os
+import textwrap
+
+import pytest
+
+from sparkstart import registry
+from sparkstart.core import plan_project
+
+
+PLUGIN = '''
+from sparkstart.plan import Plan
+
+def scaffold_go(name, template=None):
+    plan = Plan()
+    plan.add("main.go", f"package main // {name}\\n")
+    return plan
+
+def fastapi(name, plan):
+    plan.add("src/app.py", "from fastapi import FastAPI\\n")
+'''
+
+
+@pytest.fixture
+def plugin_site(tmp_path, monkeypatch):
+    """A sys.path entry holding one installed distribution with sparkstart entry points."""
+    site = tmp_path / "site"
+    dist = site / "acme_plugin-1.0.dist-info"
+    dist.mkdir(parents=True)
+    (dist / "METADATA").write_text("Metadata-Version: 2.1\nName: acme-plugin\nVersion: 1.0\n")
+    (dist / "entry_points.txt").write_text(textwrap.dedent("""\
+        [sparkstart.languages]
+        go = acme_plugin:scaffold_go
+        python = acme_plugin:scaffold_go
+
+        [sparkstart.templates]
+        python@fastapi = acme_plugin:fastapi
+    """))
+    (site / "acme_plugin.py").write_text(PLUGIN)
+
+    monkeypatch.syspath_prepend(str(site))
+    monkeypatch.setenv("SPARKSTART_CACHE_DIR", str(tmp_path / "cache"))
+    registry.reset()
+    yield dist
+    registry.reset()
+
+
+def test_plugin_language_and_template(plugin_site):
+    assert registry.languages()[-1] == "go"
+    assert registry.templates("python") == ["pygame", "fastapi"]
+
+    assert "main.go" in plan_project("demo", lang="go")
+    # built-ins win over a plugin registering the same language
+    assert "src/main.py" in plan_project("demo", lang="python")
+
+    plan = plan_project("demo", lang="python", template="fastapi")
+    assert "src/app.py" in plan and "src/main.py" in plan
+
+
+def test_unknown_language_or_template(plugin_site):
+    with pytest.raises(ValueError, match="Choose: python, rust, javascript, cpp, go"):
+        plan_project("demo", lang="cobol")
+    with pytest.raises(ValueError, match="Choose: pygame, fastapi"):
+        plan_project("demo", lang="python", template="django")
+
+
+def test_index_cached_until_metadata_changes(plugin_site, monkeypatch):
+    scans = []
+    real_scan = registry._scan_entry_points
+    monkeypatch.setattr(registry, "_scan_entry_points", lambda: scans.append(1) or real_scan())
+
+    assert "go" in registry.plugin_index()[registry.LANGUAGE_GROUP]
+    assert len(scans) == 1
+
+    # a fresh process with nothing installed since: served from plugins.json
+    registry.reset()
+    assert "go" in registry.plugin_index()[registry.LANGUAGE_GROUP]
+    assert len(scans) == 1
+
+    # upgrading the distribution changes its metadata mtime
+    st = plugin_site.stat()
+    os.utime(plugin_site, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    registry.reset()
+    assert "go" in registry.plugin_index()[registry.LANGUAGE_GROUP]
+    assert len(scans) == 2
@@ -0,0 +1,143 @@
+import http.client
+import json
+import socket
+import subprocess
+import threading
+
+import pytest
+
+from sparkstart.server import TOKEN_HEADER, Service, VenvPool, make_server
+
+
+class UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def request(conn, method, path, body=None, headers=None):
+    headers = {"Content-Type": "application/json", TOKEN_HEADER: getattr(conn, "token", ""), **(headers or {})}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    r = conn.getresponse()
+    return r.status, json.loads(r.read()), r
+
+
+@pytest.fixture
+def start_server(tmp_path):
+    running = []
+
+    def start(socket_path=None, **options):
+        service = Service(tmp_path / "projects", **options)
+        service.start()
+        server = make_server(service, socket_path, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        running.append((server, service))
+        if socket_path:
+            return service, UnixConnection(str(socket_path))
+        conn = http.client.HTTPConnection(*server.server_address[:2])
+        conn.token = server.token
+        return service, conn
+
+    yield start
+    for server, service in running:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_create_status_delete(start_server):
+    service, conn = start_server(pool_size=1)
+
+    status, body, _ = request(conn, "POST", "/projects", {"name": "web", "lang": "javascript"})
+    assert status == 201, body
+    assert (service.root / "web" / "package.json").exists()
+
+    status, body, _ = request(conn, "POST", "/projects", {"name": "web"})
+    assert status == 409
+    status, body, _ = request(conn, "POST", "/projects", {"name": "../escape"})
+    assert status == 400
+    status, body, _ = request(conn, "POST", "/projects", {"name": "x", "lang": "cobol"})
+    assert status == 400 and "cobol" in body["error"]
+
+    status, body, _ = request(conn, "GET", "/status")
+    assert status == 200
+    assert body["projects"]["created"] == 1 and body["workers"]["busy"] == 0
+
+    status, body, _ = request(conn, "DELETE", "/projects/web")
+    assert status == 200
+    assert not (service.root / "web").exists()
+    status, body, _ = request(conn, "DELETE", "/projects/web")
+    assert status == 404
+
+
+def test_python_project_takes_a_pooled_venv(tmp_path, start_server):
+    service, conn = start_server(tmp_path / "serve.sock", pool_size=1)
+    pool = service.pool
+    while pool.stats()["ready"] < 1:
+        pool._wanted.wait(0.05)
+
+    status, body, _ = request(conn, "POST", "/projects", {"name": "py"})
+    assert status == 201, body
+    assert pool.stats()["hits"] == 1
+
+    venv = service.root / "py" / ".venv"
+    cfg = (venv / "pyvenv.cfg").read_text()
+    assert str(service.root / ".sparkstart-pool") not in cfg
+    for script in (venv / "bin").iterdir():
+        if script.is_file() and not script.is_symlink():
+            assert b".sparkstart-pool" not in script.read_bytes(), script
+    out = subprocess.run([str(venv / "bin" / "python"), "-c", "import sys, pip; print(sys.prefix)"],
+                         capture_output=True, text=True, check=True).stdout.strip()
+    assert out == str(venv)
+
+
+def test_full_queue_is_rejected(start_server, monkeypatch):
+    service, conn = start_server(workers=1, queue_size=0, pool_size=0)
+    release = threading.Event()
+    monkeypatch.setattr(service, "_create", lambda spec, path: release.wait(10))
+
+    other = http.client.HTTPConnection(conn.host, conn.port)
+    other.token = conn.token
+    first = threading.Thread(target=request, args=(other, "POST", "/projects", {"name": "a"}))
+    first.start()
+    while service.status()["workers"]["busy"] == 0:
+        release.wait(0.01)
+
+    status, body, r = request(conn, "POST", "/projects", {"name": "b"})
+    assert status == 503 and r.getheader("Retry-After")
+    release.set()
+    first.join()
+    assert service.status()["projects"]["rejected"] == 1
+
+
+def test_tcp_requests_must_come_from_a_local_client(start_server):
+    service, conn = start_server(pool_size=0)
+    project = {"name": "web", "lang": "javascript", "github": True}
+
+    # what a web page can send without a CORS preflight
+    status, body, _ = request(conn, "POST", "/projects", project, {"Content-Type": "text/plain", TOKEN_HEADER: ""})
+    assert status == 403
+    for headers in ({TOKEN_HEADER: "guess"}, {"Origin": "https://evil.example"}, {"Host": "evil.example"}):
+        status, body, _ = request(conn, "POST", "/projects", project, headers)
+        assert status == 403, headers
+    status, body, _ = request(conn, "POST", "/projects", project, {"Content-Type": "text/plain"})
+    assert status == 415
+    assert not (service.root / "web").exists()
+
+
+def test_unix_socket_is_private_from_the_start(tmp_path, start_server):
+    socket_path = tmp_path / "serve.sock"
+    service, conn = start_server(socket_path, pool_size=0)
+    assert socket_path.stat().st_mode & 0o077 == 0
+    status, body, _ = request(conn, "GET", "/status")
+    assert status == 200
+
+
+def test_pool_falls_back_when_empty(tmp_path):
+    pool = VenvPool(tmp_path / "pool", 0)
+    assert pool.take(tmp_path / "venv") is False
+    assert pool.stats() == {"size": 0, "ready": 0, "hits": 0, "misses": 1}
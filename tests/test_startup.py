@@ -0,0 +1,78 @@
+"""
+Startup budget: `sparkstart --help` and `sparkstart new --lang rust` must only
+import what they use. Measured with `python -X importtime`, counting only
+modules the bare interpreter does not already load at startup.
+
+Scale the budgets on slow machines with SPARKSTART_IMPORT_BUDGET_SCALE=2.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import sparkstart
+
+HELP_BUDGET_MS = 120
+NEW_RUST_BUDGET_MS = 150
+
+SCALE = float(os.getenv("SPARKSTART_IMPORT_BUDGET_SCALE", "1"))
+SRC_ROOT = os.path.dirname(os.path.dirname(sparkstart.__file__))
+LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+
+def importtime(args, cwd=None, code="from sparkstart.cli import app; app()"):
+    """Return ({module: self-time in ms}, exit code) for one interpreter run."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC_ROOT, os.getenv("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True, text=True, cwd=cwd, env=env,
+    )
+    modules = {m[2]: int(m[1]) / 1000 for m in map(LINE.match, result.stderr.splitlines()) if m}
+    return modules, result.returncode
+
+
+@pytest.fixture(scope="module")
+def interpreter_baseline():
+    modules, _ = importtime([], code="pass")
+    return set(modules)
+
+
+def import_cost(modules, baseline):
+    return sum(ms for name, ms in modules.items() if name not in baseline)
+
+
+def test_help_startup_budget(interpreter_baseline):
+    modules, code = importtime(["--help"])
+    assert code == 0
+
+    for heavy in [
+        "requests", "dotenv", "venv", "webbrowser", "mmap",
+        "sparkstart.core", "sparkstart.registry", "sparkstart.server", "sparkstart.sync",
+    ]:
+        assert heavy not in modules, f"--help imported {heavy}"
+    assert not [m for m in modules if m.startswith(("sparkstart.scaffolders", "sparkstart.templates"))]
+
+    cost = import_cost(modules, interpreter_baseline)
+    assert cost < HELP_BUDGET_MS * SCALE, f"--help imports took {cost:.1f}ms"
+
+
+def test_new_rust_startup_budget(interpreter_baseline, tmp_path):
+    modules, code = importtime(["new", "crate", "--lang", "rust"], cwd=tmp_path)
+    assert code == 0
+    assert (tmp_path / "crate" / "Cargo.toml").exists()
+
+    for unused in [
+        "requests", "dotenv", "venv",
+        "sparkstart.scaffolders.python", "sparkstart.scaffolders.cpp",
+        "sparkstart.scaffolders.javascript", "sparkstart.scaffolders.fast_build",
+        "sparkstart.scaffolders.bench", "sparkstart.scaffolders.devcontainer",
+        "sparkstart.server", "sparkstart.batch", "sparkstart.wheelhouse", "sparkstart.conan_cache",
+        "sparkstart.utils.github", "sparkstart.utils.venv_seed",
+    ]:
+        assert unused not in modules, f"new --lang rust imported {unused}"
+
+    cost = import_cost(modules, interpreter_baseline)
+    assert cost < NEW_RUST_BUDGET_MS * SCALE, f"new --lang rust imports took {cost:.1f}ms"
@@ -0,0 +1,83 @@
+import json
+import subprocess
+
+import pytest
+from typer.testing import CliRunner
+
+from sparkstart.cli import app
+from sparkstart.sync import LOCK_FILE, file_hash, sync_project
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def project(tmp_cwd):
+    assert runner.invoke(app, ["new", "crate", "--lang", "rust"]).exit_code == 0
+    return tmp_cwd / "crate"
+
+
+def age(project, files):
+    """Make *project* look generated by older templates that wrote *files*."""
+    lock = json.loads((project / LOCK_FILE).read_text())
+    for name, old in files.items():
+        (project / name).write_text(old)
+        lock["files"][name] = file_hash(old.encode())
+    (project / LOCK_FILE).write_text(json.dumps(lock))
+
+
+def test_new_project_is_locked_and_in_sync(project):
+    lock = json.loads((project / LOCK_FILE).read_text())
+    assert lock["options"]["lang"] == "rust"
+    assert lock["files"]["Cargo.toml"] == file_hash((project / "Cargo.toml").read_bytes())
+    tracked = subprocess.run(["git", "ls-files"], cwd=project, capture_output=True, text=True).stdout.split()
+    assert LOCK_FILE in tracked
+
+    result = sync_project(project)
+    assert result.updated == result.added == result.kept == []
+
+
+def test_sync_rewrites_only_files_unchanged_locally(project):
+    current = (project / "Cargo.toml").read_text()
+    age(project, {"Cargo.toml": "[package]\n", ".gitignore": "/target\n"})
+    (project / ".gitignore").write_text("/target\nmy-notes.txt\n")  # a local edit
+
+    assert sync_project(project, dry_run=True).updated == ["Cargo.toml"]
+    assert (project / "Cargo.toml").read_text() == "[package]\n"
+
+    result = sync_project(project)
+    assert result.updated == ["Cargo.toml"] and result.kept == [".gitignore"]
+    assert (project / "Cargo.toml").read_text() == current
+    assert (project / ".gitignore").read_text() == "/target\nmy-notes.txt\n"
+    # the lock follows the rewrite, and still remembers the base of the kept file
+    assert sync_project(project).updated == []
+
+
+def test_sync_needs_a_lock(tmp_path):
+    result = runner.invoke(app, ["sync", str(tmp_path)])
+    assert result.exit_code == 1 and "has no .sparkstart.lock" in result.output
+
+
+def test_sync_sees_the_executable_bit(tmp_cwd):
+    assert runner.invoke(app, ["new", "engine", "--lang", "cpp"]).exit_code == 0
+    project = tmp_cwd / "engine"
+    script = project / "build.sh"
+    lock = json.loads((project / LOCK_FILE).read_text())
+    assert lock["files"]["build.sh"].endswith("+x")
+
+    # older templates that forgot the +x
+    script.chmod(0o644)
+    lock["files"]["build.sh"] = file_hash(script.read_bytes())
+    (project / LOCK_FILE).write_text(json.dumps(lock))
+
+    assert sync_project(project).updated == ["build.sh"]
+    assert script.stat().st_mode & 0o111
+
+
+def test_sync_rejects_unknown_options(project):
+    lock = json.loads((project / LOCK_FILE).read_text())
+    lock["options"]["turbo"] = True  # written by another sparkstart version
+    (project / LOCK_FILE).write_text(json.dumps(lock))
+
+    result = runner.invoke(app, ["sync", str(project)])
+    assert result.exit_code == 1
+    assert "['turbo'] are not known" in result.output and "Traceback" not in result.output
@@ -0,0 +1,34 @@
+import mmap
+
+from sparkstart.templates import BUNDLE, SOURCES, Bundle, build_bundle, get_bundle, render, render_tree
+
+# how long building and reading the bundle take: phase/templates/* in benchmarks/run.py
+
+
+def test_packaged_bundle_matches_sources(tmp_path):
+    fresh = tmp_path / "templates.bundle"
+    build_bundle(SOURCES, fresh)
+    assert fresh.read_bytes() == BUNDLE.read_bytes(), "run scripts/build_templates.py"
+
+
+def test_bundle_holds_every_source_file(tmp_path):
+    build_bundle(SOURCES, tmp_path / "templates.bundle")
+    bundle = Bundle(tmp_path / "templates.bundle")
+    sources = {p.relative_to(SOURCES).as_posix(): p for p in SOURCES.rglob("*") if p.is_file()}
+    assert bundle.names("cpp/") and set(bundle.names()) <= set(sources)
+    for entry in bundle.names():
+        assert bundle.read(entry) == sources[entry].read_bytes()
+
+
+def test_render_reads_the_mapped_bundle():
+    assert isinstance(get_bundle()._map, mmap.mmap)  # mapped, not read into memory
+    expected = (SOURCES / "cpp" / "CMakeLists.txt").read_text().replace("{name}", "engine")
+    assert render("cpp/CMakeLists.txt", name="engine") == expected
+
+
+def test_render_tree_maps_entries_to_project_files():
+    plan = render_tree("cpp", name="engine")
+    assert ".gitignore" in plan
+    assert plan["build.sh"].mode == 0o755
+    assert b"project(engine VERSION" in plan["CMakeLists.txt"].data
+    assert b"${PROJECT_NAME}" in plan["CMakeLists.txt"].data
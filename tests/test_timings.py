@@ -0,0 +1,60 @@
+import json
+import sys
+
+import pytest
+
+from typer.testing import CliRunner
+
+from sparkstart.cli import app
+from sparkstart.core import create_project
+from sparkstart.timings import get_tracer, span, tracing
+from sparkstart.utils.common import run_shell
+
+runner = CliRunner()
+
+
+def test_spans_cover_steps_and_subprocesses(tmp_path):
+    with tracing() as tracer:
+        create_project(tmp_path / "traced", lang="rust")
+    assert get_tracer() is None
+
+    by_name = {s.name: s for s in tracer.spans}
+    assert {"create_project", "scaffold", "write", "commit", "publish"} <= set(by_name)
+    assert by_name["git fast-import"].category == "subprocess"
+    # the subprocess ran inside the commit step, on the same thread
+    commit, fast_import = by_name["commit"], by_name["git fast-import"]
+    assert commit.thread == fast_import.thread and fast_import.depth == commit.depth + 1
+    assert commit.start_ns <= fast_import.start_ns <= fast_import.end_ns <= commit.end_ns
+
+    events = tracer.chrome_trace()["traceEvents"]
+    assert {e["name"] for e in events if e["ph"] == "X"} == set(by_name)
+
+
+def test_no_spans_without_a_tracer(tmp_path):
+    with span("ignored"):
+        pass
+    assert get_tracer() is None
+
+
+def test_traced_commands_hide_tokens(tmp_path):
+    with tracing() as tracer:
+        run_shell(["echo", "https://secret@github.com/me/x.git"], cwd=tmp_path)
+    (s,) = tracer.spans
+    assert s.name == "echo https://***@github.com/me/x.git"
+    assert "secret" not in s.args["cmd"]
+
+
+def test_failed_commands_hide_tokens(tmp_path):
+    script = "import sys; sys.exit('fatal: could not push to ' + sys.argv[1])"
+    with pytest.raises(RuntimeError) as e:
+        run_shell([sys.executable, "-c", script, "https://secret@github.com/me/x.git"], cwd=tmp_path)
+    assert "secret" not in str(e.value) and "https://***@github.com/me/x.git" in str(e.value)
+
+
+def test_new_timings_and_trace(tmp_cwd):
+    result = runner.invoke(app, ["new", "timed", "--lang", "javascript", "--timings", "--trace", "trace.json"])
+    assert result.exit_code == 0, result.output
+    assert "git fast-import" in result.output and "wall" in result.output
+
+    trace = json.loads((tmp_cwd / "trace.json").read_text())
+    assert any(e["name"] == "commit" and e["ph"] == "X" for e in trace["traceEvents"])
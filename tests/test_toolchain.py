@@ -0,0 +1,82 @@
+import os
+import stat
+import threading
+
+from sparkstart import toolchain
+
+
+def fake_tool(bin_dir, name, output):
+    path = bin_dir / name
+    path.write_text(f"#!/bin/sh\necho '{output}'\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def test_discover_finds_tools_and_versions(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = fake_tool(bin_dir, "frob", "frob version 1.2.3")
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    found = toolchain.discover(["frob", "nope"], versions=True)
+
+    assert found["frob"].path == str(tool)
+    assert found["frob"].version == "frob version 1.2.3"
+    assert not found["nope"].found
+    assert toolchain.which("frob") == str(tool)
+
+
+def test_cache_survives_restart_until_path_changes(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", str(bin_dir))
+    assert toolchain.which("frob") is None
+
+    lookups = []
+    real_which = toolchain.shutil.which
+    monkeypatch.setattr(toolchain.shutil, "which", lambda name: lookups.append(name) or real_which(name))
+
+    # a new process: "not found" is served from toolchain.json
+    toolchain._tools.clear()
+    toolchain._key = None
+    assert toolchain.which("frob") is None
+    assert lookups == []
+
+    # installing the tool touches its directory, which invalidates the cache
+    tool = fake_tool(bin_dir, "frob", "1.0")
+    st = bin_dir.stat()
+    os.utime(bin_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert toolchain.which("frob") == str(tool)
+    assert lookups == ["frob"]
+
+
+def test_slow_version_probes_do_not_block_other_lookups(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_tool(bin_dir, "slow", "slow 1.0")
+    fast = fake_tool(bin_dir, "fast", "fast 1.0")
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+    started, release = threading.Event(), threading.Event()
+    real_probe = toolchain._probe
+
+    def probe(tool, versions):
+        if tool.name == "slow":
+            started.set()
+            release.wait(10)
+        return real_probe(tool, versions)
+
+    monkeypatch.setattr(toolchain, "_probe", probe)
+    results = []
+    slow = threading.Thread(target=lambda: results.append(toolchain.discover(["slow"], versions=True)))
+    slow.start()
+    started.wait(10)
+
+    lookup = threading.Thread(target=lambda: results.append(toolchain.which("fast")))
+    lookup.start()
+    lookup.join(5)
+    assert results == [str(fast)]  # answered while "slow" is still probing
+    release.set()
+    slow.join()
+    assert results[1]["slow"].version == "slow 1.0"
+    assert toolchain.discover(["slow", "fast"], versions=True)["slow"].version == "slow 1.0"
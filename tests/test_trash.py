@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from sparkstart.cli import app
+from sparkstart.utils.trash import TRASH_DIR, move_to_trash, reap, rmtree_parallel
+
+runner = CliRunner()
+
+
+def make_tree(root, width=4, depth=3):
+    root.mkdir()
+    for i in range(width):
+        (root / f"f{i}.txt").write_text("x")
+    if depth:
+        for i in range(width):
+            make_tree(root / f"d{i}", width, depth - 1)
+
+
+def test_rmtree_parallel_removes_tree_but_not_symlink_targets(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+
+    tree = tmp_path / "tree"
+    make_tree(tree)
+    os.symlink(outside, tree / "d0" / "link")
+    rmtree_parallel(tree, workers=4)
+
+    assert not tree.exists()
+    assert (outside / "keep.txt").read_text() == "keep"
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_deleting_a_symlinked_project_keeps_its_target(tmp_cwd, background):
+    make_tree(tmp_cwd / "real", depth=1)
+    (tmp_cwd / "real" / "keep.txt").write_text("keep")
+    os.symlink(tmp_cwd / "real", tmp_cwd / "proj")
+
+    result = runner.invoke(app, ["delete", "proj", "--yes", *(["--background"] if background else [])])
+
+    assert "Failed" in result.output and "symbolic link" in result.output
+    assert (tmp_cwd / "real" / "keep.txt").read_text() == "keep"
+    assert len(list((tmp_cwd / "real").iterdir())) == 9
+
+
+def test_reap_does_not_follow_a_symlinked_trash(tmp_path):
+    make_tree(tmp_path / "real", depth=0)
+    os.symlink(tmp_path / "real", tmp_path / TRASH_DIR)
+
+    with pytest.raises(OSError, match="symbolic link"):
+        reap(tmp_path / TRASH_DIR)
+    with pytest.raises(OSError, match="symbolic link"):
+        rmtree_parallel(tmp_path / TRASH_DIR)
+    assert len(list((tmp_path / "real").iterdir())) == 4
+
+
+def test_background_delete(tmp_cwd):
+    make_tree(tmp_cwd / "proj")
+    result = runner.invoke(app, ["delete", "proj", "--yes", "--background"])
+
+    assert result.exit_code == 0
+    assert "Project deleted" in result.stdout
+    assert not (tmp_cwd / "proj").exists()
+
+    trash = tmp_cwd / TRASH_DIR
+    deadline = time.monotonic() + 30
+    while trash.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not trash.exists()
+
+
+def test_gc_finishes_interrupted_reap(tmp_cwd):
+    make_tree(tmp_cwd / "proj", depth=1)
+    move_to_trash(tmp_cwd / "proj")  # as if the reaper had been killed
+
+    result = runner.invoke(app, ["gc"])
+
+    assert result.exit_code == 0
+    assert "Removed 1 leftover project(s)" in result.stdout
+    assert not (tmp_cwd / TRASH_DIR).exists()
@@ -0,0 +1,43 @@
+import subprocess
+
+import pytest
+
+from sparkstart.utils import venv_seed
+from sparkstart.utils.venv_seed import create_venv, get_seed
+
+
+def test_cloned_venv_points_at_its_own_location(tmp_path, monkeypatch):
+    # how fast that is: phase/venv in benchmarks/run.py
+    seed = get_seed()
+    dest = tmp_path / "proj" / ".venv"
+    dest.parent.mkdir()
+
+    clones = []
+    real_clone = venv_seed.clone_venv
+    monkeypatch.setattr(venv_seed, "clone_venv", lambda *args: clones.append(args) or real_clone(*args))
+    monkeypatch.setattr(venv_seed.venv, "create", lambda *args, **kwargs: pytest.fail("ran ensurepip"))
+    create_venv(dest)
+    assert [c[:2] for c in clones] == [(seed, dest)]
+
+    origin = (seed / "origin").read_text()
+    for name in ["pyvenv.cfg", "bin/activate", "bin/pip"]:
+        text = (dest / name).read_text()
+        assert origin not in text
+    assert str(dest) in (dest / "bin" / "activate").read_text()
+
+    prefix = subprocess.run(
+        [str(dest / "bin" / "python"), "-c", "import sys; print(sys.prefix)"],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    assert prefix == str(dest)
+
+    # pip's shebang must run the clone's interpreter, not the seed's
+    pip = subprocess.run([str(dest / "bin" / "pip"), "--version"], capture_output=True, text=True, check=True)
+    assert str(dest) in pip.stdout
+
+
+def test_clone_does_not_modify_seed(tmp_path):
+    seed = get_seed()
+    before = (seed / ".venv" / "bin" / "activate").read_text()
+    create_venv(tmp_path / ".venv")
+    assert (seed / ".venv" / "bin" / "activate").read_text() == before
@@ -0,0 +1,115 @@
+import os
+import subprocess
+import time
+import zipfile
+
+import pytest
+
+from sparkstart import wheelhouse
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """An empty wheel cache (the venv seed stays in the shared one)."""
+    root = tmp_path / "wheels"
+    for sub in ("objects", "index"):
+        (root / sub).mkdir(parents=True)
+        monkeypatch.setattr(wheelhouse, f"{sub}_dir", lambda sub=sub: root / sub)
+    return root
+
+
+def make_wheel(folder, name="tinydep", version="1.0"):
+    """A minimal pure-Python wheel providing module *name*."""
+    dist = f"{name}-{version}.dist-info"
+    path = folder / f"{name}-{version}-py3-none-any.whl"
+    files = {
+        f"{name}.py": "VALUE = 42\n",
+        f"{dist}/METADATA": f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        f"{dist}/WHEEL": "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    with zipfile.ZipFile(path, "w") as z:
+        for arcname, text in files.items():
+            z.writestr(arcname, text)
+        z.writestr(f"{dist}/RECORD", "".join(f"{n},,\n" for n in [*files, f"{dist}/RECORD"]))
+    return path
+
+
+def test_project_requirements_include_the_test_extra():
+    pyproject = '[project]\ndependencies = ["requests"]\n[project.optional-dependencies]\ntest = ["pytest", "requests"]\n'
+    assert wheelhouse.project_requirements(pyproject) == ["requests", "pytest"]
+
+
+def test_wheels_are_stored_once_per_content(cache, tmp_path):
+    wheel = make_wheel(tmp_path)
+    renamed = tmp_path / "copy" / wheel.name.replace("py3-none", "py30-none")
+    renamed.parent.mkdir()
+    renamed.write_bytes(wheel.read_bytes())
+
+    wheelhouse.add(wheel)
+    wheelhouse.add(wheel)
+    wheelhouse.add(renamed)
+    assert len(list((cache / "objects").iterdir())) == 1
+    assert len(list((cache / "index").iterdir())) == 2
+
+
+def test_prune_drops_stale_wheels_and_their_objects(cache, tmp_path):
+    old = wheelhouse.add(make_wheel(tmp_path, "olddep"))
+    wheelhouse.add(make_wheel(tmp_path, "newdep"))
+    long_ago = time.time() - 90 * 86400
+    os.utime(old, (long_ago, long_ago))
+
+    assert wheelhouse.prune(30)[0] == 1
+    assert [p.name for p in (cache / "index").iterdir()] == ["newdep-1.0-py3-none-any.whl"]
+    assert len(list((cache / "objects").iterdir())) == 1
+
+
+def test_install_is_offline(cache, tmp_path):
+    from sparkstart.utils.venv_seed import create_venv
+
+    wheelhouse.add(make_wheel(tmp_path))
+    venv = tmp_path / ".venv"
+    create_venv(venv)
+
+    wheelhouse.install(venv, ["tinydep"], fetch=False)
+    out = subprocess.run([str(venv / "bin" / "python"), "-c", "import tinydep; print(tinydep.VALUE)"],
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "42"
+
+    with pytest.raises(RuntimeError):
+        wheelhouse.install(venv, ["not-in-the-cache"], fetch=False)
+
+
+def test_prefill_of_cached_wheels_is_offline(cache, tmp_path, monkeypatch):
+    commands = []
+
+    def run_shell(cmd, cwd, **kwargs):
+        commands.append(cmd)
+        return real_run_shell(cmd, cwd, **kwargs)
+
+    real_run_shell = wheelhouse.run_shell
+    monkeypatch.setattr(wheelhouse, "run_shell", run_shell)
+    entry = wheelhouse.add(make_wheel(tmp_path))
+    os.utime(entry, (0, 0))
+
+    assert wheelhouse.prefill(["tinydep"]) == [entry]
+    assert len(commands) == 1 and "--no-index" in commands[0]
+    assert entry.stat().st_mtime > 0  # and counted as used
+
+
+def test_install_without_report_support(cache, tmp_path, monkeypatch):
+    from sparkstart.utils.venv_seed import create_venv
+
+    entry = wheelhouse.add(make_wheel(tmp_path))
+    os.utime(entry, (0, 0))
+    venv = tmp_path / ".venv"
+    create_venv(venv)
+    assert wheelhouse._pip_version(venv) >= (9, 0)
+
+    commands = []
+    real_run_shell = wheelhouse.run_shell
+    monkeypatch.setattr(wheelhouse, "run_shell", lambda cmd, cwd, **kw: commands.append(cmd) or real_run_shell(cmd, cwd, **kw))
+    monkeypatch.setattr(wheelhouse, "_pip_version", lambda venv_dir: (21, 3))  # as bundled with Python 3.8
+
+    wheelhouse.install(venv, ["tinydep"], fetch=False)
+    assert "--report" not in commands[0]
+    assert entry.stat().st_mtime > 0  # still counted as used, through `pip list`